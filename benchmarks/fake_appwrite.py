@@ -0,0 +1,372 @@
+"""
+In-memory stand-in for the Appwrite Databases service
+Lets DatabaseHelper and the cogs run without a network, with injected latency and per-call counters
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from appwrite.exception import AppwriteException
+from appwrite.id import ID
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _copy(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a document the way a JSON round trip would (lists aren't shared)"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in document.items()}
+
+
+class FakeDatabases:
+    """
+    Drop-in replacement for appwrite.services.databases.Databases, backed by dicts
+
+    Implements the document methods the bot uses, with the SDK's signatures,
+    responses and error codes. Every call blocks for latency +/- jitter seconds
+    (like a real HTTP round trip on the executor thread) and is counted per
+    method and per collection. Documents are kept per collection in creation
+    order, which is also the list order, as with Appwrite's default sort.
+
+    unique maps a collection ID to the attribute tuples of its unique indexes;
+    creating a document that repeats another one's values answers 409, like
+    Appwrite does (documents with a missing value never conflict).
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+        max_limit: int = 5000,
+        unique: Optional[Dict[str, List[Tuple[str, ...]]]] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_limit = max_limit
+        self.unique = {collection_id: [tuple(attributes) for attributes in indexes] for collection_id, indexes in (unique or {}).items()}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (collection ID, attributes) -> values -> ID of the document holding them
+        self._unique_values: Dict[Tuple[str, Tuple[str, ...]], Dict[Tuple[Any, ...], str]] = {}
+        self.calls: Counter = Counter()
+        self.calls_by_collection: Counter = Counter()
+
+    # ============================================
+    # Instrumentation
+    # ============================================
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.calls_by_collection.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts, total and per method / per collection"""
+        with self._lock:
+            return {
+                'total': sum(self.calls.values()),
+                'methods': dict(self.calls),
+                'collections': {f"{method}:{collection}": count for (method, collection), count in self.calls_by_collection.items()}
+            }
+
+    def documents(self, collection_id: str) -> List[Dict[str, Any]]:
+        """Every stored document of a collection (for assertions; not counted or delayed)"""
+        with self._lock:
+            return [_copy(doc) for doc in self.collections.get(collection_id, {}).values()]
+
+    def _request(self, method: str, collection_id: str) -> None:
+        with self._lock:
+            self.calls[method] += 1
+            self.calls_by_collection[(method, collection_id)] += 1
+            delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    # ============================================
+    # Documents
+    # ============================================
+
+    def get_document(
+        self,
+        database_id: str,
+        collection_id: str,
+        document_id: str,
+        queries: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        self._request('get_document', collection_id)
+        with self._lock:
+            document = self._get(collection_id, document_id)
+            return _select(document, _parse(queries))
+
+    def list_documents(
+        self,
+        database_id: str,
+        collection_id: str,
+        queries: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        self._request('list_documents', collection_id)
+        parsed = _parse(queries)
+        with self._lock:
+            matched = self._match(collection_id, parsed)
+            page = _paginate(matched, parsed, self.max_limit)
+            return {
+                'total': len(matched),
+                'documents': [_select(doc, parsed) for doc in page]
+            }
+
+    def create_document(
+        self,
+        database_id: str,
+        collection_id: str,
+        document_id: str,
+        data: Dict[str, Any],
+        permissions: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        self._request('create_document', collection_id)
+        with self._lock:
+            return _copy(self._insert(database_id, collection_id, document_id, data, permissions))
+
+    def create_documents(
+        self,
+        database_id: str,
+        collection_id: str,
+        documents: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        self._request('create_documents', collection_id)
+        with self._lock:
+            # All or nothing, like the bulk endpoint
+            collection = self.collections.get(collection_id, {})
+            batch = set()
+            for data in documents:
+                if data.get('$id') in collection:
+                    raise AppwriteException("Document with the requested ID already exists.", 409, 'document_already_exists')
+                for attributes in self.unique.get(collection_id, []):
+                    values = _values(data, attributes)
+                    if values is not None and ((attributes, values) in batch or self._holder(collection_id, attributes, values)):
+                        raise AppwriteException("Document with the requested ID already exists.", 409, 'document_already_exists')
+                    batch.add((attributes, values))
+
+            created = []
+            for data in documents:
+                data = dict(data)
+                document_id = data.pop('$id', None) or ID.unique()
+                created.append(_copy(self._insert(database_id, collection_id, document_id, data, data.pop('$permissions', None))))
+            return {'total': len(created), 'documents': created}
+
+    def update_document(
+        self,
+        database_id: str,
+        collection_id: str,
+        document_id: str,
+        data: Optional[Dict[str, Any]] = None,
+        permissions: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        self._request('update_document', collection_id)
+        with self._lock:
+            document = self._get(collection_id, document_id)
+            self._apply(document, data, permissions)
+            return _copy(document)
+
+    def update_documents(
+        self,
+        database_id: str,
+        collection_id: str,
+        data: Optional[Dict[str, Any]] = None,
+        queries: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        self._request('update_documents', collection_id)
+        parsed = _parse(queries)
+        with self._lock:
+            page = _paginate(self._match(collection_id, parsed), parsed, self.max_limit)
+            for document in page:
+                self._apply(document, data, None)
+            return {'total': len(page), 'documents': [_copy(doc) for doc in page]}
+
+    def delete_document(self, database_id: str, collection_id: str, document_id: str) -> Dict[str, Any]:
+        self._request('delete_document', collection_id)
+        with self._lock:
+            self._get(collection_id, document_id)
+            del self.collections[collection_id][document_id]
+            return {}
+
+    def increment_document_attribute(
+        self,
+        database_id: str,
+        collection_id: str,
+        document_id: str,
+        attribute: str,
+        value: Optional[float] = None,
+        max: Optional[float] = None
+    ) -> Dict[str, Any]:
+        self._request('increment_document_attribute', collection_id)
+        with self._lock:
+            document = self._get(collection_id, document_id)
+            result = (document.get(attribute) or 0) + (1 if value is None else value)
+            if max is not None and result > max:
+                raise AppwriteException("Attribute value exceeds the maximum limit.", 400, 'attribute_limit_exceeded')
+            self._apply(document, {attribute: result}, None)
+            return _copy(document)
+
+    # ============================================
+    # Storage (called with the lock held)
+    # ============================================
+
+    def _get(self, collection_id: str, document_id: str) -> Dict[str, Any]:
+        document = self.collections.get(collection_id, {}).get(document_id)
+        if document is None:
+            raise AppwriteException("Document with the requested ID could not be found.", 404, 'document_not_found')
+        return document
+
+    def _insert(
+        self,
+        database_id: str,
+        collection_id: str,
+        document_id: str,
+        data: Dict[str, Any],
+        permissions: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        collection = self.collections.setdefault(collection_id, {})
+        if document_id == 'unique()':
+            document_id = ID.unique()
+        if document_id in collection:
+            raise AppwriteException("Document with the requested ID already exists.", 409, 'document_already_exists')
+        for attributes in self.unique.get(collection_id, []):
+            if self._holder(collection_id, attributes, _values(data, attributes)):
+                raise AppwriteException("Document with the requested ID already exists.", 409, 'document_already_exists')
+
+        now = _now()
+        document = {
+            **_copy(data),
+            '$id': document_id,
+            '$collectionId': collection_id,
+            '$databaseId': database_id,
+            '$createdAt': now,
+            '$updatedAt': now,
+            '$permissions': list(permissions or [])
+        }
+        collection[document_id] = document
+        for attributes in self.unique.get(collection_id, []):
+            values = _values(document, attributes)
+            if values is not None:
+                self._unique_values.setdefault((collection_id, attributes), {})[values] = document_id
+        return document
+
+    def _holder(self, collection_id: str, attributes: Tuple[str, ...], values: Optional[Tuple[Any, ...]]) -> Optional[str]:
+        """ID of the document holding values for a unique index, if any"""
+        if values is None:
+            return None
+        document_id = self._unique_values.get((collection_id, attributes), {}).get(values)
+        # Entries of documents deleted or changed since are stale
+        document = self.collections.get(collection_id, {}).get(document_id)
+        if document is None or _values(document, attributes) != values:
+            return None
+        return document_id
+
+    @staticmethod
+    def _apply(document: Dict[str, Any], data: Optional[Dict[str, Any]], permissions: Optional[List[str]]) -> None:
+        document.update({key: value for key, value in _copy(data or {}).items() if not key.startswith('$')})
+        if permissions is not None:
+            document['$permissions'] = list(permissions)
+        document['$updatedAt'] = _now()
+
+    def _match(self, collection_id: str, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        filters = [_FILTERS[q['method']](q.get('attribute'), q.get('values', [])) for q in queries if q['method'] in _FILTERS]
+        matched = [doc for doc in self.collections.get(collection_id, {}).values() if all(f(doc) for f in filters)]
+
+        # Later orders are tie-breakers, so sort by them first (the sort is stable)
+        for query in reversed([q for q in queries if q['method'] in ('orderAsc', 'orderDesc')]):
+            matched.sort(key=lambda doc: _sort_key(doc.get(query['attribute'])), reverse=query['method'] == 'orderDesc')
+        return matched
+
+
+def _values(data: Dict[str, Any], attributes: Tuple[str, ...]) -> Optional[Tuple[Any, ...]]:
+    """A document's values for a unique index, or None if one is missing"""
+    values = tuple(data.get(attribute) for attribute in attributes)
+    return None if None in values else values
+
+
+# ============================================
+# Query evaluation
+# ============================================
+
+def _parse(queries: Optional[List[str]]) -> List[Dict[str, Any]]:
+    parsed = []
+    for query in queries or []:
+        query = json.loads(query)
+        if query['method'] not in _FILTERS and query['method'] not in _MODIFIERS:
+            raise AppwriteException(f"Invalid query method: {query['method']}", 400, 'general_query_invalid')
+        parsed.append(query)
+    return parsed
+
+
+def _sort_key(value: Any) -> Tuple[bool, Any]:
+    # Missing values sort first
+    return (value is not None, value if value is not None else 0)
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[str, List[Any]], Callable[[Dict[str, Any]], bool]]:
+    def build(attribute: str, values: List[Any]) -> Callable[[Dict[str, Any]], bool]:
+        return lambda doc: doc.get(attribute) is not None and any(op(doc[attribute], v) for v in values)
+    return build
+
+
+def _contains(attribute: str, values: List[Any]) -> Callable[[Dict[str, Any]], bool]:
+    def check(doc: Dict[str, Any]) -> bool:
+        value = doc.get(attribute)
+        if isinstance(value, list):
+            return any(v in value for v in values)
+        return isinstance(value, str) and any(str(v) in value for v in values)
+    return check
+
+
+_FILTERS: Dict[str, Callable[[str, List[Any]], Callable[[Dict[str, Any]], bool]]] = {
+    'equal': lambda attribute, values: lambda doc: doc.get(attribute) in values,
+    'notEqual': lambda attribute, values: lambda doc: doc.get(attribute) not in values,
+    'lessThan': _compare(lambda a, b: a < b),
+    'lessThanEqual': _compare(lambda a, b: a <= b),
+    'greaterThan': _compare(lambda a, b: a > b),
+    'greaterThanEqual': _compare(lambda a, b: a >= b),
+    'between': lambda attribute, values: lambda doc: doc.get(attribute) is not None and values[0] <= doc[attribute] <= values[1],
+    'isNull': lambda attribute, values: lambda doc: doc.get(attribute) is None,
+    'isNotNull': lambda attribute, values: lambda doc: doc.get(attribute) is not None,
+    'startsWith': lambda attribute, values: lambda doc: isinstance(doc.get(attribute), str) and doc[attribute].startswith(values[0]),
+    'endsWith': lambda attribute, values: lambda doc: isinstance(doc.get(attribute), str) and doc[attribute].endswith(values[0]),
+    'contains': _contains,
+}
+_MODIFIERS = {'limit', 'offset', 'cursorAfter', 'cursorBefore', 'select', 'orderAsc', 'orderDesc'}
+
+
+def _paginate(documents: List[Dict[str, Any]], queries: List[Dict[str, Any]], max_limit: int) -> List[Dict[str, Any]]:
+    limit, offset = 25, 0
+    for query in queries:
+        method, values = query['method'], query.get('values', [])
+        if method == 'limit':
+            limit = values[0]
+        elif method == 'offset':
+            offset = values[0]
+        elif method in ('cursorAfter', 'cursorBefore'):
+            ids = [doc['$id'] for doc in documents]
+            if values[0] not in ids:
+                raise AppwriteException(f"Document '{values[0]}' for the 'cursor' value not found.", 400, 'general_cursor_not_found')
+            position = ids.index(values[0])
+            documents = documents[position + 1:] if method == 'cursorAfter' else documents[:position]
+
+    if limit > max_limit:
+        raise AppwriteException(f"Invalid limit: value must be at most {max_limit}", 400, 'general_argument_invalid')
+    return documents[offset:offset + limit]
+
+
+def _select(document: Dict[str, Any], queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    selected = [value for q in queries if q['method'] == 'select' for value in q.get('values', [])]
+    if not selected:
+        return _copy(document)
+    # System attributes are always returned
+    return _copy({key: value for key, value in document.items() if key.startswith('$') or key in selected})
@@ -0,0 +1,542 @@
+"""
+Vote-storm benchmark
+Drives the proposal vote, election registration and election vote buttons with thousands of
+concurrent simulated interactions against FakeDatabases, and reports time-to-ack, throughput,
+Appwrite calls per interaction and lost or duplicate votes
+
+Usage:
+    python -m benchmarks.vote_storm --members 2000 --latency 0.04 --jitter 0.02 --output storm.json
+"""
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    # CI machines have no config.py; the example settings are all an offline run needs
+    spec = importlib.util.spec_from_file_location('config', ROOT / 'config.example.py')
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    sys.modules['config'] = config
+
+import discord
+
+from benchmarks.fake_appwrite import FakeDatabases
+from cogs.elections import ElectionRegisterButton, ElectionVoteButton
+from cogs.propose import ProposalVoteButton
+from utils.database import DatabaseHelper
+from utils.enums import VotingType, VotingStatus
+from utils.helpers import datetime_now
+from utils.interactions import ACK_DEADLINE
+from utils.journal import BallotJournal
+from utils.roster import RosterIndex
+from utils.tally import VoteTallies
+
+
+GUILD_ID = 100000000000000001
+COUNCILLOR_ROLE_ID = 100000000000000002
+FIRST_MEMBER_ID = 200000000000000000
+# Unique indexes declared in migrate.py, which the fake enforces like Appwrite
+UNIQUE_INDEXES = {
+    'votes': [('voting_id', 'discord_id')],
+    'election_candidates': [('voting_id', 'discord_id')],
+    'registered_voters': [('voting_id', 'discord_id')]
+}
+
+_interaction_ids = itertools.count(300000000000000000)
+
+
+# ============================================
+# Discord stand-ins
+# ============================================
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeMember:
+    def __init__(self, member_id: int, roles: Sequence[FakeRole]):
+        self.id = member_id
+        self.name = f"member{member_id - FIRST_MEMBER_ID}"
+        self.display_name = self.name
+        self.mention = f"<@{member_id}>"
+        self.roles = list(roles)
+        self.joined_at = datetime_now() - timedelta(days=365)
+        self.bot = False
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, roles: Sequence[FakeRole]):
+        self.id = guild_id
+        self.name = "Benchmark"
+        self.icon = None
+        self._roles = {role.id: role for role in roles}
+        self._members: Dict[int, FakeMember] = {}
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    def get_member(self, member_id: int) -> Optional[FakeMember]:
+        return self._members.get(member_id)
+
+    def add_member(self, member: FakeMember) -> None:
+        self._members[member.id] = member
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False) -> None:
+        self._acknowledge()
+
+    async def send_message(self, content: Optional[str] = None, **kwargs) -> None:
+        self._acknowledge()
+        self._interaction.reply(content)
+
+    def _acknowledge(self) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+        self._interaction.acked_at = time.perf_counter()
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> None:
+        self._interaction.reply(content)
+
+
+class FakeInteraction(discord.Interaction):
+    """
+    Button-click interaction with no gateway behind it
+
+    Subclasses discord.Interaction so the handlers' isinstance checks pass, but
+    only sets the attributes they use. Records when it was acknowledged and
+    what it was answered with.
+    """
+
+    def __init__(self, client: "FakeBot", guild: FakeGuild, user: FakeMember, custom_id: str):
+        self.id = next(_interaction_ids)
+        self.type = discord.InteractionType.component
+        self.data = {'custom_id': custom_id, 'component_type': 2}
+        self.guild_id = guild.id
+        self.user = user
+        self.message = None
+        self.channel = None
+        self.extras = {}
+        self.command_failed = False
+
+        self._fake_client = client
+        self._fake_guild = guild
+        self._fake_response = FakeResponse(self)
+        self._fake_followup = FakeFollowup(self)
+        self._created = datetime_now()
+
+        self.dispatched_at = time.perf_counter()
+        self.acked_at: Optional[float] = None
+        self.answered_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.replies: List[Optional[str]] = []
+
+    @property
+    def client(self) -> "FakeBot":
+        return self._fake_client
+
+    @property
+    def guild(self) -> FakeGuild:
+        return self._fake_guild
+
+    @property
+    def response(self) -> FakeResponse:
+        return self._fake_response
+
+    @property
+    def followup(self) -> FakeFollowup:
+        return self._fake_followup
+
+    @property
+    def created_at(self):
+        return self._created
+
+    @property
+    def command(self) -> None:
+        return None
+
+    async def delete_original_response(self) -> None:
+        pass
+
+    def reply(self, content: Optional[str]) -> None:
+        if self.answered_at is None:
+            self.answered_at = time.perf_counter()
+        self.replies.append(content)
+
+    @property
+    def outcome(self) -> str:
+        """success, refused (a handled ❌ reply), error (unexpected exception) or no_reply"""
+        if not self.replies or self.replies[0] is None:
+            return 'no_reply'
+        reply = self.replies[0]
+        if reply.startswith("✅"):
+            return 'success'
+        if reply.startswith("❌ An error occurred"):
+            return 'error'
+        return 'refused'
+
+
+class FakeBot:
+    """The parts of CouncillorBot the vote handlers reach through interaction.client"""
+
+    def __init__(self, db_helper: DatabaseHelper, journal_path: Optional[str] = None):
+        self.db_helper = db_helper
+        self.tallies = VoteTallies(db_helper, flush_interval=getattr(config, 'VOTE_FLUSH_INTERVAL', 0.25))
+        self.journal = None
+        if journal_path:
+            self.journal = BallotJournal(
+                journal_path,
+                db_helper,
+                batch_size=getattr(config, 'BALLOT_JOURNAL_BATCH_SIZE', 50),
+                flush_interval=getattr(config, 'BALLOT_JOURNAL_FLUSH_INTERVAL', 1.0),
+                max_attempts=getattr(config, 'BALLOT_JOURNAL_MAX_ATTEMPTS', 10)
+            )
+        self.rosters = RosterIndex(db_helper, self.journal)
+
+    async def start(self) -> None:
+        if self.journal:
+            await self.journal.start()
+
+    async def drain(self, voting_id: str) -> None:
+        """Write everything still buffered, as closing the voting would"""
+        if self.journal:
+            await self.journal.flush_voting(voting_id)
+        await self.tallies.close(voting_id)
+        await self.db_helper.log_queue.close()
+
+    async def close(self) -> None:
+        if self.journal:
+            await self.journal.close()
+        await self.tallies.close_all()
+        self.db_helper.close()
+
+
+# ============================================
+# Storm
+# ============================================
+
+Click = Tuple[FakeMember, str, Callable[[FakeInteraction], Awaitable[None]]]
+
+
+async def storm(bot: FakeBot, guild: FakeGuild, clicks: Sequence[Click], rate: float) -> Tuple[List[FakeInteraction], float]:
+    """
+    Dispatch every click as its own task, all at once or at a fixed arrival rate
+
+    Returns:
+        The interactions and the wall time until the last one finished
+    """
+    interactions: List[FakeInteraction] = []
+
+    async def fire(member: FakeMember, custom_id: str, handler: Callable[[FakeInteraction], Awaitable[None]]) -> None:
+        interaction = FakeInteraction(bot, guild, member, custom_id)
+        interactions.append(interaction)
+        try:
+            await handler(interaction)
+        finally:
+            interaction.finished_at = time.perf_counter()
+
+    started = time.perf_counter()
+    tasks = []
+    for i, (member, custom_id, handler) in enumerate(clicks):
+        if rate:
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(member, custom_id, handler)))
+    await asyncio.gather(*tasks)
+    return interactions, time.perf_counter() - started
+
+
+def with_double_clicks(members: Sequence[FakeMember], fraction: float) -> List[FakeMember]:
+    """The members who click, with the first `fraction` of them clicking twice"""
+    repeat = int(len(members) * fraction)
+    return [*members, *members[:repeat]]
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 6)
+
+    return {'p50': at(0.5), 'p95': at(0.95), 'p99': at(0.99), 'max': round(ordered[-1], 6)}
+
+
+def summarize(
+    scenario: str,
+    interactions: Sequence[FakeInteraction],
+    wall: float,
+    fake: FakeDatabases,
+    inline_calls: Dict[str, Any]
+) -> Dict[str, Any]:
+    acks = [i.acked_at - i.dispatched_at for i in interactions if i.acked_at is not None]
+    replies = [i.answered_at - i.dispatched_at for i in interactions if i.answered_at is not None]
+    total = fake.stats()
+    count = len(interactions)
+
+    return {
+        'scenario': scenario,
+        'interactions': count,
+        'wall_seconds': round(wall, 4),
+        'throughput_per_second': round(count / wall, 2) if wall else None,
+        'time_to_ack': percentiles(acks),
+        'late_acks': sum(1 for ack in acks if ack >= ACK_DEADLINE),
+        'unacknowledged': count - len(acks),
+        'time_to_reply': percentiles(replies),
+        'outcomes': dict(Counter(i.outcome for i in interactions)),
+        'appwrite_calls': {
+            # Calls made while the storm ran, i.e. on the interaction path
+            'inline': inline_calls['total'],
+            'inline_per_interaction': round(inline_calls['total'] / count, 3) if count else None,
+            # Plus the batched writes flushed afterwards (tallies, journal, activity logs)
+            'total': total['total'],
+            'total_per_interaction': round(total['total'] / count, 3) if count else None,
+            'methods': total['methods']
+        }
+    }
+
+
+def ballot_integrity(
+    fake: FakeDatabases,
+    collection_id: str,
+    voting_id: str,
+    interactions: Sequence[FakeInteraction]
+) -> Dict[str, int]:
+    """Compare stored documents per member with the members who were told they succeeded"""
+    stored = Counter(doc['discord_id'] for doc in fake.documents(collection_id) if doc['voting_id'] == voting_id)
+    confirmed = {str(i.user.id) for i in interactions if i.outcome == 'success'}
+    return {
+        'stored': sum(stored.values()),
+        'confirmed': len(confirmed),
+        # Confirmed to the member but never stored
+        'lost': len(confirmed - set(stored)),
+        # Extra documents for members with more than one
+        'duplicates': sum(n - 1 for n in stored.values() if n > 1)
+    }
+
+
+# ============================================
+# Scenarios
+# ============================================
+
+async def create_environment(args: argparse.Namespace, journal_path: Optional[str] = None):
+    fake = FakeDatabases(latency=args.latency, jitter=args.jitter, seed=args.seed, unique=UNIQUE_INDEXES)
+    db_helper = DatabaseHelper(fake, max_concurrency=args.max_concurrency)
+    bot = FakeBot(db_helper, journal_path)
+    await bot.start()
+
+    councillor_role = FakeRole(COUNCILLOR_ROLE_ID, "Councillor")
+    guild = FakeGuild(GUILD_ID, [councillor_role])
+    members = [FakeMember(FIRST_MEMBER_ID + i, [councillor_role]) for i in range(args.members)]
+    for member in members:
+        guild.add_member(member)
+
+    await db_helper.create_guild(GUILD_ID, "Benchmark")
+    await db_helper.update_guild(GUILD_ID, {
+        'councillor_role_id': str(COUNCILLOR_ROLE_ID),
+        'days_requirement': 0
+    })
+    return fake, db_helper, bot, guild, members
+
+
+async def create_voting(db_helper: DatabaseHelper, voting_type: VotingType) -> Dict[str, Any]:
+    return await db_helper.create_voting(
+        voting_type=voting_type,
+        title="Benchmark",
+        description="Vote storm",
+        guild_id=GUILD_ID,
+        voting_end=datetime_now() + timedelta(days=1),
+        status=VotingStatus.VOTING
+    )
+
+
+async def proposal_storm(args: argparse.Namespace) -> Dict[str, Any]:
+    """Every councillor votes on one proposal"""
+    fake, db_helper, bot, guild, members = await create_environment(args)
+    try:
+        await db_helper.create_councillors(GUILD_ID, [(m.id, m.name) for m in members])
+        voting = await create_voting(db_helper, VotingType.LEGISLATION)
+
+        clicks = []
+        for i, member in enumerate(with_double_clicks(members, args.double_click)):
+            button = ProposalVoteButton(voting['$id'], stance=i % 3 != 0)
+            clicks.append((member, button.item.custom_id, button.callback))
+
+        fake.reset_counters()
+        interactions, wall = await storm(bot, guild, clicks, args.rate)
+        inline = fake.stats()
+        await bot.drain(voting['$id'])
+
+        result = summarize('proposal_vote', interactions, wall, fake, inline)
+        result['integrity'] = ballot_integrity(fake, 'votes', voting['$id'], interactions)
+        return result
+    finally:
+        await bot.close()
+
+
+async def registration_storm(args: argparse.Namespace) -> Dict[str, Any]:
+    """Every member registers to vote in one election"""
+    fake, db_helper, bot, guild, members = await create_environment(args)
+    try:
+        voting = await create_voting(db_helper, VotingType.ELECTION)
+
+        clicks = []
+        for member in with_double_clicks(members, args.double_click):
+            button = ElectionRegisterButton(voting['$id'], 'voter')
+            clicks.append((member, button.item.custom_id, button.callback))
+
+        fake.reset_counters()
+        interactions, wall = await storm(bot, guild, clicks, args.rate)
+        inline = fake.stats()
+        await bot.drain(voting['$id'])
+
+        result = summarize('election_registration', interactions, wall, fake, inline)
+        result['integrity'] = ballot_integrity(fake, 'registered_voters', voting['$id'], interactions)
+        return result
+    finally:
+        await bot.close()
+
+
+async def election_storm(args: argparse.Namespace, journal: bool = False) -> Dict[str, Any]:
+    """Every registered member votes for one of the candidates"""
+    journal_dir = tempfile.TemporaryDirectory() if journal else None
+    journal_path = os.path.join(journal_dir.name, 'ballots.db') if journal_dir else None
+    fake, db_helper, bot, guild, members = await create_environment(args, journal_path)
+    try:
+        voting = await create_voting(db_helper, VotingType.ELECTION)
+        candidates = await db_helper.register_candidates(
+            voting['$id'],
+            [(m.id, m.name) for m in members[:args.candidates]]
+        )
+        await db_helper.register_voters(voting['$id'], [(m.id, m.name) for m in members])
+
+        clicks = []
+        for i, member in enumerate(with_double_clicks(members, args.double_click)):
+            candidate = candidates[i % len(candidates)]
+            button = ElectionVoteButton(voting['$id'], candidate['$id'], label=candidate['name'])
+            clicks.append((member, button.item.custom_id, button.callback))
+
+        fake.reset_counters()
+        interactions, wall = await storm(bot, guild, clicks, args.rate)
+        inline = fake.stats()
+        await bot.drain(voting['$id'])
+
+        result = summarize('election_vote_journal' if journal else 'election_vote', interactions, wall, fake, inline)
+        integrity = ballot_integrity(fake, 'votes', voting['$id'], interactions)
+        # Candidate counters are written separately (batched), so check they add up to the ballots
+        counted = sum(doc.get('vote_count', 0) for doc in fake.documents('election_candidates') if doc['voting_id'] == voting['$id'])
+        integrity['counted'] = counted
+        integrity['count_drift'] = counted - integrity['stored']
+        result['integrity'] = integrity
+        return result
+    finally:
+        await bot.close()
+        if journal_dir:
+            journal_dir.cleanup()
+
+
+SCENARIOS: Dict[str, Callable[[argparse.Namespace], Awaitable[Dict[str, Any]]]] = {
+    'proposal': proposal_storm,
+    'registration': registration_storm,
+    'election': election_storm,
+    'election-journal': lambda args: election_storm(args, journal=True)
+}
+
+
+# ============================================
+# Entry point
+# ============================================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Vote-storm benchmark against an in-memory Appwrite stand-in")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--members', type=int, default=2000, help="simulated members (one click each)")
+    parser.add_argument('--candidates', type=int, default=9, help="candidates in the election scenarios")
+    parser.add_argument('--double-click', type=float, default=0.05, help="fraction of members who click twice")
+    parser.add_argument('--rate', type=float, default=0.0, help="clicks per second (0 = all at once)")
+    parser.add_argument('--latency', type=float, default=0.04, help="seconds per Appwrite call")
+    parser.add_argument('--jitter', type=float, default=0.02, help="+/- seconds of random latency per call")
+    parser.add_argument('--max-concurrency', type=int, default=None, help="Appwrite calls in flight (defaults to APPWRITE_MAX_CONCURRENCY)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    ack = result['time_to_ack']
+    calls = result['appwrite_calls']
+    integrity = result.get('integrity', {})
+    print(
+        f"{result['scenario']:<24} {result['interactions']:>6} clicks  "
+        f"{result['throughput_per_second']:>9.1f}/s  "
+        f"ack p50/p95/p99 {ack['p50'] * 1000:.1f}/{ack['p95'] * 1000:.1f}/{ack['p99'] * 1000:.1f} ms  "
+        f"late {result['late_acks']}  "
+        f"calls/click {calls['inline_per_interaction']} ({calls['total_per_interaction']} total)  "
+        f"lost {integrity.get('lost', 0)} dup {integrity.get('duplicates', 0)}  "
+        f"{result['outcomes']}"
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results = []
+    for name in args.scenarios:
+        result = await SCENARIOS[name](args)
+        print_result(result)
+        results.append(result)
+
+    return {
+        'benchmark': 'vote_storm',
+        'settings': vars(args),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'discord.py': discord.__version__
+        },
+        'results': results
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
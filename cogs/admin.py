@@ -3,15 +3,21 @@ Admin Commands Cog
 Provides administrative commands for bot configuration
 Only accessible to the configured admin user
 """
+import asyncio
+import io
+import os
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import config
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
 from utils.permissions import is_admin, check_admin
+from utils.permission_table import permission_tables
 from utils.errors import handle_interaction_error
+from utils.interactions import deferred, respond, timings
 from utils.formatting import (
     create_success_message, create_error_message, create_embed,
     format_heading, format_bold
@@ -28,7 +34,8 @@ class Admin(commands.Cog):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Check if user is admin before allowing any command"""
         if not await is_admin(interaction.user):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_error_message("You must be an admin to use this command."),
                 ephemeral=True
             )
@@ -36,16 +43,19 @@ class Admin(commands.Cog):
         return True
 
     @app_commands.command(name="setup", description="[Admin] Initial setup for the bot in this server")
+    @deferred(ephemeral=False)
     async def setup(self, interaction: discord.Interaction):
         """Initial setup wizard for the bot"""
         try:
             await check_admin(interaction.user)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
 
             # Check if guild exists
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
 
             if guild_data:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("This server is already set up. Use `/config` to modify settings."),
                     ephemeral=True
                 )
@@ -73,7 +83,7 @@ class Admin(commands.Cog):
                 color=0x00FF00
             )
 
-            await interaction.response.send_message(embed=embed)
+            await respond(interaction, embed=embed)
 
         except Exception as e:
             await handle_interaction_error(interaction, e)
@@ -90,6 +100,8 @@ class Admin(commands.Cog):
         app_commands.Choice(name="Set Channel", value="set_channel"),
         app_commands.Choice(name="Set Requirement", value="set_requirement"),
     ])
+    # The configuration view is public; the ephemeral hints replace the placeholder
+    @deferred(ephemeral=False)
     async def config(
         self,
         interaction: discord.Interaction,
@@ -104,17 +116,20 @@ class Admin(commands.Cog):
             if action.value == "view":
                 await self.show_config(interaction)
             elif action.value == "set_role":
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     "Please use the `/set_role` command to configure roles.",
                     ephemeral=True
                 )
             elif action.value == "set_channel":
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     "Please use the `/set_channel` command to configure channels.",
                     ephemeral=True
                 )
             elif action.value == "set_requirement":
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     "Please use the `/set_requirement` command to configure requirements.",
                     ephemeral=True
                 )
@@ -124,10 +139,12 @@ class Admin(commands.Cog):
 
     async def show_config(self, interaction: discord.Interaction):
         """Display current configuration"""
-        guild_data = await self.db_helper.get_guild(interaction.guild.id)
+        ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+        guild_data = await ctx.get_guild_data()
 
         if not guild_data:
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_error_message("This server is not set up. Use `/setup` first."),
                 ephemeral=True
             )
@@ -188,7 +205,7 @@ class Admin(commands.Cog):
 
         embed.add_field(name="📋 Requirements", value=requirements_text, inline=False)
 
-        await interaction.response.send_message(embed=embed)
+        await respond(interaction, embed=embed)
 
     @app_commands.command(name="set_role", description="[Admin] Set a role for the democracy system")
     @app_commands.describe(
@@ -204,6 +221,7 @@ class Admin(commands.Cog):
         app_commands.Choice(name="Judiciary", value="judiciary_role_id"),
         app_commands.Choice(name="Citizen (Required)", value="citizen_role_id"),
     ])
+    @deferred(ephemeral=False)
     async def set_role(
         self,
         interaction: discord.Interaction,
@@ -218,8 +236,10 @@ class Admin(commands.Cog):
                 interaction.guild.id,
                 {role_type.value: str(role.id)}
             )
+            permission_tables.invalidate(interaction.guild.id)
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Set {role_type.name} role to {role.mention}")
             )
 
@@ -235,6 +255,7 @@ class Admin(commands.Cog):
         app_commands.Choice(name="Voting Channel", value="voting_channel_id"),
         app_commands.Choice(name="Announcement Channel", value="announcement_channel_id"),
     ])
+    @deferred(ephemeral=False)
     async def set_channel(
         self,
         interaction: discord.Interaction,
@@ -250,7 +271,8 @@ class Admin(commands.Cog):
                 {channel_type.value: str(channel.id)}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Set {channel_type.name} to {channel.mention}")
             )
 
@@ -262,6 +284,7 @@ class Admin(commands.Cog):
         days="Minimum days in server to participate",
         max_councillors="Maximum number of councillors allowed"
     )
+    @deferred(ephemeral=False)
     async def set_requirement(
         self,
         interaction: discord.Interaction,
@@ -273,7 +296,8 @@ class Admin(commands.Cog):
             await check_admin(interaction.user)
 
             if days is None and max_councillors is None:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("Please provide at least one value to update."),
                     ephemeral=True
                 )
@@ -284,7 +308,8 @@ class Admin(commands.Cog):
 
             if days is not None:
                 if days < 0:
-                    await interaction.response.send_message(
+                    await respond(
+                        interaction,
                         create_error_message("Days must be a positive number."),
                         ephemeral=True
                     )
@@ -294,7 +319,8 @@ class Admin(commands.Cog):
 
             if max_councillors is not None:
                 if max_councillors < 1:
-                    await interaction.response.send_message(
+                    await respond(
+                        interaction,
                         create_error_message("Max councillors must be at least 1."),
                         ephemeral=True
                     )
@@ -304,7 +330,8 @@ class Admin(commands.Cog):
 
             await self.db_helper.update_guild(interaction.guild.id, update_data)
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message("\n".join(messages))
             )
 
@@ -313,6 +340,7 @@ class Admin(commands.Cog):
 
     @app_commands.command(name="toggle_bot", description="[Admin] Enable or disable the bot for this server")
     @app_commands.describe(enabled="Whether the bot should be enabled")
+    @deferred(ephemeral=False)
     async def toggle_bot(self, interaction: discord.Interaction, enabled: bool):
         """Enable or disable the bot"""
         try:
@@ -324,13 +352,129 @@ class Admin(commands.Cog):
             )
 
             status = "enabled" if enabled else "disabled"
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Bot has been {status} for this server.")
             )
 
         except Exception as e:
             await handle_interaction_error(interaction, e)
 
+    @app_commands.command(name="sync_commands", description="[Admin] Force a slash command sync with Discord")
+    @deferred()
+    async def sync_commands(self, interaction: discord.Interaction):
+        """Sync slash commands even if the command tree is unchanged"""
+        try:
+            await check_admin(interaction.user)
+
+            count = await self.bot.sync_commands(force=True)
+            await respond(
+                interaction,
+                create_success_message(f"Synced {count} commands with Discord."),
+                ephemeral=True
+            )
+
+        except Exception as e:
+            await handle_interaction_error(interaction, e)
+
+    @app_commands.command(name="db_stats", description="[Admin] Show database call latency and error statistics")
+    @app_commands.describe(
+        dump="Also write the full statistics to a JSON file",
+        reset="Clear the call statistics after showing them"
+    )
+    @deferred()
+    async def db_stats(self, interaction: discord.Interaction, dump: bool = False, reset: bool = False):
+        """Show where database time goes: per operation, Appwrite method, collection and command"""
+        try:
+            await check_admin(interaction.user)
+
+            metrics = self.db_helper.metrics
+            stats = metrics.stats()
+            runtime = {
+                'interactions': timings.stats(),
+                'log_queue': self.db_helper.log_queue.stats(),
+                'scheduler': self.bot.scheduler.stats(),
+                'cache': self.db_helper.cache.stats(),
+                'councillors': self.db_helper.councillors.stats(),
+                'connections': self.db_helper.connection_stats(),
+                'ballot_journal': await self.bot.journal.stats() if self.bot.journal else None
+            }
+
+            embed = create_embed(
+                title="📊 Database Statistics",
+                description=(
+                    f"{stats['requests']} Appwrite requests since <t:{int(stats['since'])}:R>, "
+                    f"{stats['inflight']} in flight (peak {stats['inflight_high_water']}, "
+                    f"limit {self.db_helper.max_concurrency})"
+                ),
+                color=0x4169E1
+            )
+            embed.add_field(name="⏱️ Slowest Operations", value=_format_latency_table(stats['operations']), inline=False)
+            embed.add_field(name="🧭 By Command", value=_format_latency_table(stats['origins']), inline=False)
+            embed.add_field(name="📡 Appwrite Methods", value=_format_latency_table(stats['methods']), inline=False)
+            embed.add_field(name="📦 Collections", value=_format_latency_table(stats['collections']), inline=False)
+
+            errors = ", ".join(f"{code}: {count}" for code, count in sorted(stats['errors'].items())) or "None"
+            embed.add_field(name="❌ Errors", value=errors, inline=False)
+
+            cache = runtime['cache']
+            log_queue = runtime['log_queue']
+            scheduler = runtime['scheduler']
+            connections = runtime['connections']
+            runtime_text = (
+                f"• Cache: {cache['entries']} entries, {cache['hit_rate']:.0%} hit rate\n"
+                f"• Councillor directory: {runtime['councillors']['councillors']} records in {runtime['councillors']['guilds']} servers\n"
+                f"• Log queue: {log_queue['depth']} queued, {log_queue['dropped']} dropped, {log_queue['failed']} failed\n"
+                f"• Scheduler: {scheduler['scheduled']} scheduled, {scheduler['depth']} waiting\n"
+                f"• Late acknowledgements: {sum(handler['late'] for handler in runtime['interactions'].values())}"
+            )
+            if runtime['ballot_journal']:
+                runtime_text += (
+                    f"\n• Ballot journal: {runtime['ballot_journal']['pending']} pending, "
+                    f"{runtime['ballot_journal']['dead']} dead-lettered"
+                )
+            if connections:
+                runtime_text += (
+                    f"\n• Connections: {connections['reused_connections']}/{connections['requests']} requests reused a connection"
+                )
+            embed.add_field(name="🗂️ Queues & Caches", value=runtime_text, inline=False)
+
+            attachments = {}
+            if dump:
+                path = getattr(config, 'DB_STATS_DUMP_PATH', 'db_stats.json')
+                # File I/O stays off the event loop (the snapshot was taken on it); the
+                # attachment is sent from the written bytes instead of reopening the file
+                data = await asyncio.get_running_loop().run_in_executor(None, metrics.dump, path, runtime, stats)
+                attachments['file'] = discord.File(io.BytesIO(data), filename=os.path.basename(path))
+                embed.set_footer(text=f"Full statistics written to {path}")
+
+            if reset:
+                metrics.reset()
+
+            await respond(interaction, embed=embed, ephemeral=True, **attachments)
+
+        except Exception as e:
+            await handle_interaction_error(interaction, e)
+
+
+def _format_latency_table(histograms: Dict[str, Dict[str, Any]], limit: int = 6) -> str:
+    """The entries with the most total time, one line each (latencies in ms)"""
+    lines = []
+    # Operations still running their first call have requests but no timings yet
+    timed = [(name, histogram) for name, histogram in histograms.items() if histogram['count']]
+    for name, histogram in timed[:limit]:
+        line = (
+            f"`{name}` {histogram['count']}× "
+            f"p50 {histogram['p50'] * 1000:.0f} / p95 {histogram['p95'] * 1000:.0f} ms, "
+            f"total {histogram['total']:.1f}s"
+        )
+        if histogram.get('appwrite_calls'):
+            line += f", {histogram['appwrite_calls']} requests"
+        if histogram['errors']:
+            line += f", {histogram['errors']} errors"
+        lines.append(line)
+    return "\n".join(lines) or "No calls yet"
+
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(Admin(bot))
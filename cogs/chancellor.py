@@ -9,8 +9,10 @@ from discord.ext import commands
 from typing import Optional
 
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
 from utils.permissions import check_chancellor, is_admin
 from utils.errors import handle_interaction_error, NotFoundError, AlreadyExistsError
+from utils.interactions import deferred, respond
 from utils.formatting import (
     create_success_message, create_error_message, create_embed,
     format_heading, format_bold, format_timestamp
@@ -32,6 +34,7 @@ class Chancellor(commands.Cog):
         description="Description of the ministry's purpose",
         minister="Discord member to assign as minister (optional)"
     )
+    @deferred(ephemeral=False)
     async def create_ministry(
         self,
         interaction: discord.Interaction,
@@ -41,7 +44,8 @@ class Chancellor(commands.Cog):
     ):
         """Create a new ministry"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
             # Check if ministry with same name exists
             existing_ministries = await self.db_helper.list_ministries(interaction.guild.id)
@@ -83,7 +87,7 @@ class Chancellor(commands.Cog):
 
             embed.set_footer(text=f"Created by {interaction.user.name}")
 
-            await interaction.response.send_message(embed=embed)
+            await respond(interaction, embed=embed)
 
         except Exception as e:
             await handle_interaction_error(interaction, e)
@@ -93,6 +97,7 @@ class Chancellor(commands.Cog):
         ministry_name="Name of the ministry",
         minister="Discord member to assign as minister"
     )
+    @deferred(ephemeral=False)
     async def assign_minister(
         self,
         interaction: discord.Interaction,
@@ -101,7 +106,8 @@ class Chancellor(commands.Cog):
     ):
         """Assign a minister to a ministry"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
             # Find ministry
             ministries = await self.db_helper.list_ministries(interaction.guild.id)
@@ -129,7 +135,8 @@ class Chancellor(commands.Cog):
                 details={'ministry_id': ministry['$id'], 'minister_id': str(minister.id)}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"{minister.mention} has been assigned as Minister of {ministry['name']}"
                 )
@@ -140,6 +147,7 @@ class Chancellor(commands.Cog):
 
     @app_commands.command(name="remove_ministry", description="[Chancellor] Remove a ministry")
     @app_commands.describe(ministry_name="Name of the ministry to remove")
+    @deferred(ephemeral=False)
     async def remove_ministry(
         self,
         interaction: discord.Interaction,
@@ -147,7 +155,8 @@ class Chancellor(commands.Cog):
     ):
         """Remove a ministry"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
             # Find ministry
             ministries = await self.db_helper.list_ministries(interaction.guild.id)
@@ -172,7 +181,8 @@ class Chancellor(commands.Cog):
                 details={'ministry_id': ministry['$id'], 'name': ministry_name}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Ministry '{ministry_name}' has been removed.")
             )
 
@@ -180,15 +190,18 @@ class Chancellor(commands.Cog):
             await handle_interaction_error(interaction, e)
 
     @app_commands.command(name="list_ministries", description="[Chancellor] List all ministries")
+    @deferred(ephemeral=False)
     async def list_ministries(self, interaction: discord.Interaction):
         """List all active ministries"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
             ministries = await self.db_helper.list_ministries(interaction.guild.id)
 
             if not ministries:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     "No ministries have been created yet.",
                     ephemeral=True
                 )
@@ -218,7 +231,7 @@ class Chancellor(commands.Cog):
                     inline=False
                 )
 
-            await interaction.response.send_message(embed=embed)
+            await respond(interaction, embed=embed)
 
         except Exception as e:
             await handle_interaction_error(interaction, e)
@@ -229,6 +242,7 @@ class Chancellor(commands.Cog):
         message="Announcement message",
         ping_everyone="Whether to ping @everyone (use sparingly)"
     )
+    @deferred()
     async def announce(
         self,
         interaction: discord.Interaction,
@@ -238,15 +252,17 @@ class Chancellor(commands.Cog):
     ):
         """Make an official announcement"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
 
             # Determine announcement channel
             channel_id = guild_data.get('announcement_channel_id') or guild_data.get('voting_channel_id')
 
             if not channel_id:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message(
                         "No announcement channel configured. Ask an admin to set one with `/set_channel`."
                     ),
@@ -256,7 +272,8 @@ class Chancellor(commands.Cog):
 
             channel = interaction.guild.get_channel(int(channel_id))
             if not channel:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("Announcement channel not found."),
                     ephemeral=True
                 )
@@ -290,7 +307,8 @@ class Chancellor(commands.Cog):
                 details={'title': title, 'pinged_everyone': ping_everyone}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Announcement posted in {channel.mention}"),
                 ephemeral=True
             )
@@ -303,6 +321,7 @@ class Chancellor(commands.Cog):
         ministry_name="Name of the ministry",
         role="Discord role to associate with this ministry"
     )
+    @deferred(ephemeral=False)
     async def appoint_role(
         self,
         interaction: discord.Interaction,
@@ -311,7 +330,8 @@ class Chancellor(commands.Cog):
     ):
         """Associate a Discord role with a ministry"""
         try:
-            await check_chancellor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_chancellor(ctx)
 
             # Find ministry
             ministries = await self.db_helper.list_ministries(interaction.guild.id)
@@ -347,13 +367,15 @@ class Chancellor(commands.Cog):
                     details={'ministry_id': ministry['$id'], 'role_id': str(role.id)}
                 )
 
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_success_message(
                         f"Role {role.mention} has been associated with {ministry['name']}"
                     )
                 )
             else:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message(f"Role {role.mention} is already associated with this ministry."),
                     ephemeral=True
                 )
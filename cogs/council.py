@@ -8,8 +8,10 @@ from discord import app_commands
 from datetime import datetime, timezone
 
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
 from utils.permissions import can_register_to_vote
 from utils.errors import handle_interaction_error
+from utils.interactions import deferred, respond
 from utils.formatting import create_embed, format_bold, create_success_message, create_error_message
 from utils.helpers import datetime_now
 
@@ -50,7 +52,7 @@ class CouncilInfoView(discord.ui.View):
             color=0x4169E1
         )
 
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await respond(interaction, embed=embed, ephemeral=True)
 
 
 class Council(commands.Cog):
@@ -61,24 +63,23 @@ class Council(commands.Cog):
         self.db_helper: DatabaseHelper = bot.db_helper
 
     @app_commands.command(name="council", description="Learn about the Grand Council and how to participate")
+    @deferred()
     async def council(self, interaction: discord.Interaction):
         """Display council information"""
         try:
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            guild_data = await ctx.get_guild_data()
 
             if not guild_data:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("This server is not set up yet. Ask an admin to use `/setup`."),
                     ephemeral=True
                 )
                 return
 
             # Check eligibility
-            can_participate, reason = await can_register_to_vote(
-                interaction.user,
-                interaction.guild,
-                self.db_helper
-            )
+            can_participate, reason = await can_register_to_vote(ctx)
 
             # Calculate user's stats
             joined_at = interaction.user.joined_at
@@ -131,12 +132,12 @@ class Council(commands.Cog):
             embed.add_field(name="📋 Eligibility Requirements", value=eligibility_text, inline=False)
 
             # Add current stats
-            councillors = await self.db_helper.list_councillors(interaction.guild.id)
-            council_data = await self.db_helper.get_council(interaction.guild.id)
+            councillors = await self.db_helper.councillors.get(interaction.guild.id)
+            chancellor = councillors.chancellor()
 
             stats_text = (
-                f"• Current Councillors: {len(councillors)}/{guild_data.get('max_councillors', 9)}\n"
-                f"• Chancellor: {'Elected' if council_data and council_data.get('current_chancellor_id') else 'Not elected yet'}"
+                f"• Current Councillors: {councillors.active_count}/{guild_data.get('max_councillors', 9)}\n"
+                f"• Chancellor: {chancellor['name'] if chancellor else 'Not elected yet'}"
             )
 
             embed.add_field(name="📊 Current Status", value=stats_text, inline=False)
@@ -145,7 +146,7 @@ class Council(commands.Cog):
 
             view = CouncilInfoView(self.bot, self.db_helper)
 
-            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            await respond(interaction, embed=embed, view=view, ephemeral=True)
 
         except Exception as e:
             await handle_interaction_error(interaction, e)
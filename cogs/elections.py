@@ -2,67 +2,124 @@
 Elections Commands Cog
 Handles council elections and chancellor elections
 """
+import asyncio
+
 import discord
-from appwrite.query import Query
 from discord import app_commands
 from discord.ext import commands
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
 from utils.permissions import check_president, check_admin, can_register_to_vote, can_run_for_councillor, check_councillor, is_eligible
 from utils.errors import handle_interaction_error, AlreadyExistsError, NotFoundError, InvalidInputError
+from utils.interactions import deferred, respond
 from utils.formatting import (
     create_success_message, create_error_message, create_embed,
     format_timestamp, format_bold
 )
-from utils.helpers import datetime_now, convert_datetime_from_str, generate_keycap_emoji, parse_iso_datetime
+from utils.helpers import datetime_now, convert_datetime_from_str, generate_keycap_emoji, parse_iso_datetime, is_voting_open
 from utils.enums import VotingType, VotingStatus, LogType, RoleType
+from utils.roles import RoleReconcileReport, reconcile_council_roles
 
 
-class ElectionRegistrationView(discord.ui.View):
-    """View for election registration buttons"""
+def role_report_status(report: RoleReconcileReport) -> str:
+    """Short role update status for command replies and result announcements"""
+    if report.ok:
+        return f"✅ Roles updated! ({report.summary()})"
+    return f"⚠️ Some role updates failed ({report.summary()})"
 
-    def __init__(self, bot: commands.Bot, db_helper: DatabaseHelper, voting_id: str):
-        super().__init__(timeout=None)
-        self.bot = bot
-        self.db_helper = db_helper
+
+class ElectionRegisterButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'election:(?P<voting_id>[\w.-]+):register:(?P<role>voter|candidate)'
+):
+    """Registration button; the election ID is encoded in the custom_id, so it works across restarts"""
+
+    def __init__(self, voting_id: str, role: str):
+        if role == 'voter':
+            button = discord.ui.Button(
+                label="Register to Vote",
+                style=discord.ButtonStyle.green,
+                emoji="🗳️",
+                custom_id=f"election:{voting_id}:register:voter"
+            )
+        else:
+            button = discord.ui.Button(
+                label="Run for Councillor",
+                style=discord.ButtonStyle.blurple,
+                emoji="🏛️",
+                custom_id=f"election:{voting_id}:register:candidate"
+            )
+        super().__init__(button)
         self.voting_id = voting_id
+        self.role = role
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['voting_id'], match['role'])
 
-    @discord.ui.button(label="Register to Vote", style=discord.ButtonStyle.green, emoji="🗳️")
-    async def register_voter(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def callback(self, interaction: discord.Interaction):
+        if self.role == 'voter':
+            await self.register_voter(interaction)
+        else:
+            await self.register_candidate(interaction)
+
+    @deferred()
+    async def register_voter(self, interaction: discord.Interaction):
         """Register as a voter"""
         try:
+            bot = interaction.client
+            db_helper: DatabaseHelper = bot.db_helper
+            ctx = InteractionContext.from_interaction(interaction, db_helper)
+
+            # Buttons outlive the election, so check it is still taking registrations
+            voting = await db_helper.get_guild_voting(interaction.guild.id, self.voting_id)
+            if not is_voting_open(voting, VotingStatus.PENDING, VotingStatus.VOTING):
+                await respond(
+                    interaction,
+                    create_error_message("Registration for this election is closed."),
+                    ephemeral=True
+                )
+                return
+
             # Check eligibility
-            can_vote, reason = await can_register_to_vote(
-                interaction.user, interaction.guild, self.db_helper
-            )
+            can_vote, reason = await can_register_to_vote(ctx)
 
             if not can_vote:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message(f"Not eligible: {reason}"),
                     ephemeral=True
                 )
                 return
 
-            # Check if already registered
-            voters = await self.db_helper.get_registered_voters(self.voting_id)
-            for voter in voters:
-                if voter['discord_id'] == str(interaction.user.id):
-                    await interaction.response.send_message(
-                        create_error_message("You are already registered to vote!"),
-                        ephemeral=True
-                    )
-                    return
+            # Check if already registered, claiming the slot so double clicks can't register twice
+            roster = await bot.rosters.get(self.voting_id)
+            if not roster.reserve(interaction.user.id):
+                await respond(
+                    interaction,
+                    create_error_message("You are already registered to vote!"),
+                    ephemeral=True
+                )
+                return
 
             # Register voter
-            await self.db_helper.register_voter(
-                voting_id=self.voting_id,
-                discord_id=interaction.user.id,
-                name=interaction.user.name
-            )
+            try:
+                voter = await db_helper.register_voter(
+                    voting_id=self.voting_id,
+                    discord_id=interaction.user.id,
+                    name=interaction.user.name
+                )
+            except Exception:
+                roster.discard(interaction.user.id)
+                raise
 
-            await interaction.response.send_message(
+            roster.add(interaction.user.id, voter['$id'])
+
+            await respond(
+                interaction,
                 create_success_message("You have been registered to vote in this election!"),
                 ephemeral=True
             )
@@ -70,29 +127,42 @@ class ElectionRegistrationView(discord.ui.View):
         except Exception as e:
             await handle_interaction_error(interaction, e)
 
-    @discord.ui.button(label="Run for Councillor", style=discord.ButtonStyle.blurple, emoji="🏛️")
-    async def register_candidate(self, interaction: discord.Interaction, button: discord.ui.Button):
+    @deferred()
+    async def register_candidate(self, interaction: discord.Interaction):
         """Register as a candidate"""
         try:
+            db_helper: DatabaseHelper = interaction.client.db_helper
+            ctx = InteractionContext.from_interaction(interaction, db_helper)
+
+            # Buttons outlive the election, so check it is still taking registrations
+            voting = await db_helper.get_guild_voting(interaction.guild.id, self.voting_id)
+            if not is_voting_open(voting, VotingStatus.PENDING, VotingStatus.VOTING):
+                await respond(
+                    interaction,
+                    create_error_message("Registration for this election is closed."),
+                    ephemeral=True
+                )
+                return
+
             # Check eligibility
-            can_run, reason = await can_run_for_councillor(
-                interaction.user, interaction.guild, self.db_helper
-            )
+            can_run, reason = await can_run_for_councillor(ctx)
 
             if not can_run:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message(f"Not eligible: {reason}"),
                     ephemeral=True
                 )
                 return
 
             # Check max candidates
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
             max_candidates = guild_data.get('max_councillors', 9)
 
-            candidates = await self.db_helper.get_candidates(self.voting_id)
+            candidates = await db_helper.get_candidates(self.voting_id)
             if len(candidates) >= max_candidates:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message(f"Maximum number of candidates ({max_candidates}) reached!"),
                     ephemeral=True
                 )
@@ -101,20 +171,22 @@ class ElectionRegistrationView(discord.ui.View):
             # Check if already registered as candidate
             for candidate in candidates:
                 if candidate['discord_id'] == str(interaction.user.id):
-                    await interaction.response.send_message(
+                    await respond(
+                        interaction,
                         create_error_message("You are already registered as a candidate!"),
                         ephemeral=True
                     )
                     return
 
             # Register candidate
-            await self.db_helper.register_candidate(
+            await db_helper.register_candidate(
                 voting_id=self.voting_id,
                 discord_id=interaction.user.id,
                 name=interaction.user.name
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message("You have been registered as a candidate! Good luck! 🍀"),
                 ephemeral=True
             )
@@ -123,91 +195,202 @@ class ElectionRegistrationView(discord.ui.View):
             await handle_interaction_error(interaction, e)
 
 
-class ElectionVotingView(discord.ui.View):
-    """View for casting votes in elections"""
+class ElectionVoteButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'election:(?P<voting_id>[\w.-]+):vote:(?P<candidate_id>[\w.-]+)'
+):
+    """Vote button for one candidate; the election and candidate IDs are encoded in the custom_id"""
 
-    def __init__(self, bot: commands.Bot, db_helper: DatabaseHelper, voting_id: str, candidates: list):
-        super().__init__(timeout=None)
-        self.bot = bot
-        self.db_helper = db_helper
+    def __init__(self, voting_id: str, candidate_id: str, label: Optional[str] = None, emoji: Optional[str] = None):
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=discord.ButtonStyle.primary,
+                emoji=emoji,
+                custom_id=f"election:{voting_id}:vote:{candidate_id}"
+            )
+        )
         self.voting_id = voting_id
+        self.candidate_id = candidate_id
 
-        # Add buttons for each candidate (max 5 per row, max 25 total)
-        for i, candidate in enumerate(candidates[:25]):
-            button = discord.ui.Button(
-                label=candidate['name'][:80],  # Discord limit
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['voting_id'], match['candidate_id'], label=item.label, emoji=item.emoji)
+
+    async def callback(self, interaction: discord.Interaction):
+        # The button label is the candidate's name
+        await cast_election_vote(interaction, self.voting_id, self.candidate_id, self.item.label)
+
+
+class LegacyElectionVoteButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'vote_(?!(?:for|against)$)(?P<candidate_id>[\w.-]+)'
+):
+    """Vote button of messages posted before the election ID was part of the custom_id"""
+
+    def __init__(self, candidate_id: str, label: Optional[str] = None):
+        super().__init__(
+            discord.ui.Button(
+                label=label,
                 style=discord.ButtonStyle.primary,
-                emoji=generate_keycap_emoji(i),
-                custom_id=f"vote_{candidate['$id']}"
+                custom_id=f"vote_{candidate_id}"
             )
-            button.callback = self.create_vote_callback(candidate['$id'], candidate['name'])
-            self.add_item(button)
+        )
+        self.candidate_id = candidate_id
 
-    def create_vote_callback(self, candidate_id: str, candidate_name: str):
-        async def callback(interaction: discord.Interaction):
-            await self.cast_vote(interaction, candidate_id, candidate_name)
-        return callback
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['candidate_id'], label=item.label)
 
-    async def cast_vote(self, interaction: discord.Interaction, candidate_id: str, candidate_name: str):
-        """Handle vote casting for a candidate"""
+    @deferred()
+    async def callback(self, interaction: discord.Interaction):
         try:
-            # Check if registered to vote
-            voters = await self.db_helper.get_registered_voters(self.voting_id)
-            voter = None
-            for v in voters:
-                if v['discord_id'] == str(interaction.user.id):
-                    voter = v
-                    break
-
-            if not voter:
-                await interaction.response.send_message(
-                    create_error_message("You must register to vote before casting your ballot!"),
-                    ephemeral=True
-                )
-                return
+            # The candidate document knows which election it belongs to
+            candidate = await interaction.client.db_helper.get_candidate(self.candidate_id)
+            if not candidate:
+                raise NotFoundError("This candidate no longer exists.")
+        except Exception as e:
+            await handle_interaction_error(interaction, e)
+            return
 
-            # Check if already voted
-            if voter.get('has_voted', False):
-                await interaction.response.send_message(
-                    create_error_message("You have already voted in this election!"),
-                    ephemeral=True
-                )
-                return
+        await cast_election_vote(interaction, candidate['voting_id'], self.candidate_id, candidate['name'])
 
-            # Cast vote
-            await self.db_helper.cast_vote(
-                voting_id=self.voting_id,
-                stance=True,  # For elections, stance is always True
-                discord_id=interaction.user.id,
-                candidate_id=candidate_id
-            )
 
-            # Mark voter as having voted
-            await self.db_helper.update_voter(voter['$id'], {'has_voted': True})
+@deferred()
+async def cast_election_vote(interaction: discord.Interaction, voting_id: str, candidate_id: str, candidate_name: str):
+    """Handle vote casting for a candidate"""
+    try:
+        bot = interaction.client
+        db_helper: DatabaseHelper = bot.db_helper
 
-            # Increment candidate vote count
-            candidate = await self.db_helper.get_candidate(candidate_id)
-            await self.db_helper.update_candidate(
-                candidate_id,
-                {'vote_count': candidate.get('vote_count', 0) + 1}
+        # Buttons outlive the election, so check it is still open before touching the roster
+        voting = await db_helper.get_guild_voting(interaction.guild.id, voting_id)
+        if not is_voting_open(voting):
+            await respond(
+                interaction,
+                create_error_message("This election is closed."),
+                ephemeral=True
             )
+            return
 
-            # Log the vote
-            await self.db_helper.log(
-                guild_id=interaction.guild.id,
-                log_type=LogType.VOTE,
-                action="cast_election_vote",
-                discord_id=interaction.user.id,
-                details={'voting_id': self.voting_id, 'candidate_id': candidate_id}
+        # Check if registered to vote
+        roster = await bot.rosters.get(voting_id)
+        voter = roster.get(interaction.user.id)
+
+        if not voter:
+            await respond(
+                interaction,
+                create_error_message("You must register to vote before casting your ballot!"),
+                ephemeral=True
             )
+            return
 
-            await interaction.response.send_message(
-                create_success_message(f"Your vote for **{candidate_name}** has been recorded! 🗳️"),
+        # Check if already voted
+        if voter.has_voted:
+            await respond(
+                interaction,
+                create_error_message("You have already voted in this election!"),
                 ephemeral=True
             )
+            return
+
+        # Written ballots hold the election open; /close_election waits for them before reading results
+        async with bot.rosters.ballot(voting_id) as accepted:
+            if not accepted:
+                await respond(
+                    interaction,
+                    create_error_message("This election is closed."),
+                    ephemeral=True
+                )
+                return
+
+            # Mark the ballot as used before any awaits so concurrent clicks can't vote twice
+            voter.has_voted = True
+
+            if bot.journal:
+                # Journal the ballot locally; the flusher writes it to Appwrite in a batch
+                try:
+                    await bot.journal.append(
+                        voting_id=voting_id,
+                        discord_id=interaction.user.id,
+                        candidate_id=candidate_id,
+                        voter_id=voter.voter_id
+                    )
+                except Exception:
+                    voter.has_voted = False
+                    raise
+            else:
+                try:
+                    # Cast vote
+                    await db_helper.cast_vote(
+                        voting_id=voting_id,
+                        stance=True,  # For elections, stance is always True
+                        discord_id=interaction.user.id,
+                        candidate_id=candidate_id
+                    )
+                except Exception:
+                    voter.has_voted = False
+                    raise
+
+                # The vote is stored, so queue the candidate vote count increment before anything
+                # else can fail; the tally actor batches the write
+                bot.tallies.increment(voting_id, candidate_id)
+
+                # Mark voter as having voted; the vote stands even if this write fails, and the
+                # roster (plus the unique vote index) still blocks a second ballot
+                try:
+                    await db_helper.update_voter(voter.voter_id, {'has_voted': True})
+                except Exception as e:
+                    print(f"Failed to mark voter {voter.voter_id} as having voted: {e}")
+
+        # Log the vote
+        await db_helper.log(
+            guild_id=interaction.guild.id,
+            log_type=LogType.VOTE,
+            action="cast_election_vote",
+            discord_id=interaction.user.id,
+            details={'voting_id': voting_id, 'candidate_id': candidate_id}
+        )
+
+        await respond(
+            interaction,
+            create_success_message(f"Your vote for **{candidate_name}** has been recorded! 🗳️"),
+            ephemeral=True
+        )
+
+    except Exception as e:
+        await handle_interaction_error(interaction, e)
+
+
+class ElectionRegistrationView(discord.ui.View):
+    """Registration buttons for an election announcement"""
+
+    def __init__(self, voting_id: str):
+        super().__init__(timeout=None)
+        self.add_item(ElectionRegisterButton(voting_id, 'voter'))
+        self.add_item(ElectionRegisterButton(voting_id, 'candidate'))
+
+
+class ElectionVotingView(discord.ui.View):
+    """Candidate buttons for casting votes in an election"""
+
+    def __init__(self, voting_id: str, candidates: list):
+        super().__init__(timeout=None)
+
+        # Add buttons for each candidate (max 5 per row, max 25 total)
+        for i, candidate in enumerate(candidates[:25]):
+            self.add_item(
+                ElectionVoteButton(
+                    voting_id,
+                    candidate['$id'],
+                    label=candidate['name'][:80],  # Discord limit
+                    emoji=generate_keycap_emoji(i)
+                )
+            )
 
-        except Exception as e:
-            await handle_interaction_error(interaction, e)
+
+# Every election button is routed by its custom_id, so no per-message views are kept
+DYNAMIC_ITEMS = (ElectionRegisterButton, ElectionVoteButton, LegacyElectionVoteButton)
 
 
 class Elections(commands.Cog):
@@ -217,6 +400,40 @@ class Elections(commands.Cog):
         self.bot = bot
         self.db_helper: DatabaseHelper = bot.db_helper
 
+    async def _close_ballots(self, voting: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Stop accepting ballots for an election and return its candidates by vote count
+
+        The voting is marked closed (which also drops it from the cache) and the
+        ballots being written are awaited before the journal and tallies are
+        drained, so a click arriving meanwhile is refused instead of being
+        counted after the results were read. If the drain fails the election is
+        reopened so the command can be retried.
+        """
+        await self.db_helper.update_voting(voting['$id'], {'status': VotingStatus.PASSED.value})
+        try:
+            # Clicks that passed the open check before it may still be writing their ballot
+            await self.bot.rosters.close(voting['$id'])
+
+            # Write any journaled ballots and queued vote counts before reading them
+            if self.bot.journal:
+                await self.bot.journal.flush_voting(voting['$id'])
+            await self.bot.tallies.close(voting['$id'])
+
+            candidates = await self.db_helper.get_candidates(voting['$id'])
+        except Exception:
+            await self._reopen_election(voting)
+            raise
+
+        self.bot.rosters.evict(voting['$id'])
+        candidates.sort(key=lambda x: x.get('vote_count', 0), reverse=True)
+        return candidates
+
+    async def _reopen_election(self, voting: Dict[str, Any]) -> None:
+        """Put an election whose close was aborted back into voting"""
+        await self.db_helper.update_voting(voting['$id'], {'status': VotingStatus.VOTING.value})
+        self.bot.rosters.reopen(voting['$id'])
+
     @app_commands.command(name='announce_election', description="[President] Announce a council election")
     @app_commands.describe(
         registration_end="Registration end date (format: DD.MM.YYYY HH:MM)",
@@ -224,6 +441,7 @@ class Elections(commands.Cog):
         channel="Channel to post announcement (optional)",
         ping_everyone="Whether to ping @everyone"
     )
+    @deferred()
     async def announce_election(
         self,
         interaction: discord.Interaction,
@@ -234,7 +452,8 @@ class Elections(commands.Cog):
     ):
         """Announce a new council election"""
         try:
-            await check_president(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_president(ctx)
 
             # Parse dates
             reg_end_dt = convert_datetime_from_str(registration_end)
@@ -249,13 +468,13 @@ class Elections(commands.Cog):
                 raise InvalidInputError("Voting end must be after registration end.")
 
             # Check for existing pending election
-            council_data = await self.db_helper.get_council(interaction.guild.id)
+            council_data = await ctx.get_council()
             if council_data and council_data.get('election_in_progress'):
                 raise AlreadyExistsError("An election is already in progress!")
 
             # Determine channel
             if not channel:
-                guild_data = await self.db_helper.get_guild(interaction.guild.id)
+                guild_data = await ctx.get_guild_data()
                 channel_id = guild_data.get('announcement_channel_id') or guild_data.get('voting_channel_id')
                 if channel_id:
                     channel = interaction.guild.get_channel(int(channel_id))
@@ -310,7 +529,7 @@ class Elections(commands.Cog):
             )
 
             # Add view with correct voting ID
-            view = ElectionRegistrationView(self.bot, self.db_helper, voting['$id'])
+            view = ElectionRegistrationView(voting['$id'])
             await message.edit(view=view)
 
             # Log action
@@ -322,7 +541,8 @@ class Elections(commands.Cog):
                 details={'voting_id': voting['$id']}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(f"Election announced in {channel.mention}!"),
                 ephemeral=True
             )
@@ -334,6 +554,7 @@ class Elections(commands.Cog):
     @app_commands.describe(
         channel="Channel to post voting message (optional)"
     )
+    @deferred()
     async def start_voting(
         self,
         interaction: discord.Interaction,
@@ -341,25 +562,18 @@ class Elections(commands.Cog):
     ):
         """Start voting phase for pending election"""
         try:
-            await check_president(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_president(ctx)
 
             # Find pending election
-            council_id = f"{interaction.guild.id}_c"
-            result = self.db_helper.db.list_documents(
-                database_id=self.db_helper.db_id,
-                collection_id='votings',
-                queries=[
-                    Query.equal('council_id', council_id),
-                    Query.equal('type', VotingType.ELECTION.value),
-                    Query.equal('status', VotingStatus.PENDING.value),
-                    Query.limit(1)
-                ]
-            )
-
-            if result['total'] == 0:
-                raise NotFoundError("No pending election found.")
+            voting = await self.db_helper.find_voting(
+                interaction.guild.id,
+                VotingType.ELECTION,
+                VotingStatus.PENDING
+            )
 
-            voting = result['documents'][0]
+            if not voting:
+                raise NotFoundError("No pending election found.")
 
             # Get candidates
             candidates = await self.db_helper.get_candidates(voting['$id'])
@@ -368,7 +582,7 @@ class Elections(commands.Cog):
 
             # Determine channel
             if not channel:
-                guild_data = await self.db_helper.get_guild(interaction.guild.id)
+                guild_data = await ctx.get_guild_data()
                 channel_id = guild_data.get('voting_channel_id') or guild_data.get('announcement_channel_id')
                 if channel_id:
                     channel = interaction.guild.get_channel(int(channel_id))
@@ -403,10 +617,10 @@ class Elections(commands.Cog):
             embed.set_footer(text=f"Election ID: {voting['$id']}")
 
             # Send voting message
-            view = ElectionVotingView(self.bot, self.db_helper, voting['$id'], candidates)
+            view = ElectionVotingView(voting['$id'], candidates)
 
             content = None
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
             if guild_data.get('citizen_role_id'):
                 content = f"<@&{guild_data['citizen_role_id']}>"
 
@@ -430,7 +644,8 @@ class Elections(commands.Cog):
                 details={'voting_id': voting['$id'], 'candidates': len(candidates)}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"Voting has started in {channel.mention}!\n"
                     f"{len(candidates)} candidates are running."
@@ -442,83 +657,64 @@ class Elections(commands.Cog):
             await handle_interaction_error(interaction, e)
 
     @app_commands.command(name='close_election', description="[President] Close election and elect winners")
+    @deferred()
     async def close_election(self, interaction: discord.Interaction):
         """Close the election and elect the top candidates"""
         try:
-            await check_president(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_president(ctx)
 
             # Find active election
-            council_id = f"{interaction.guild.id}_c"
-            from appwrite.query import Query
-            result = self.db_helper.db.list_documents(
-                database_id=self.db_helper.db_id,
-                collection_id='votings',
-                queries=[
-                    Query.equal('council_id', council_id),
-                    Query.equal('type', VotingType.ELECTION.value),
-                    Query.equal('status', VotingStatus.VOTING.value),
-                    Query.limit(1)
-                ]
-            )
-
-            if result['total'] == 0:
-                raise NotFoundError("No active election found.")
+            voting = await self.db_helper.find_voting(
+                interaction.guild.id,
+                VotingType.ELECTION,
+                VotingStatus.VOTING
+            )
 
-            voting = result['documents'][0]
+            if not voting:
+                raise NotFoundError("No active election found.")
 
-            # Get candidates sorted by vote count
-            candidates = await self.db_helper.get_candidates(voting['$id'])
-            candidates.sort(key=lambda x: x.get('vote_count', 0), reverse=True)
+            # Get candidates sorted by vote count, once no more ballots can arrive
+            candidates = await self._close_ballots(voting)
 
             # Determine how many to elect
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
             max_councillors = guild_data.get('max_councillors', 9)
 
-            # Get councillor role for Discord role management
-            councillor_role_id = guild_data.get('councillor_role_id')
-            councillor_role = None
-            if councillor_role_id:
-                councillor_role = interaction.guild.get_role(int(councillor_role_id))
-
-            # Deactivate all current councillors and remove their roles
+            # Deactivate all current councillors
             current_councillors = await self.db_helper.list_councillors(interaction.guild.id)
-            for councillor in current_councillors:
-                await self.db_helper.update_councillor(councillor['$id'], {'active': False})
-
-                # Remove councillor role from old councillors
-                if councillor_role:
-                    try:
-                        member = interaction.guild.get_member(int(councillor['discord_id']))
-                        if member and councillor_role in member.roles:
-                            await member.remove_roles(councillor_role, reason="Council term ended - new election")
-                    except Exception as e:
-                        # Log but don't fail if role removal fails
-                        print(f"Failed to remove role from {councillor['discord_id']}: {e}")
-
-            # Elect top candidates
-            elected = []
-            for i, candidate in enumerate(candidates[:max_councillors]):
-                if candidate.get('vote_count', 0) > 0:  # Only elect if they got votes
-                    # Create councillor record
-                    await self.db_helper.create_councillor(
-                        discord_id=candidate['discord_id'],
-                        name=candidate['name'],
-                        guild_id=interaction.guild.id
-                    )
+            await self.db_helper.update_many(
+                'councillors',
+                [councillor['$id'] for councillor in current_councillors],
+                {'active': False}
+            )
 
-                    # Mark as elected
-                    await self.db_helper.update_candidate(candidate['$id'], {'elected': True})
-                    elected.append(candidate)
+            # Elect top candidates (only if they got votes): create their councillor records and mark them elected
+            elected = [c for c in candidates[:max_councillors] if c.get('vote_count', 0) > 0]
+            await asyncio.gather(
+                self.db_helper.create_councillors(
+                    interaction.guild.id,
+                    [(candidate['discord_id'], candidate['name']) for candidate in elected]
+                ),
+                self.db_helper.update_many(
+                    'election_candidates',
+                    [candidate['$id'] for candidate in elected],
+                    {'elected': True}
+                )
+            )
+
+            # Reload the council from Appwrite so the directory matches the stored records
+            await self.db_helper.councillors.rebuild(interaction.guild.id)
 
-                    # Give councillor role to newly elected councillors
-                    if councillor_role:
-                        try:
-                            member = interaction.guild.get_member(int(candidate['discord_id']))
-                            if member and councillor_role not in member.roles:
-                                await member.add_roles(councillor_role, reason="Elected to Grand Council")
-                        except Exception as e:
-                            # Log but don't fail if role assignment fails
-                            print(f"Failed to add role to {candidate['discord_id']}: {e}")
+            # Give the councillor role to exactly the new council, touching only members that changed
+            role_reports = await reconcile_council_roles(
+                interaction.guild,
+                self.db_helper,
+                guild_data,
+                roles=(RoleType.COUNCILLOR,),
+                reason="Grand Council election results"
+            )
+            role_report = role_reports.get(RoleType.COUNCILLOR)
 
             # Update voting status
             await self.db_helper.update_voting(
@@ -542,8 +738,8 @@ class Elections(commands.Cog):
             ])
 
             role_status = ""
-            if councillor_role:
-                role_status = f"\n\n✅ Councillor roles have been updated!"
+            if role_report:
+                role_status = f"\n\n{role_report_status(role_report)}"
             else:
                 role_status = f"\n\n⚠️ No councillor role configured. Use `/set_role` to set one."
 
@@ -553,7 +749,7 @@ class Elections(commands.Cog):
                     f"## The votes are in!\n\n"
                     f"The following candidates have been elected to the Grand Council:\n\n"
                     f"{results_text}\n\n"
-                    f"**Total Votes Cast:** {len(await self.db_helper.get_votes_for_voting(voting['$id']))}\n"
+                    f"**Total Votes Cast:** {await self.db_helper.count_votes(voting['$id'])}\n"
                     f"**Councillors Elected:** {len(elected)}"
                     f"{role_status}\n\n"
                     f"Congratulations to the newly elected Councillors! 🏛️"
@@ -565,7 +761,6 @@ class Elections(commands.Cog):
             embed.set_footer(text="Democracy in Action")
 
             # Send results
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
             channel_id = guild_data.get('announcement_channel_id') or guild_data.get('voting_channel_id')
             if channel_id:
                 channel = interaction.guild.get_channel(int(channel_id))
@@ -581,10 +776,11 @@ class Elections(commands.Cog):
                 details={'voting_id': voting['$id'], 'elected': len(elected)}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"Election closed! {len(elected)} councillors elected."
-                    + (f"\n✅ Roles updated!" if councillor_role else f"\n⚠️ No councillor role set.")
+                    + (f"\n{role_report_status(role_report)}" if role_report else f"\n⚠️ No councillor role set.")
                 ),
                 ephemeral=True
             )
@@ -601,6 +797,7 @@ class Elections(commands.Cog):
         voting_end="Voting end date (format: DD.MM.YYYY HH:MM)",
         channel="Channel to post announcement (optional)"
     )
+    @deferred()
     async def announce_chancellor_election(
         self,
         interaction: discord.Interaction,
@@ -609,7 +806,8 @@ class Elections(commands.Cog):
     ):
         """Announce a new chancellor election (councillors only)"""
         try:
-            await check_councillor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_councillor(ctx)
 
             # Parse date
             vote_end_dt = convert_datetime_from_str(voting_end)
@@ -623,24 +821,18 @@ class Elections(commands.Cog):
                 raise InvalidInputError("Voting end must be in the future.")
 
             # Check for existing active chancellor election
-            council_id = f"{interaction.guild.id}_c"
-            existing = self.db_helper.db.list_documents(
-                database_id=self.db_helper.db_id,
-                collection_id='votings',
-                queries=[
-                    Query.equal('council_id', council_id),
-                    Query.equal('type', VotingType.CHANCELLOR_ELECTION.value),
-                    Query.equal('status', VotingStatus.VOTING.value),
-                    Query.limit(1)
-                ]
-            )
-
-            if existing['total'] > 0:
+            existing = await self.db_helper.find_voting(
+                interaction.guild.id,
+                VotingType.CHANCELLOR_ELECTION,
+                VotingStatus.VOTING
+            )
+
+            if existing:
                 raise AlreadyExistsError("A chancellor election is already in progress!")
 
             # Determine channel
             if not channel:
-                guild_data = await self.db_helper.get_guild(interaction.guild.id)
+                guild_data = await ctx.get_guild_data()
                 channel_id = guild_data.get('voting_channel_id') or guild_data.get('announcement_channel_id')
                 if channel_id:
                     channel = interaction.guild.get_channel(int(channel_id))
@@ -677,16 +869,13 @@ class Elections(commands.Cog):
 
             embed.set_footer(text="Chancellor Election")
 
-            # Create voting view with councillor buttons
-            view = ElectionVotingView(self.bot, self.db_helper, "pending", councillors)
-
-            # Send announcement
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            # Send announcement; the vote buttons are added once the candidates are registered
+            guild_data = await ctx.get_guild_data()
             content = None
             if guild_data.get('councillor_role_id'):
                 content = f"<@&{guild_data['councillor_role_id']}>"
 
-            message = await channel.send(content=content, embed=embed, view=view)
+            message = await channel.send(content=content, embed=embed)
 
             # Create voting record
             voting = await self.db_helper.create_voting(
@@ -700,25 +889,15 @@ class Elections(commands.Cog):
                 required_percentage=0.0  # Chancellor election uses simple majority
             )
 
-            # Register all active councillors as candidates automatically
-            for councillor in councillors:
-                await self.db_helper.register_candidate(
-                    voting_id=voting['$id'],
-                    discord_id=councillor['discord_id'],
-                    name=councillor['name']
-                )
-
-            # Register all councillors as voters automatically
-            for councillor in councillors:
-                await self.db_helper.register_voter(
-                    voting_id=voting['$id'],
-                    discord_id=councillor['discord_id'],
-                    name=councillor['name']
-                )
+            # Register all active councillors as candidates and voters automatically
+            members = [(councillor['discord_id'], councillor['name']) for councillor in councillors]
+            candidates, _ = await asyncio.gather(
+                self.db_helper.register_candidates(voting['$id'], members),
+                self.db_helper.register_voters(voting['$id'], members)
+            )
 
-            # Update the view with the correct voting ID
-            candidates = await self.db_helper.get_candidates(voting['$id'])
-            view = ElectionVotingView(self.bot, self.db_helper, voting['$id'], candidates)
+            # Add the vote buttons for the registered candidates
+            view = ElectionVotingView(voting['$id'], candidates)
 
             # Update embed footer with voting ID
             embed.set_footer(text=f"Chancellor Election • ID: {voting['$id']}")
@@ -733,7 +912,8 @@ class Elections(commands.Cog):
                 details={'voting_id': voting['$id']}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"Chancellor election announced in {channel.mention}!\n"
                     f"Voting ends {format_timestamp(vote_end_dt, 'R')}"
@@ -745,69 +925,44 @@ class Elections(commands.Cog):
             await handle_interaction_error(interaction, e)
 
     @app_commands.command(name='close_chancellor_election', description="[Councillor] Close chancellor election and elect winner")
+    @deferred()
     async def close_chancellor_election(self, interaction: discord.Interaction):
         """Close the chancellor election and elect the winner"""
         try:
-            await check_councillor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_councillor(ctx)
 
             # Find active chancellor election
-            council_id = f"{interaction.guild.id}_c"
-            result = self.db_helper.db.list_documents(
-                database_id=self.db_helper.db_id,
-                collection_id='votings',
-                queries=[
-                    Query.equal('council_id', council_id),
-                    Query.equal('type', VotingType.CHANCELLOR_ELECTION.value),
-                    Query.equal('status', VotingStatus.VOTING.value),
-                    Query.limit(1)
-                ]
-            )
-
-            if result['total'] == 0:
-                raise NotFoundError("No active chancellor election found.")
+            voting = await self.db_helper.find_voting(
+                interaction.guild.id,
+                VotingType.CHANCELLOR_ELECTION,
+                VotingStatus.VOTING
+            )
 
-            voting = result['documents'][0]
+            if not voting:
+                raise NotFoundError("No active chancellor election found.")
 
-            # Get candidates sorted by vote count
-            candidates = await self.db_helper.get_candidates(voting['$id'])
-            candidates.sort(key=lambda x: x.get('vote_count', 0), reverse=True)
+            # Get candidates sorted by vote count, once no more ballots can arrive
+            candidates = await self._close_ballots(voting)
 
             if len(candidates) == 0 or candidates[0].get('vote_count', 0) == 0:
+                await self._reopen_election(voting)
                 raise InvalidInputError("No votes have been cast yet!")
 
             # Get the winner (highest vote count)
             winner = candidates[0]
 
-            # Get guild data for role management
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
-            chancellor_role_id = guild_data.get('chancellor_role_id')
-            chancellor_role = None
-            if chancellor_role_id:
-                chancellor_role = interaction.guild.get_role(int(chancellor_role_id))
-
-            # Remove chancellor role from previous chancellor
-            council_data = await self.db_helper.get_council(interaction.guild.id)
-            if council_data and council_data.get('current_chancellor_id'):
-                old_chancellor_id = council_data['current_chancellor_id']
-                # Find old chancellor councillor record
-                old_councillors = await self.db_helper.list_councillors(interaction.guild.id, active_only=False)
-                for councillor in old_councillors:
-                    if councillor['$id'] == old_chancellor_id:
-                        # Update database
-                        await self.db_helper.update_councillor(councillor['$id'], {'is_chancellor': False})
-
-                        # Remove role
-                        if chancellor_role:
-                            try:
-                                member = interaction.guild.get_member(int(councillor['discord_id']))
-                                if member and chancellor_role in member.roles:
-                                    await member.remove_roles(chancellor_role, reason="Chancellor term ended - new election")
-                            except Exception as e:
-                                print(f"Failed to remove chancellor role from {councillor['discord_id']}: {e}")
-                        break
+            guild_data = await ctx.get_guild_data()
+
+            # Unmark the previous chancellor
+            council_data = await ctx.get_council()
+            councillors = await self.db_helper.councillors.get(interaction.guild.id)
+            old_chancellor_id = council_data.get('current_chancellor_id') if council_data else None
+            if old_chancellor_id and councillors.get(old_chancellor_id):
+                await self.db_helper.update_councillor(old_chancellor_id, {'is_chancellor': False})
 
             # Get the winner's councillor record and mark as chancellor
-            winner_councillor = await self.db_helper.get_councillor(winner['discord_id'], interaction.guild.id)
+            winner_councillor = councillors.find(winner['discord_id'])
             if winner_councillor:
                 await self.db_helper.update_councillor(winner_councillor['$id'], {'is_chancellor': True})
 
@@ -817,14 +972,15 @@ class Elections(commands.Cog):
                     {'current_chancellor_id': winner_councillor['$id']}
                 )
 
-                # Give chancellor role to winner
-                if chancellor_role:
-                    try:
-                        member = interaction.guild.get_member(int(winner['discord_id']))
-                        if member and chancellor_role not in member.roles:
-                            await member.add_roles(chancellor_role, reason="Elected as Chancellor")
-                    except Exception as e:
-                        print(f"Failed to add chancellor role to {winner['discord_id']}: {e}")
+            # Move the chancellor role to the new chancellor
+            role_reports = await reconcile_council_roles(
+                interaction.guild,
+                self.db_helper,
+                guild_data,
+                roles=(RoleType.CHANCELLOR,),
+                reason="Chancellor election results"
+            )
+            role_report = role_reports.get(RoleType.CHANCELLOR)
 
             # Mark winner as elected
             await self.db_helper.update_candidate(winner['$id'], {'elected': True})
@@ -845,8 +1001,8 @@ class Elections(commands.Cog):
             ])
 
             role_status = ""
-            if chancellor_role:
-                role_status = f"\n\n✅ Chancellor role has been updated!"
+            if role_report:
+                role_status = f"\n\n{role_report_status(role_report)}"
             else:
                 role_status = f"\n\n⚠️ No chancellor role configured. Use `/set_role` to set one."
 
@@ -857,7 +1013,7 @@ class Elections(commands.Cog):
                     f"**{winner['name']}** has been elected as the new Chancellor of the Grand Council!\n\n"
                     f"### 📊 Final Results\n"
                     f"{results_text}\n\n"
-                    f"**Total Votes Cast:** {len(await self.db_helper.get_votes_for_voting(voting['$id']))}"
+                    f"**Total Votes Cast:** {await self.db_helper.count_votes(voting['$id'])}"
                     f"{role_status}\n\n"
                     f"Congratulations to the new Chancellor! 👑"
                 ),
@@ -883,10 +1039,11 @@ class Elections(commands.Cog):
                 details={'voting_id': voting['$id'], 'winner': winner['name']}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"Chancellor election closed! **{winner['name']}** is the new Chancellor."
-                    + (f"\n✅ Role updated!" if chancellor_role else f"\n⚠️ No chancellor role set.")
+                    + (f"\n{role_report_status(role_report)}" if role_report else f"\n⚠️ No chancellor role set.")
                 ),
                 ephemeral=True
             )
@@ -896,4 +1053,9 @@ class Elections(commands.Cog):
 
 
 async def setup(bot: commands.Bot) -> None:
+    bot.add_dynamic_items(*DYNAMIC_ITEMS)
     await bot.add_cog(Elections(bot))
+
+
+async def teardown(bot: commands.Bot) -> None:
+    bot.remove_dynamic_items(*DYNAMIC_ITEMS)
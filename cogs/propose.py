@@ -5,93 +5,173 @@ Allows councillors to create proposals for voting
 import discord
 from discord import app_commands
 from discord.ext import commands
+from appwrite.exception import AppwriteException
 
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
 from utils.permissions import check_councillor
 from utils.errors import handle_interaction_error
+from utils.interactions import deferred, respond
 from utils.formatting import create_success_message, create_embed, format_timestamp, create_error_message
-from utils.helpers import calculate_voting_end_date
+from utils.helpers import calculate_voting_end_date, is_voting_open
 from utils.enums import VotingType, VotingStatus, VOTING_TYPE_CONFIG
 
 
-class VotingView(discord.ui.View):
-    """View with voting buttons"""
+class ProposalVoteButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'proposal:(?P<voting_id>[\w.-]+):(?P<stance>for|against)'
+):
+    """Vote button of a proposal; the voting ID and stance are encoded in the custom_id"""
 
-    def __init__(self, bot: commands.Bot, db_helper: DatabaseHelper):
-        super().__init__(timeout=None)
-        self.bot = bot
-        self.db_helper = db_helper
+    def __init__(self, voting_id: str, stance: bool):
+        if stance:
+            button = discord.ui.Button(
+                label="Vote For",
+                style=discord.ButtonStyle.green,
+                emoji="✅",
+                custom_id=f"proposal:{voting_id}:for"
+            )
+        else:
+            button = discord.ui.Button(
+                label="Vote Against",
+                style=discord.ButtonStyle.red,
+                emoji="❌",
+                custom_id=f"proposal:{voting_id}:against"
+            )
+        super().__init__(button)
+        self.voting_id = voting_id
+        self.stance = stance
 
-    @discord.ui.button(label="Vote For", style=discord.ButtonStyle.green, emoji="✅", custom_id="vote_for")
-    async def vote_for(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Vote in favor of the proposal"""
-        await self.cast_vote(interaction, True)
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['voting_id'], match['stance'] == 'for')
 
-    @discord.ui.button(label="Vote Against", style=discord.ButtonStyle.red, emoji="❌", custom_id="vote_against")
-    async def vote_against(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Vote against the proposal"""
-        await self.cast_vote(interaction, False)
+    async def callback(self, interaction: discord.Interaction):
+        await cast_proposal_vote(interaction, self.voting_id, self.stance)
 
-    async def cast_vote(self, interaction: discord.Interaction, stance: bool):
-        """Handle vote casting"""
-        try:
-            from utils.permissions import is_eligible
-            from utils.enums import RoleType, LogType
 
-            # Check if user is a councillor
-            if not await is_eligible(interaction.user, interaction.guild, RoleType.COUNCILLOR, self.db_helper):
-                await interaction.response.send_message(
-                    create_error_message("Only Councillors can vote on proposals."),
-                    ephemeral=True
-                )
-                return
+class LegacyProposalVoteButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'vote_(?P<stance>for|against)'
+):
+    """Vote button of proposals posted before the voting ID was part of the custom_id"""
 
-            # Get voting ID from message
-            voting_id = str(interaction.message.id)
-
-            # Get councillor data
-            councillor = await self.db_helper.get_councillor(interaction.user.id, interaction.guild.id)
-            if not councillor:
-                await interaction.response.send_message(
-                    create_error_message("Your councillor record could not be found."),
-                    ephemeral=True
-                )
-                return
+    def __init__(self, stance: bool):
+        super().__init__(
+            discord.ui.Button(
+                style=discord.ButtonStyle.green if stance else discord.ButtonStyle.red,
+                custom_id="vote_for" if stance else "vote_against"
+            )
+        )
+        self.stance = stance
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['stance'] == 'for')
+
+    async def callback(self, interaction: discord.Interaction):
+        # Proposal votings are stored under their message ID
+        await cast_proposal_vote(interaction, str(interaction.message.id), self.stance)
+
+
+@deferred()
+async def cast_proposal_vote(interaction: discord.Interaction, voting_id: str, stance: bool):
+    """Handle vote casting"""
+    try:
+        from utils.permissions import is_eligible
+        from utils.enums import RoleType, LogType
+
+        db_helper: DatabaseHelper = interaction.client.db_helper
+        ctx = InteractionContext.from_interaction(interaction, db_helper)
+
+        # Buttons outlive the voting, so check it is still open
+        voting = await db_helper.get_guild_voting(interaction.guild.id, voting_id)
+        if not is_voting_open(voting):
+            await respond(
+                interaction,
+                create_error_message("This voting is closed."),
+                ephemeral=True
+            )
+            return
 
-            # Check if already voted
-            has_voted = await self.db_helper.has_voted(voting_id, councillor_id=councillor['$id'])
-            if has_voted:
-                await interaction.response.send_message(
-                    create_error_message("You have already voted on this proposal."),
-                    ephemeral=True
-                )
-                return
+        # Check if user is a councillor
+        if not await is_eligible(ctx, RoleType.COUNCILLOR):
+            await respond(
+                interaction,
+                create_error_message("Only Councillors can vote on proposals."),
+                ephemeral=True
+            )
+            return
+
+        # Get councillor data
+        councillor = await ctx.get_councillor()
+        if not councillor:
+            await respond(
+                interaction,
+                create_error_message("Your councillor record could not be found."),
+                ephemeral=True
+            )
+            return
+
+        # Check if already voted
+        has_voted = await db_helper.has_voted(voting_id, councillor_id=councillor['$id'])
+        if has_voted:
+            await respond(
+                interaction,
+                create_error_message("You have already voted on this proposal."),
+                ephemeral=True
+            )
+            return
 
-            # Cast vote
-            await self.db_helper.cast_vote(
+        # Cast vote; the unique (voting_id, discord_id) index rejects a second click that raced the check above
+        try:
+            await db_helper.cast_vote(
                 voting_id=voting_id,
                 stance=stance,
                 councillor_id=councillor['$id'],
                 discord_id=interaction.user.id
             )
-
-            # Log the vote
-            await self.db_helper.log(
-                guild_id=interaction.guild.id,
-                log_type=LogType.VOTE,
-                action="cast_vote",
-                discord_id=interaction.user.id,
-                details={'voting_id': voting_id, 'stance': stance}
-            )
-
-            vote_text = "✅ **For**" if stance else "❌ **Against**"
-            await interaction.response.send_message(
-                create_success_message(f"Your vote ({vote_text}) has been recorded!"),
+        except AppwriteException as e:
+            if e.code != 409:
+                raise
+            await respond(
+                interaction,
+                create_error_message("You have already voted on this proposal."),
                 ephemeral=True
             )
+            return
 
-        except Exception as e:
-            await handle_interaction_error(interaction, e)
+        # Log the vote
+        await db_helper.log(
+            guild_id=interaction.guild.id,
+            log_type=LogType.VOTE,
+            action="cast_vote",
+            discord_id=interaction.user.id,
+            details={'voting_id': voting_id, 'stance': stance}
+        )
+
+        vote_text = "✅ **For**" if stance else "❌ **Against**"
+        await respond(
+            interaction,
+            create_success_message(f"Your vote ({vote_text}) has been recorded!"),
+            ephemeral=True
+        )
+
+    except Exception as e:
+        await handle_interaction_error(interaction, e)
+
+
+class VotingView(discord.ui.View):
+    """View with voting buttons"""
+
+    def __init__(self, voting_id: str):
+        super().__init__(timeout=None)
+        self.add_item(ProposalVoteButton(voting_id, True))
+        self.add_item(ProposalVoteButton(voting_id, False))
+
+
+# Proposal buttons are routed by their custom_id, so no per-message views are kept
+DYNAMIC_ITEMS = (ProposalVoteButton, LegacyProposalVoteButton)
 
 
 class Propose(commands.Cog):
@@ -115,6 +195,7 @@ class Propose(commands.Cog):
         app_commands.Choice(name="🛑 Decree", value=VotingType.DECREE.value),
         app_commands.Choice(name="🗳️ Other", value=VotingType.OTHER.value),
     ])
+    @deferred()
     async def propose(
         self,
         interaction: discord.Interaction,
@@ -124,11 +205,13 @@ class Propose(commands.Cog):
     ):
         """Create a new proposal for voting"""
         try:
-            await check_councillor(interaction.user, interaction.guild, self.db_helper)
+            ctx = InteractionContext.from_interaction(interaction, self.db_helper)
+            await check_councillor(ctx)
 
-            guild_data = await self.db_helper.get_guild(interaction.guild.id)
+            guild_data = await ctx.get_guild_data()
             if not guild_data:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("This server is not set up yet."),
                     ephemeral=True
                 )
@@ -136,7 +219,8 @@ class Propose(commands.Cog):
 
             # Check if voting channel is configured
             if not guild_data.get('voting_channel_id'):
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("No voting channel configured. Ask an admin to set one with `/set_channel`."),
                     ephemeral=True
                 )
@@ -144,16 +228,18 @@ class Propose(commands.Cog):
 
             voting_channel = interaction.guild.get_channel(int(guild_data['voting_channel_id']))
             if not voting_channel:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("Voting channel not found."),
                     ephemeral=True
                 )
                 return
 
             # Get councillor data
-            councillor = await self.db_helper.get_councillor(interaction.user.id, interaction.guild.id)
+            councillor = await ctx.get_councillor()
             if not councillor:
-                await interaction.response.send_message(
+                await respond(
+                    interaction,
                     create_error_message("Your councillor record could not be found."),
                     ephemeral=True
                 )
@@ -198,15 +284,13 @@ class Propose(commands.Cog):
 
             embed.set_footer(text=f"Vote using the buttons below • ID: pending")
 
-            # Send proposal to voting channel
-            view = VotingView(self.bot, self.db_helper)
-
             # Mention councillors if role is configured
             content = None
             if guild_data.get('councillor_role_id'):
                 content = f"<@&{guild_data['councillor_role_id']}>"
 
-            message = await voting_channel.send(content=content, embed=embed, view=view)
+            # Send proposal to voting channel; the vote buttons are added once the voting exists
+            message = await voting_channel.send(content=content, embed=embed)
 
             # Create voting record with message ID as document ID
             voting = await self.db_helper.create_voting(
@@ -221,9 +305,9 @@ class Propose(commands.Cog):
                 required_percentage=vtype_config['required_percentage']
             )
 
-            # Update embed with voting ID
+            # Update embed with voting ID and add the vote buttons
             embed.set_footer(text=f"Vote using the buttons below • ID: {voting['$id']}")
-            await message.edit(embed=embed)
+            await message.edit(embed=embed, view=VotingView(voting['$id']))
 
             # Log the action
             from utils.enums import LogType
@@ -235,7 +319,8 @@ class Propose(commands.Cog):
                 details={'voting_id': voting['$id'], 'type': voting_type.value}
             )
 
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 create_success_message(
                     f"Your proposal has been posted in {voting_channel.mention}!\n"
                     f"Voting ends {format_timestamp(voting_end, 'R')}"
@@ -248,4 +333,9 @@ class Propose(commands.Cog):
 
 
 async def setup(bot: commands.Bot) -> None:
+    bot.add_dynamic_items(*DYNAMIC_ITEMS)
     await bot.add_cog(Propose(bot))
+
+
+async def teardown(bot: commands.Bot) -> None:
+    bot.remove_dynamic_items(*DYNAMIC_ITEMS)
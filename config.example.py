@@ -4,6 +4,60 @@ APPWRITE_PROJECT = 'your-project-id'
 APPWRITE_KEY = 'your-api-key'
 APPWRITE_DB_NAME = 'councillor'
 
+# Maximum number of Appwrite requests allowed in flight at once
+APPWRITE_MAX_CONCURRENCY = 8
+
+# Keep-alive connection pool for Appwrite HTTP requests
+APPWRITE_POOLED_HTTP = True
+APPWRITE_POOL_SIZE = 8  # defaults to APPWRITE_MAX_CONCURRENCY
+APPWRITE_POOL_IDLE_TIMEOUT = 60.0  # seconds before idle connections are dropped
+
+# In-memory cache for guild, council, ministry and voting lookups
+DB_CACHE_MAX_ENTRIES = 1024
+DB_CACHE_TTL = 60.0  # seconds
+
+# Councillor records are indexed in memory per server and reloaded this often
+# to pick up changes made outside the bot
+COUNCILLOR_DIRECTORY_TTL = 300.0  # seconds
+
+# Documents fetched per request when paging through list queries
+DB_PAGE_SIZE = 100
+
+# Seconds between batched election vote counter writes
+VOTE_FLUSH_INTERVAL = 0.25
+
+# Optional local ballot journal: election votes are acknowledged once written here
+# and uploaded to Appwrite in batches. Set to a file path (e.g. 'ballots.db') to enable.
+BALLOT_JOURNAL_PATH = None
+BALLOT_JOURNAL_BATCH_SIZE = 50
+BALLOT_JOURNAL_FLUSH_INTERVAL = 1.0  # seconds
+# Ballots rejected by Appwrite (4xx) this many times are moved to the dead_ballots table
+BALLOT_JOURNAL_MAX_ATTEMPTS = 10
+
+# Activity logs are queued and written to Appwrite in batches in the background.
+# When the queue is full the oldest entry is dropped (or the newest, if DROP_OLDEST is False).
+LOG_QUEUE_MAX_SIZE = 1000
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 2.0  # seconds
+LOG_QUEUE_DROP_OLDEST = True
+
+# Proposal votings are processed as soon as they end (elections are closed with /close_election); open votings are also reloaded
+# from Appwrite this often to pick up changes made outside the bot
+VOTING_RESYNC_INTERVAL = 3600.0  # seconds
+# A voting whose processing fails is retried after this delay, doubling per failure (up to the resync interval)
+VOTING_RETRY_DELAY = 30.0  # seconds
+# Ended votings of different servers are processed in parallel by this many workers
+VOTING_WORKERS = 4
+
+# File written by /db_stats dump:True with the full database call statistics
+DB_STATS_DUMP_PATH = 'db_stats.json'
+
+# Hash of the last synced slash command tree; the sync on startup is skipped while it matches
+COMMAND_SYNC_STATE_PATH = '.command_tree_hash'
+
+# Maximum concurrent role updates when syncing council roles after an election
+ROLE_SYNC_CONCURRENCY = 5
+
 # Discord Configuration
 BOT_TOKEN = 'your-discord-bot-token'
 
@@ -8,26 +8,28 @@ import asyncio
 import platform
 from colorama import Fore
 from datetime import datetime, timezone
+from typing import Optional
 
 import config
 from utils.database import DatabaseHelper
-from utils.helpers import datetime_now, seconds_until
+from utils.helpers import datetime_now
 from utils.enums import VotingStatus, VotingType, VOTING_TYPE_CONFIG
 from utils.formatting import format_voting_result, format_timestamp, create_embed
 from utils.errors import handle_command_error
-from appwrite.client import Client as AppwriteClient
+from utils.appwrite_client import create_client
+from utils.tally import VoteTallies
+from utils.roster import RosterIndex
+from utils.journal import BallotJournal
+from utils.scheduler import VotingScheduler
+from utils.command_sync import sync_command_tree
 from appwrite.services.databases import Databases
-from appwrite.query import Query
 
 
 # ============================================
 # Appwrite Setup
 # ============================================
 
-appwrite_client = AppwriteClient()
-appwrite_client.set_endpoint(config.APPWRITE_ENDPOINT)
-appwrite_client.set_project(config.APPWRITE_PROJECT)
-appwrite_client.set_key(config.APPWRITE_KEY)
+appwrite_client = create_client()
 
 databases = Databases(appwrite_client)
 db_helper = DatabaseHelper(databases)
@@ -61,85 +63,42 @@ def log(message: str, level: str = "INFO"):
 # Background Tasks
 # ============================================
 
-@tasks.loop(hours=24)
-async def update_votings():
-    """Check and update voting statuses daily"""
-    if not config.DEBUG_MODE:
-        wait = seconds_until(0, 5)  # Run at 00:05 UTC
-        log(f"Next voting update in {wait:.0f} seconds", "INFO")
-        await asyncio.sleep(wait)
-
-    log("Running voting update task...", "INFO")
-    current_datetime = datetime_now()
-
-    try:
-        # Get all votings that have ended
-        if config.DEBUG_MODE:
-            all_votings = databases.list_documents(
-                database_id=config.APPWRITE_DB_NAME,
-                collection_id='votings',
-                queries=[
-                    Query.equal('status', VotingStatus.VOTING.value),
-                ]
-            )
-        else:
-            all_votings = databases.list_documents(
-                database_id=config.APPWRITE_DB_NAME,
-                collection_id='votings',
-                queries=[
-                    Query.equal('status', VotingStatus.VOTING.value),
-                    Query.less_than_equal("voting_end", current_datetime.isoformat()),
-                ]
-            )
-
-        votings = all_votings["documents"]
-        log(f"Found {len(votings)} votings to process", "INFO")
-
-        for voting in votings:
-            await process_voting_result(voting)
-
-        log("Voting update task completed", "SUCCESS")
-    except Exception as e:
-        log(f"Error in voting update task: {e}", "ERROR")
-
-
 async def process_voting_result(voting: dict):
-    """Process and announce the result of a voting"""
+    """
+    Process and announce the result of a proposal voting
+
+    Elections are never processed here: /close_election seats the winners.
+    Errors are raised so the scheduler retries the voting.
+    """
     try:
         # Get the guild
         council_id = voting["council_id"]
         guild_id = council_id.replace("_c", "")
         guild = client.get_guild(int(guild_id))
 
+        # The scheduler starts once the guild cache is ready, so a missing guild means the bot
+        # left it. The result is still recorded (unannounced) so the voting isn't fired again.
+        guild_data = await db_helper.get_guild(guild_id) if guild else None
         if not guild:
-            log(f"Guild not found for voting {voting['$id']}", "WARNING")
-            return
-
-        guild_data = await db_helper.get_guild(guild_id)
-        if not guild_data:
-            log(f"Guild data not found for {guild_id}", "WARNING")
-            return
+            log(f"Guild not found for voting {voting['$id']}; recording the result without announcing it", "WARNING")
+        elif not guild_data:
+            log(f"Guild data not found for {guild_id}; recording the result without announcing it", "WARNING")
 
-        voting_type = VotingType(voting["type"])
-
-        # Handle different voting types
-        if voting_type in [VotingType.ELECTION, VotingType.CHANCELLOR_ELECTION]:
-            await process_election_result(voting, guild, guild_data)
-        else:
-            await process_proposal_result(voting, guild, guild_data)
+        await process_proposal_result(voting, guild, guild_data)
 
     except Exception as e:
         log(f"Error processing voting {voting.get('$id')}: {e}", "ERROR")
+        raise
 
 
-async def process_proposal_result(voting: dict, guild: discord.Guild, guild_data: dict):
-    """Process the result of a proposal voting"""
+async def process_proposal_result(voting: dict, guild: Optional[discord.Guild], guild_data: Optional[dict]):
+    """Process the result of a proposal voting, announcing it if the guild is available"""
     try:
-        # Get all votes
-        votes = await db_helper.get_votes_for_voting(voting['$id'])
-
-        total_votes = len(votes)
-        yes_votes = sum(1 for v in votes if v.get('stance', False))
+        # Count votes server-side
+        total_votes, yes_votes = await asyncio.gather(
+            db_helper.count_votes(voting['$id']),
+            db_helper.count_votes(voting['$id'], stance=True)
+        )
         no_votes = total_votes - yes_votes
 
         required_percentage = voting.get('required_percentage', 0.5)
@@ -167,7 +126,8 @@ async def process_proposal_result(voting: dict, guild: discord.Guild, guild_data
             embed.set_footer(text=f"Proposed by councillor {voting['proposer_id']}")
 
         # Send result to voting channel
-        if guild_data.get('voting_channel_id'):
+        announced = bool(guild and guild_data)
+        if announced and guild_data.get('voting_channel_id'):
             channel = guild.get_channel(int(guild_data['voting_channel_id']))
             if channel:
                 await channel.send(embed=embed)
@@ -177,7 +137,7 @@ async def process_proposal_result(voting: dict, guild: discord.Guild, guild_data
             voting['$id'],
             {
                 'status': VotingStatus.PASSED.value if passed else VotingStatus.FAILED.value,
-                'result_announced': True
+                'result_announced': announced
             }
         )
 
@@ -185,64 +145,7 @@ async def process_proposal_result(voting: dict, guild: discord.Guild, guild_data
 
     except Exception as e:
         log(f"Error processing proposal result: {e}", "ERROR")
-
-
-async def process_election_result(voting: dict, guild: discord.Guild, guild_data: dict):
-    """Process the result of an election"""
-    try:
-        # Get all candidates and their vote counts
-        candidates = await db_helper.get_candidates(voting['$id'])
-
-        if not candidates:
-            log(f"No candidates found for election {voting['$id']}", "WARNING")
-            return
-
-        # Sort by vote count
-        candidates.sort(key=lambda x: x.get('vote_count', 0), reverse=True)
-
-        voting_type = VotingType(voting["type"])
-
-        # Create result embed
-        embed = create_embed(
-            title="🗳️ Election Results",
-            description=f"**{voting['title']}**",
-            color=0x00B0F4
-        )
-
-        # Add top candidates
-        max_display = 10
-        for i, candidate in enumerate(candidates[:max_display], 1):
-            vote_count = candidate.get('vote_count', 0)
-            embed.add_field(
-                name=f"{i}. {candidate['name']}",
-                value=f"Votes: {vote_count}",
-                inline=False
-            )
-
-        # Send result
-        if guild_data.get('announcement_channel_id'):
-            channel = guild.get_channel(int(guild_data['announcement_channel_id']))
-        elif guild_data.get('voting_channel_id'):
-            channel = guild.get_channel(int(guild_data['voting_channel_id']))
-        else:
-            channel = None
-
-        if channel:
-            await channel.send(embed=embed)
-
-        # Update voting status
-        await db_helper.update_voting(
-            voting['$id'],
-            {
-                'status': VotingStatus.PASSED.value,
-                'result_announced': True
-            }
-        )
-
-        log(f"Processed election {voting['$id']}", "SUCCESS")
-
-    except Exception as e:
-        log(f"Error processing election result: {e}", "ERROR")
+        raise
 
 
 @tasks.loop(seconds=30)
@@ -296,6 +199,25 @@ class CouncillorBot(commands.Bot):
             help_command=None  # We'll create a custom help command
         )
         self.db_helper = db_helper
+        self.tallies = VoteTallies(db_helper, flush_interval=getattr(config, 'VOTE_FLUSH_INTERVAL', 0.25))
+        self.journal = None
+        if getattr(config, 'BALLOT_JOURNAL_PATH', None):
+            self.journal = BallotJournal(
+                config.BALLOT_JOURNAL_PATH,
+                db_helper,
+                batch_size=getattr(config, 'BALLOT_JOURNAL_BATCH_SIZE', 50),
+                flush_interval=getattr(config, 'BALLOT_JOURNAL_FLUSH_INTERVAL', 1.0),
+                max_attempts=getattr(config, 'BALLOT_JOURNAL_MAX_ATTEMPTS', 10)
+            )
+        self.rosters = RosterIndex(db_helper, self.journal)
+        # Processes each voting as soon as its voting_end passes
+        self.scheduler = VotingScheduler(
+            db_helper,
+            process_voting_result,
+            resync_interval=getattr(config, 'VOTING_RESYNC_INTERVAL', 3600.0),
+            retry_delay=getattr(config, 'VOTING_RETRY_DELAY', 30.0),
+            concurrency=getattr(config, 'VOTING_WORKERS', 4)
+        )
         self.cogs_list = [
             "cogs.council",
             "cogs.info",
@@ -307,6 +229,11 @@ class CouncillorBot(commands.Bot):
 
     async def setup_hook(self):
         """Setup hook called when bot is starting"""
+        if self.journal:
+            await self.journal.start()
+            stats = await self.journal.stats()
+            log(f"Ballot journal enabled ({stats['pending']} ballots pending replay, {stats['dead']} dead-lettered)", "INFO")
+
         log("Loading cogs...", "INFO")
         for ext in self.cogs_list:
             try:
@@ -322,11 +249,9 @@ class CouncillorBot(commands.Bot):
         log(f"Discord.py version: {discord.__version__}", "INFO")
         log(f"Python version: {platform.python_version()}", "INFO")
 
-        # Sync slash commands
-        log("Syncing slash commands...", "INFO")
+        # Sync slash commands (skipped when the tree hasn't changed since the last sync)
         try:
-            synced = await self.tree.sync()
-            log(f"Synced {len(synced)} commands", "SUCCESS")
+            await self.sync_commands()
         except Exception as e:
             log(f"Failed to sync commands: {e}", "ERROR")
 
@@ -335,9 +260,28 @@ class CouncillorBot(commands.Bot):
             status_loop.start()
             log("Started status loop", "SUCCESS")
 
-        if not update_votings.is_running():
-            update_votings.start()
-            log("Started voting update task", "SUCCESS")
+        if not self.scheduler.is_running():
+            try:
+                await self.scheduler.start()
+                log(f"Started voting scheduler ({len(self.scheduler)} open votings)", "SUCCESS")
+            except Exception as e:
+                log(f"Failed to start voting scheduler: {e}", "ERROR")
+
+    async def sync_commands(self, force: bool = False) -> int:
+        """
+        Sync slash commands with Discord if the command tree changed
+
+        Returns:
+            Number of synced commands, or 0 if the sync was skipped
+        """
+        state_path = getattr(config, 'COMMAND_SYNC_STATE_PATH', '.command_tree_hash')
+        synced = await sync_command_tree(self.tree, state_path, force=force)
+        if synced is None:
+            log("Slash commands unchanged since last sync, skipping sync", "INFO")
+            return 0
+
+        log(f"Synced {len(synced)} commands", "SUCCESS")
+        return len(synced)
 
     async def on_guild_join(self, guild: discord.Guild):
         """Called when bot joins a guild"""
@@ -372,6 +316,18 @@ class CouncillorBot(commands.Bot):
         """Global error handler for text commands"""
         await handle_command_error(ctx, error)
 
+    async def close(self):
+        """Shut down the bot and release database resources"""
+        await self.scheduler.close()
+        if self.journal:
+            await self.journal.close()
+        await self.tallies.close_all()
+        await super().close()
+        await db_helper.log_queue.close()
+        db_helper.close()
+        if hasattr(appwrite_client, 'close'):
+            appwrite_client.close()
+
 
 # ============================================
 # Run Bot
@@ -4,13 +4,19 @@ Database migration script - creates Appwrite collections
 Run this once to set up your database structure
 """
 
-from appwrite.client import Client
 from appwrite.services.databases import Databases
 from appwrite.permission import Permission
 from appwrite.role import Role
 from appwrite.exception import AppwriteException
+from appwrite.enums.index_type import IndexType
+from appwrite.query import Query
 from colorama import Fore, Style, init
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import glob
 import sys
+import time
 
 try:
     import config
@@ -19,6 +25,8 @@ except ImportError:
     print(f"{Fore.RED}✗ Error: 'config' module not found. Please create a config.py file with APPWRITE_ENDPOINT, APPWRITE_PROJECT, APPWRITE_KEY, and APPWRITE_DB_NAME.{Style.RESET_ALL}")
     sys.exit(1)
 
+from utils.appwrite_client import create_client
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -42,11 +50,11 @@ class Logger:
 
 log = Logger()
 
+class MigrationError(Exception):
+    """A schema change that can't be applied; the schema version is left as is"""
+
 # Initialize Appwrite client
-client = Client()
-client.set_endpoint(config.APPWRITE_ENDPOINT)
-client.set_project(config.APPWRITE_PROJECT)
-client.set_key(config.APPWRITE_KEY)
+client = create_client()
 
 db = Databases(client)
 
@@ -99,234 +107,527 @@ def purge_collections(database_id):
             else:
                 log.warning(f"Error deleting collection {collection_id}: {str(e)}")
 
-def create_collections(database_id):
-    """Create necessary collections"""
-    collections = [
-        {
-            "id": "guilds",
-            "name": "Guilds",
-            "attributes": [
-                {"key": "guild_id", "type": "string", "size": 36, "required": True},
-                {"key": "name", "type": "string", "size": 256, "required": True},
-                {"key": "description", "type": "string", "size": 1024, "required": False},
-                # Defaults cannot be set on required attributes in Appwrite
-                {"key": "enabled", "type": "boolean", "required": False, "default": True},
-                {"key": "logging_enabled", "type": "boolean", "required": False, "default": True},
-                {"key": "voting_channel_id", "type": "string", "size": 36, "required": False},
-                {"key": "announcement_channel_id", "type": "string", "size": 36, "required": False},
-                {"key": "councillor_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "chancellor_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "minister_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "president_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "vice_president_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "judiciary_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "citizen_role_id", "type": "string", "size": 36, "required": False},
-                {"key": "days_requirement", "type": "integer", "required": False, "default": 180},
-                {"key": "max_councillors", "type": "integer", "required": False, "default": 9},
-            ]
-        },
-        {
-            "id": "councils",
-            "name": "Councils",
-            "attributes": [
-                {"key": "council_id", "type": "string", "size": 50, "required": True},
-                {"key": "guild_id", "type": "string", "size": 36, "required": True},
-                {"key": "current_chancellor_id", "type": "string", "size": 36, "required": False},
-                {"key": "election_in_progress", "type": "boolean", "required": False, "default": False},
-            ]
-        },
-        {
-            "id": "councillors",
-            "name": "Councillors",
-            "attributes": [
-                {"key": "discord_id", "type": "string", "size": 36, "required": True},
-                {"key": "name", "type": "string", "size": 256, "required": True},
-                {"key": "council_id", "type": "string", "size": 50, "required": True},
-                {"key": "joined_at", "type": "datetime", "required": True},
-                {"key": "active", "type": "boolean", "required": False, "default": True},
-                {"key": "is_chancellor", "type": "boolean", "required": False, "default": False},
-                {"key": "ministry_ids", "type": "string", "size": 100, "required": False, "array": True},
-            ]
-        },
-        {
-            "id": "ministries",
-            "name": "Ministries",
-            "attributes": [
-                {"key": "name", "type": "string", "size": 256, "required": True},
-                {"key": "description", "type": "string", "size": 1024, "required": False},
-                {"key": "council_id", "type": "string", "size": 50, "required": True},
-                {"key": "minister_discord_id", "type": "string", "size": 36, "required": False},
-                {"key": "role_ids", "type": "string", "size": 100, "required": False, "array": True},
-                {"key": "created_by", "type": "string", "size": 36, "required": False},
-                {"key": "created_at", "type": "datetime", "required": True},
-                {"key": "active", "type": "boolean", "required": False, "default": True},
-            ]
-        },
-        {
-            "id": "votings",
-            "name": "Votings",
-            "attributes": [
-                {"key": "type", "type": "enum", "elements": ['legislation', 'amendment', 'impeachment', 'confidence_vote', 'decree', 'other', 'election', 'chancellor_election'], "required": True},
-                {"key": "status", "type": "enum", "elements": ['pending', 'voting', 'passed', 'failed', 'cancelled'], "required": True},
-                {"key": "title", "type": "string", "size": 512, "required": True},
-                {"key": "description", "type": "string", "size": 4096, "required": False},
-                {"key": "council_id", "type": "string", "size": 50, "required": True},
-                {"key": "proposer_id", "type": "string", "size": 36, "required": False},
-                {"key": "message_id", "type": "string", "size": 36, "required": False},
-                {"key": "voting_start", "type": "datetime", "required": False},
-                {"key": "voting_end", "type": "datetime", "required": True},
-                {"key": "required_percentage", "type": "float", "required": False, "default": 0.5},
-                {"key": "result_announced", "type": "boolean", "required": False, "default": False},
-            ]
-        },
-        {
-            "id": "votes",
-            "name": "Votes",
-            "attributes": [
-                {"key": "voting_id", "type": "string", "size": 36, "required": True},
-                {"key": "councillor_id", "type": "string", "size": 36, "required": False},
-                {"key": "discord_id", "type": "string", "size": 36, "required": True},
-                {"key": "stance", "type": "boolean", "required": True},
-                {"key": "candidate_id", "type": "string", "size": 36, "required": False},
-                {"key": "voted_at", "type": "datetime", "required": True},
-            ]
-        },
-        {
-            "id": "election_candidates",
-            "name": "Election Candidates",
-            "attributes": [
-                {"key": "voting_id", "type": "string", "size": 36, "required": True},
-                {"key": "discord_id", "type": "string", "size": 36, "required": True},
-                {"key": "name", "type": "string", "size": 256, "required": True},
-                {"key": "registered_at", "type": "datetime", "required": True},
-                {"key": "vote_count", "type": "integer", "required": False, "default": 0},
-                {"key": "elected", "type": "boolean", "required": False, "default": False},
-            ]
-        },
-        {
-            "id": "registered_voters",
-            "name": "Registered Voters",
-            "attributes": [
-                {"key": "voting_id", "type": "string", "size": 36, "required": True},
-                {"key": "discord_id", "type": "string", "size": 36, "required": True},
-                {"key": "name", "type": "string", "size": 256, "required": True},
-                {"key": "registered_at", "type": "datetime", "required": True},
-                {"key": "has_voted", "type": "boolean", "required": False, "default": False},
-            ]
-        },
-        {
-            "id": "settings",
-            "name": "Settings",
-            "attributes": [
-                {"key": "key", "type": "string", "size": 256, "required": True},
-                {"key": "value", "type": "string", "size": 4096, "required": True},
-                {"key": "type", "type": "enum", "elements": ['string', 'integer', 'boolean', 'json', 'array'], "required": True},
-                {"key": "description", "type": "string", "size": 512, "required": False},
-                {"key": "guild_id", "type": "string", "size": 36, "required": False},
-                {"key": "editable_by", "type": "enum", "elements": ['admin', 'chancellor', 'president'], "required": False, "default": 'admin'},
-            ]
-        },
-        {
-            "id": "logs",
-            "name": "Logs",
-            "attributes": [
-                {"key": "guild_id", "type": "string", "size": 36, "required": True},
-                {"key": "log_type", "type": "enum", "elements": ['command', 'vote', 'election', 'error', 'admin', 'chancellor_action'], "required": True},
-                {"key": "action", "type": "string", "size": 256, "required": True},
-                {"key": "discord_id", "type": "string", "size": 36, "required": False},
-                {"key": "details", "type": "string", "size": 4096, "required": False},
-                {"key": "timestamp", "type": "datetime", "required": True},
-                {"key": "severity", "type": "enum", "elements": ['debug', 'info', 'warning', 'error', 'critical'], "required": False, "default": 'info'},
-            ]
-        }
-    ]
+# Bump whenever COLLECTIONS changes; migrations only ever add what is missing
+SCHEMA_VERSION = 2
 
-    for collection_data in collections:
-        try:
-            # Check if collection already exists
+# Attribute and index creations started at once per collection
+MIGRATION_CONCURRENCY = 8
+
+# Collection schema. Indexes back the queries the bot runs; `python migrate.py --audit`
+# checks every Query combination in the code against them.
+COLLECTIONS = [
+    {
+        "id": "guilds",
+        "name": "Guilds",
+        "attributes": [
+            {"key": "guild_id", "type": "string", "size": 36, "required": True},
+            {"key": "name", "type": "string", "size": 256, "required": True},
+            {"key": "description", "type": "string", "size": 1024, "required": False},
+            # Defaults cannot be set on required attributes in Appwrite
+            {"key": "enabled", "type": "boolean", "required": False, "default": True},
+            {"key": "logging_enabled", "type": "boolean", "required": False, "default": True},
+            {"key": "voting_channel_id", "type": "string", "size": 36, "required": False},
+            {"key": "announcement_channel_id", "type": "string", "size": 36, "required": False},
+            {"key": "councillor_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "chancellor_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "minister_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "president_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "vice_president_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "judiciary_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "citizen_role_id", "type": "string", "size": 36, "required": False},
+            {"key": "days_requirement", "type": "integer", "required": False, "default": 180},
+            {"key": "max_councillors", "type": "integer", "required": False, "default": 9},
+        ]
+    },
+    {
+        "id": "councils",
+        "name": "Councils",
+        "attributes": [
+            {"key": "council_id", "type": "string", "size": 50, "required": True},
+            {"key": "guild_id", "type": "string", "size": 36, "required": True},
+            {"key": "current_chancellor_id", "type": "string", "size": 36, "required": False},
+            {"key": "election_in_progress", "type": "boolean", "required": False, "default": False},
+        ]
+    },
+    {
+        "id": "councillors",
+        "name": "Councillors",
+        "attributes": [
+            {"key": "discord_id", "type": "string", "size": 36, "required": True},
+            {"key": "name", "type": "string", "size": 256, "required": True},
+            {"key": "council_id", "type": "string", "size": 50, "required": True},
+            {"key": "joined_at", "type": "datetime", "required": True},
+            {"key": "active", "type": "boolean", "required": False, "default": True},
+            {"key": "is_chancellor", "type": "boolean", "required": False, "default": False},
+            {"key": "ministry_ids", "type": "string", "size": 100, "required": False, "array": True},
+        ],
+        "indexes": [
+            {"key": "idx_council_active", "type": "key", "attributes": ["council_id", "active", "discord_id"]},
+        ]
+    },
+    {
+        "id": "ministries",
+        "name": "Ministries",
+        "attributes": [
+            {"key": "name", "type": "string", "size": 256, "required": True},
+            {"key": "description", "type": "string", "size": 1024, "required": False},
+            {"key": "council_id", "type": "string", "size": 50, "required": True},
+            {"key": "minister_discord_id", "type": "string", "size": 36, "required": False},
+            {"key": "role_ids", "type": "string", "size": 100, "required": False, "array": True},
+            {"key": "created_by", "type": "string", "size": 36, "required": False},
+            {"key": "created_at", "type": "datetime", "required": True},
+            {"key": "active", "type": "boolean", "required": False, "default": True},
+        ],
+        "indexes": [
+            {"key": "idx_council_active", "type": "key", "attributes": ["council_id", "active"]},
+        ]
+    },
+    {
+        "id": "votings",
+        "name": "Votings",
+        "attributes": [
+            {"key": "type", "type": "enum", "elements": ['legislation', 'amendment', 'impeachment', 'confidence_vote', 'decree', 'other', 'election', 'chancellor_election'], "required": True},
+            {"key": "status", "type": "enum", "elements": ['pending', 'voting', 'passed', 'failed', 'cancelled'], "required": True},
+            {"key": "title", "type": "string", "size": 512, "required": True},
+            {"key": "description", "type": "string", "size": 4096, "required": False},
+            {"key": "council_id", "type": "string", "size": 50, "required": True},
+            {"key": "proposer_id", "type": "string", "size": 36, "required": False},
+            {"key": "message_id", "type": "string", "size": 36, "required": False},
+            {"key": "voting_start", "type": "datetime", "required": False},
+            {"key": "voting_end", "type": "datetime", "required": True},
+            {"key": "required_percentage", "type": "float", "required": False, "default": 0.5},
+            {"key": "result_announced", "type": "boolean", "required": False, "default": False},
+        ],
+        "indexes": [
+            {"key": "idx_status_end", "type": "key", "attributes": ["status", "voting_end"]},
+            {"key": "idx_council_status_type", "type": "key", "attributes": ["council_id", "status", "type"]},
+        ]
+    },
+    {
+        "id": "votes",
+        "name": "Votes",
+        "attributes": [
+            {"key": "voting_id", "type": "string", "size": 36, "required": True},
+            {"key": "councillor_id", "type": "string", "size": 36, "required": False},
+            {"key": "discord_id", "type": "string", "size": 36, "required": True},
+            {"key": "stance", "type": "boolean", "required": True},
+            {"key": "candidate_id", "type": "string", "size": 36, "required": False},
+            {"key": "voted_at", "type": "datetime", "required": True},
+        ],
+        "indexes": [
+            # One ballot per member per voting
+            {"key": "uniq_voting_member", "type": "unique", "attributes": ["voting_id", "discord_id"]},
+            {"key": "idx_voting_councillor", "type": "key", "attributes": ["voting_id", "councillor_id"]},
+            {"key": "idx_voting_stance", "type": "key", "attributes": ["voting_id", "stance"]},
+        ]
+    },
+    {
+        "id": "election_candidates",
+        "name": "Election Candidates",
+        "attributes": [
+            {"key": "voting_id", "type": "string", "size": 36, "required": True},
+            {"key": "discord_id", "type": "string", "size": 36, "required": True},
+            {"key": "name", "type": "string", "size": 256, "required": True},
+            {"key": "registered_at", "type": "datetime", "required": True},
+            {"key": "vote_count", "type": "integer", "required": False, "default": 0},
+            {"key": "elected", "type": "boolean", "required": False, "default": False},
+        ],
+        "indexes": [
+            {"key": "uniq_voting_member", "type": "unique", "attributes": ["voting_id", "discord_id"]},
+        ]
+    },
+    {
+        "id": "registered_voters",
+        "name": "Registered Voters",
+        "attributes": [
+            {"key": "voting_id", "type": "string", "size": 36, "required": True},
+            {"key": "discord_id", "type": "string", "size": 36, "required": True},
+            {"key": "name", "type": "string", "size": 256, "required": True},
+            {"key": "registered_at", "type": "datetime", "required": True},
+            {"key": "has_voted", "type": "boolean", "required": False, "default": False},
+        ],
+        "indexes": [
+            {"key": "uniq_voting_member", "type": "unique", "attributes": ["voting_id", "discord_id"]},
+        ]
+    },
+    {
+        "id": "settings",
+        "name": "Settings",
+        "attributes": [
+            {"key": "key", "type": "string", "size": 256, "required": True},
+            {"key": "value", "type": "string", "size": 4096, "required": True},
+            {"key": "type", "type": "enum", "elements": ['string', 'integer', 'boolean', 'json', 'array'], "required": True},
+            {"key": "description", "type": "string", "size": 512, "required": False},
+            {"key": "guild_id", "type": "string", "size": 36, "required": False},
+            {"key": "editable_by", "type": "enum", "elements": ['admin', 'chancellor', 'president'], "required": False, "default": 'admin'},
+        ]
+    },
+    {
+        "id": "logs",
+        "name": "Logs",
+        "attributes": [
+            {"key": "guild_id", "type": "string", "size": 36, "required": True},
+            {"key": "log_type", "type": "enum", "elements": ['command', 'vote', 'election', 'error', 'admin', 'chancellor_action'], "required": True},
+            {"key": "action", "type": "string", "size": 256, "required": True},
+            {"key": "discord_id", "type": "string", "size": 36, "required": False},
+            {"key": "details", "type": "string", "size": 4096, "required": False},
+            {"key": "timestamp", "type": "datetime", "required": True},
+            {"key": "severity", "type": "enum", "elements": ['debug', 'info', 'warning', 'error', 'critical'], "required": False, "default": 'info'},
+        ]
+    }
+]
+
+def create_attribute(database_id, collection_id, attr):
+    """Create one declared attribute"""
+    attr_copy = attr.copy()
+    attr_type = attr_copy.pop("type")
+
+    if attr_type == "string":
+        db.create_string_attribute(database_id, collection_id, **attr_copy)
+    elif attr_type == "integer":
+        db.create_integer_attribute(database_id, collection_id, **attr_copy)
+    elif attr_type == "boolean":
+        db.create_boolean_attribute(database_id, collection_id, **attr_copy)
+    elif attr_type == "datetime":
+        db.create_datetime_attribute(database_id, collection_id, **attr_copy)
+    elif attr_type == "float":
+        db.create_float_attribute(database_id, collection_id, **attr_copy)
+    elif attr_type == "enum":
+        db.create_enum_attribute(database_id, collection_id, **attr_copy)
+    else:
+        raise ValueError(f"unknown attribute type {attr_type!r}")
+
+def create_index(database_id, collection_id, index):
+    """Create one declared index"""
+    db.create_index(
+        database_id,
+        collection_id,
+        key=index["key"],
+        type=IndexType(index["type"]),
+        attributes=index["attributes"],
+        orders=index.get("orders")
+    )
+
+def run_concurrently(func, database_id, collection_id, items, label):
+    """
+    Start several attribute or index creations at once
+
+    Returns:
+        (keys that were accepted, keys that failed)
+    """
+    created = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=MIGRATION_CONCURRENCY) as executor:
+        futures = {executor.submit(func, database_id, collection_id, item): item["key"] for item in items}
+        for future in as_completed(futures):
+            key = futures[future]
             try:
-                db.get_collection(database_id=database_id, collection_id=collection_data["id"])
-                log.warning(f"Collection exists: {collection_data['name']}")
-                continue
-            except AppwriteException:
-                pass  # Collection doesn't exist, proceed to create
-
-            # Create collection
-            collection = db.create_collection(
-                database_id=database_id,
-                collection_id=collection_data["id"],
-                name=collection_data["name"],
-                permissions=[
-                    Permission.read(Role.any()),
-                    Permission.write(Role.any()),
-                    Permission.update(Role.any()),
-                    Permission.delete(Role.any())
-                ],
-                document_security=True
+                future.result()
+                created.append(key)
+                log.success(f"  Created {label}: {key}")
+            except (AppwriteException, ValueError) as e:
+                if "already exists" in str(e).lower():
+                    log.warning(f"  {label.capitalize()} exists: {key}")
+                else:
+                    log.error(f"  Error creating {label} {key}: {str(e)}")
+                    failed.append(key)
+    return created, failed
+
+def wait_until_available(list_func, field, database_id, collection_id, keys, label, timeout=120.0):
+    """
+    Poll until the given attributes or indexes have finished processing
+
+    Returns:
+        The keys that failed or were still processing at the timeout
+    """
+    deadline = time.monotonic() + timeout
+    keys = set(keys)
+    failed = []
+    while keys:
+        items = list_func(database_id=database_id, collection_id=collection_id)[field]
+        statuses = {item["key"]: item.get("status") for item in items if item["key"] in keys}
+
+        for key, status in statuses.items():
+            if status in ("failed", "stuck"):
+                log.error(f"  {label.capitalize()} {key} is {status}")
+                failed.append(key)
+        keys = {key for key in keys if statuses.get(key) not in ("available", "failed", "stuck")}
+        if not keys:
+            break
+        if time.monotonic() >= deadline:
+            log.error(f"  {label.capitalize()}s still processing after {timeout:.0f}s: {', '.join(sorted(keys))}")
+            return failed + sorted(keys)
+        time.sleep(0.5)
+    return failed
+
+def live_attribute_type(attr):
+    """An Appwrite attribute's type, named as in COLLECTIONS"""
+    if attr.get("format") == "enum":
+        return "enum"
+    return {"double": "float"}.get(attr.get("type"), attr.get("type"))
+
+def diff_collection(database_id, collection_data):
+    """
+    Compare a declared collection with the live one
+
+    Returns:
+        (collection exists, missing attributes, missing indexes)
+    """
+    try:
+        db.get_collection(database_id=database_id, collection_id=collection_data["id"])
+    except AppwriteException:
+        return False, list(collection_data["attributes"]), list(collection_data.get("indexes", []))
+
+    live_attributes = {
+        a["key"]: a for a in db.list_attributes(database_id=database_id, collection_id=collection_data["id"])["attributes"]
+    }
+    live_indexes = {
+        i["key"]: i for i in db.list_indexes(database_id=database_id, collection_id=collection_data["id"])["indexes"]
+    }
+
+    # Changed definitions can't be altered in place without rewriting data, so they're only reported
+    for attr in collection_data["attributes"]:
+        live = live_attributes.get(attr["key"])
+        if live and live_attribute_type(live) != attr["type"]:
+            log.warning(f"  Attribute {attr['key']} is {live.get('type')} but declared as {attr['type']} (left as is)")
+    for index in collection_data.get("indexes", []):
+        live = live_indexes.get(index["key"])
+        if live and list(live.get("attributes", [])) != index["attributes"]:
+            log.warning(f"  Index {index['key']} is on ({', '.join(live['attributes'])}), declared on ({', '.join(index['attributes'])}) (left as is)")
+
+    return (
+        True,
+        [a for a in collection_data["attributes"] if a["key"] not in live_attributes],
+        [i for i in collection_data.get("indexes", []) if i["key"] not in live_indexes]
+    )
+
+def find_duplicates(database_id, collection_id, attributes, page_size=1000):
+    """Values of the given attributes shared by more than one document, with their document counts"""
+    counts = Counter()
+    cursor = None
+    while True:
+        queries = [Query.select(["$id", *attributes]), Query.limit(page_size)]
+        if cursor:
+            queries.append(Query.cursor_after(cursor))
+        documents = db.list_documents(database_id=database_id, collection_id=collection_id, queries=queries)["documents"]
+        for document in documents:
+            counts[tuple(document.get(a) for a in attributes)] += 1
+        if len(documents) < page_size:
+            break
+        cursor = documents[-1]["$id"]
+    return {values: count for values, count in counts.items() if count > 1}
+
+def check_unique_indexes(database_id, collection_data, indexes, attributes):
+    """Raise MigrationError if existing documents would break one of the new unique indexes"""
+    new_attributes = {a["key"] for a in attributes}
+    for index in indexes:
+        # Attributes added by this migration hold no values yet, so there's nothing to check
+        if index["type"] != "unique" or new_attributes.intersection(index["attributes"]):
+            continue
+
+        duplicates = find_duplicates(database_id, collection_data["id"], index["attributes"])
+        if not duplicates:
+            continue
+
+        for values, count in list(duplicates.items())[:10]:
+            pairs = ", ".join(f"{key}={value}" for key, value in zip(index["attributes"], values))
+            log.error(f"  {count} documents with {pairs}")
+        if len(duplicates) > 10:
+            log.error(f"  ... and {len(duplicates) - 10} more")
+        raise MigrationError(
+            f"{len(duplicates)} duplicate ({', '.join(index['attributes'])}) value(s) in {collection_data['name']} "
+            f"block unique index {index['key']}; remove the duplicates and run the migration again"
+        )
+
+def migrate_collection(database_id, collection_data, dry_run=False):
+    """
+    Bring one collection up to its declared schema
+
+    Returns:
+        The number of changes
+
+    Raises:
+        MigrationError: if a change could not be applied
+    """
+    collection_id = collection_data["id"]
+    exists, attributes, indexes = diff_collection(database_id, collection_data)
+
+    if exists and not attributes and not indexes:
+        log.info(f"Up to date: {collection_data['name']}")
+        return 0
+
+    log.info(f"{collection_data['name']}: "
+             f"{'' if exists else 'new collection, '}{len(attributes)} attribute(s), {len(indexes)} index(es) to add")
+    for attr in attributes:
+        log.info(f"  + attribute {attr['key']} ({attr['type']})")
+    for index in indexes:
+        log.info(f"  + {index['type']} index {index['key']} ({', '.join(index['attributes'])})")
+    if exists:
+        # Checked before anything is changed, so a blocked index doesn't leave the collection half migrated
+        check_unique_indexes(database_id, collection_data, indexes, attributes)
+    if dry_run:
+        return len(attributes) + len(indexes) + (0 if exists else 1)
+
+    if not exists:
+        db.create_collection(
+            database_id=database_id,
+            collection_id=collection_id,
+            name=collection_data["name"],
+            permissions=[
+                Permission.read(Role.any()),
+                Permission.write(Role.any()),
+                Permission.update(Role.any()),
+                Permission.delete(Role.any())
+            ],
+            document_security=True
+        )
+        log.success(f"Created collection: {collection_data['name']}")
+
+    # Attributes are built in the background by Appwrite, so they're all started at once
+    # and indexes are only created once every attribute is available
+    created, failed = run_concurrently(create_attribute, database_id, collection_id, attributes, "attribute")
+    failed += wait_until_available(db.list_attributes, "attributes", database_id, collection_id, created, "attribute")
+    if failed:
+        raise MigrationError(
+            f"attribute(s) {', '.join(failed)} of {collection_data['name']} could not be created; its indexes were skipped"
+        )
+
+    created_indexes, failed = run_concurrently(create_index, database_id, collection_id, indexes, "index")
+    failed += wait_until_available(db.list_indexes, "indexes", database_id, collection_id, created_indexes, "index")
+    if failed:
+        raise MigrationError(f"index(es) {', '.join(failed)} of {collection_data['name']} could not be created")
+    return len(created) + len(created_indexes) + (0 if exists else 1)
+
+def get_schema_version(database_id):
+    """The schema version recorded by the last migration (0 if none)"""
+    try:
+        document = db.get_document(database_id=database_id, collection_id="settings", document_id="schema_version")
+        return int(document["value"])
+    except (AppwriteException, KeyError, ValueError):
+        return 0
+
+def set_schema_version(database_id, version):
+    """Record the schema version the database was migrated to"""
+    data = {
+        "key": "schema_version",
+        "value": str(version),
+        "type": "integer",
+        "description": "Schema version applied by migrate.py"
+    }
+    try:
+        db.update_document(database_id=database_id, collection_id="settings", document_id="schema_version", data=data)
+    except AppwriteException:
+        db.create_document(database_id=database_id, collection_id="settings", document_id="schema_version", data=data)
+
+def migrate_collections(database_id, dry_run=False):
+    """Apply the missing collections, attributes and indexes; existing data is left untouched"""
+    live_version = get_schema_version(database_id)
+    if live_version > SCHEMA_VERSION:
+        log.error(f"Database is at schema version {live_version}, newer than this code ({SCHEMA_VERSION}). Aborting.")
+        return False
+
+    log.info(f"Schema version: {live_version} → {SCHEMA_VERSION}")
+    changes = 0
+    for collection_data in COLLECTIONS:
+        try:
+            changes += migrate_collection(database_id, collection_data, dry_run=dry_run)
+        except (AppwriteException, MigrationError) as e:
+            log.error(f"Error migrating collection {collection_data['name']}: {str(e)}")
+            log.error(f"Schema version left at {live_version}. Aborting.")
+            return False
+
+    if dry_run:
+        log.info(f"\nDry run: {changes} change(s) would be applied")
+        return True
+
+    if live_version != SCHEMA_VERSION:
+        set_schema_version(database_id, SCHEMA_VERSION)
+    log.success(f"\n{changes} change(s) applied")
+    return True
+
+def audit_queries():
+    """List every Query combination in the bot and flag those no declared index covers"""
+    from utils.query_audit import audit, collect_query_uses
+
+    paths = ["main.py", *sorted(glob.glob("utils/*.py")), *sorted(glob.glob("cogs/*.py"))]
+    results = audit(COLLECTIONS, collect_query_uses(paths))
+
+    for result in results:
+        use = result.use
+        query = f"{use.collection}({', '.join(use.attributes)})"
+        if result.status == "covered":
+            log.success(f"{query} → {result.index['key']}  [{use.location}]")
+        elif result.status == "partial":
+            log.warning(
+                f"{query} → {result.index['key']} covers {', '.join(result.covered)}; "
+                f"not indexed: {', '.join(result.unindexed)}  [{use.location}]"
             )
-            log.success(f"Created collection: {collection_data['name']}")
-
-            # Create attributes
-            for attr in collection_data["attributes"]:
-                key_name = attr.get("key", "<unknown>")
-                try:
-                    attr_copy = attr.copy()
-                    attr_type = attr_copy.pop("type")
-
-                    if attr_type == "string":
-                        db.create_string_attribute(database_id, collection_data["id"], **attr_copy)
-                    elif attr_type == "integer":
-                        db.create_integer_attribute(database_id, collection_data["id"], **attr_copy)
-                    elif attr_type == "boolean":
-                        db.create_boolean_attribute(database_id, collection_data["id"], **attr_copy)
-                    elif attr_type == "datetime":
-                        db.create_datetime_attribute(database_id, collection_data["id"], **attr_copy)
-                    elif attr_type == "float":
-                        db.create_float_attribute(database_id, collection_data["id"], **attr_copy)
-                    elif attr_type == "enum":
-                        db.create_enum_attribute(database_id, collection_data["id"], **attr_copy)
-                    log.success(f"  Created attribute: {key_name}")
-                except AppwriteException as e:
-                    if "already exists" in str(e).lower():
-                        log.warning(f"  Attribute exists: {key_name}")
-                    else:
-                        log.error(f"  Error creating attribute {key_name}: {str(e)}")
-        except AppwriteException as e:
-            log.error(f"Error creating collection {collection_data['name']}: {str(e)}")
+        else:
+            log.error(f"{query} → no index  [{use.location}]")
+
+    uncovered = [r for r in results if r.status != "covered"]
+    log.info(f"\n{len(results)} query combinations, {len(uncovered)} not fully covered by an index")
+    return not uncovered
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create or update the Appwrite database used by the bot")
+    parser.add_argument("--dry-run", action="store_true", help="show the missing collections, attributes and indexes without changing anything")
+    parser.add_argument("--purge", action="store_true", help="DELETE all collections and their data before recreating them")
+    parser.add_argument("--audit", action="store_true", help="check every Query combination in the code against the declared indexes")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.purge and args.dry_run:
+        log.error("--purge and --dry-run can't be combined")
+        sys.exit(2)
+    if args.audit:
+        sys.exit(0 if audit_queries() else 1)
+
     log.info("=" * 60)
     log.info("COUNCILLOR BOT - DATABASE MIGRATION SCRIPT")
     log.info("=" * 60)
-    log.warning("⚠️  WARNING: This will DELETE ALL existing data!")
-    log.warning("⚠️  All collections will be purged and recreated.")
-    log.info("=" * 60)
 
-    confirmation = input("\nType 'YES' to confirm and proceed with migration: ")
+    if args.purge:
+        log.warning("⚠️  WARNING: This will DELETE ALL existing data!")
+        log.warning("⚠️  All collections will be purged and recreated.")
+        log.info("=" * 60)
 
-    if confirmation.strip() != "YES":
-        log.info("Migration cancelled.")
-        sys.exit(0)
+        confirmation = input("\nType 'YES' to confirm and proceed with migration: ")
+
+        if confirmation.strip() != "YES":
+            log.info("Migration cancelled.")
+            sys.exit(0)
 
     log.info("\n" + "=" * 60)
     log.info("Starting database migration...")
     log.info("=" * 60 + "\n")
 
     log.info("Step 1: Creating/finding database...")
-    database_id = create_or_get_database()
+    if args.dry_run:
+        database_id = find_database_by_name(config.APPWRITE_DB_NAME)
+        if not database_id:
+            log.info(f"Database {config.APPWRITE_DB_NAME} doesn't exist yet; every collection would be created.")
+            sys.exit(0)
+    else:
+        database_id = create_or_get_database()
 
     if not database_id:
         log.error("Failed to create or find database. Aborting.")
         sys.exit(1)
 
-    log.info("\nStep 2: Purging existing collections...")
-    purge_collections(database_id)
+    if args.purge:
+        log.info("\nPurging existing collections...")
+        purge_collections(database_id)
 
-    log.info("\nStep 3: Creating new collections...")
-    create_collections(database_id)
+    log.info("\nStep 2: Applying schema changes...")
+    if not migrate_collections(database_id, dry_run=args.dry_run):
+        sys.exit(1)
+
+    if args.dry_run:
+        sys.exit(0)
 
     log.success("\n" + "=" * 60)
     log.success("✅ Migration complete!")
     log.success("=" * 60)
     log.info("\nYour Appwrite database is now ready to use!")
-    log.warning("Note: Indexes and attributes may take a few moments to become fully active.")
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Appwrite client with persistent, pooled HTTP connections
+The stock SDK client opens a new connection (and TLS handshake) for every call
+"""
+import json
+import threading
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from appwrite.client import Client
+from appwrite.exception import AppwriteException
+from appwrite.input_file import InputFile
+from appwrite.encoders.value_class_encoder import ValueClassEncoder
+
+import config
+
+
+class ConnectionStats:
+    """Thread-safe counters for connection reuse"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.idle_resets = 0
+
+    def increment(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(self.requests - self.new_connections, 0),
+                'idle_resets': self.idle_resets
+            }
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTP adapter that counts requests and newly opened connections"""
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.increment('new_connections')
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.increment('new_connections')
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.stats.increment('requests')
+        return super().send(request, *args, **kwargs)
+
+
+class PooledClient(Client):
+    """
+    Appwrite client that keeps a pool of keep-alive connections
+
+    Behaves like appwrite.client.Client, but every request goes through a shared
+    requests.Session. Connections idle for longer than idle_timeout are dropped
+    before the next request so we never reuse a socket the server already closed.
+    """
+
+    def __init__(self, pool_size: int = 10, idle_timeout: float = 60.0):
+        super().__init__()
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.stats = ConnectionStats()
+
+        self._adapter = CountingAdapter(self.stats, pool_connections=1, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+        self._last_used = time.monotonic()
+
+    def _drop_idle_connections(self) -> None:
+        """Close pooled connections if the pool has been idle too long"""
+        now = time.monotonic()
+        if self.idle_timeout and now - self._last_used > self.idle_timeout:
+            self._adapter.poolmanager.clear()
+            self.stats.increment('idle_resets')
+        self._last_used = now
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        self._session.close()
+
+    def call(self, method, path='', headers=None, params=None, response_type='json'):
+        # Mirrors appwrite.client.Client.call (SDK 11.1.0), using the pooled session
+        if headers is None:
+            headers = {}
+
+        if params is None:
+            params = {}
+
+        params = {k: v for k, v in params.items() if v is not None}
+
+        data = {}
+        files = {}
+        stringify = False
+
+        headers = {**self._global_headers, **headers}
+
+        if method != 'get':
+            data = params
+            params = {}
+
+        if headers['content-type'].startswith('application/json'):
+            data = json.dumps(data, cls=ValueClassEncoder)
+
+        if headers['content-type'].startswith('multipart/form-data'):
+            del headers['content-type']
+            stringify = True
+            for key in data.copy():
+                if isinstance(data[key], InputFile):
+                    files[key] = (data[key].filename, data[key].data)
+                    del data[key]
+            data = self.flatten(data, stringify=stringify)
+
+        self._drop_idle_connections()
+
+        response = None
+        try:
+            response = self._session.request(
+                method=method,
+                url=self._endpoint + path,
+                params=self.flatten(params, stringify=stringify),
+                data=data,
+                files=files,
+                headers=headers,
+                verify=(not self._self_signed),
+                allow_redirects=False if response_type == 'location' else True
+            )
+
+            response.raise_for_status()
+
+            warnings = response.headers.get('x-appwrite-warning')
+            if warnings:
+                for warning in warnings.split(';'):
+                    print(f'Warning: {warning}')
+
+            content_type = response.headers['Content-Type']
+
+            if response_type == 'location':
+                return response.headers.get('Location')
+
+            if content_type.startswith('application/json'):
+                return response.json()
+
+            return response._content
+        except Exception as e:
+            if response is not None:
+                content_type = response.headers['Content-Type']
+                if content_type.startswith('application/json'):
+                    raise AppwriteException(response.json()['message'], response.status_code, response.json().get('type'), response.text)
+                else:
+                    raise AppwriteException(response.text, response.status_code, None, response.text)
+            else:
+                raise AppwriteException(e)
+
+
+def create_client() -> Client:
+    """
+    Build an Appwrite client from config
+
+    Uses PooledClient unless APPWRITE_POOLED_HTTP is set to False.
+    Pool size defaults to APPWRITE_MAX_CONCURRENCY so every executor thread can hold a connection.
+    """
+    if getattr(config, 'APPWRITE_POOLED_HTTP', True):
+        client = PooledClient(
+            pool_size=getattr(config, 'APPWRITE_POOL_SIZE', getattr(config, 'APPWRITE_MAX_CONCURRENCY', 8)),
+            idle_timeout=getattr(config, 'APPWRITE_POOL_IDLE_TIMEOUT', 60.0)
+        )
+    else:
+        client = Client()
+
+    client.set_endpoint(config.APPWRITE_ENDPOINT)
+    client.set_project(config.APPWRITE_PROJECT)
+    client.set_key(config.APPWRITE_KEY)
+    return client
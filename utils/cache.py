@@ -0,0 +1,150 @@
+"""
+In-memory document cache for the database layer
+LRU eviction bounded by entry count, plus a per-entry TTL
+"""
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+
+# Returned by DocumentCache.get when a key is missing or expired
+MISS = object()
+
+
+class DocumentCache:
+    """
+    LRU + TTL cache keyed per collection
+
+    Keys are tuples of (collection, scope, *extra), where scope is usually a
+    guild or document ID. Everything under a (collection, scope) pair can be
+    dropped at once, which is how writes invalidate cached list queries.
+    Values are deep-copied on the way in and out so callers can't mutate cached state.
+
+    A read that fills the cache after an await takes version() first and passes
+    it to set(): if the key was written or invalidated in the meantime, the
+    fetched value is stale and is not stored.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Tuple, Tuple[float, Any]] = OrderedDict()
+        self._scopes: Dict[Tuple[str, Hashable], Set[Tuple]] = {}
+        # Bumped on every write or invalidation, per (collection, scope) and per collection
+        self._generations: Dict[Tuple[str, Hashable], int] = {}
+        self._collection_generations: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_fills = 0
+
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value for a key, or MISS"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def peek(self, key: Tuple) -> Any:
+        """
+        Return the cached value for a key, or MISS, without counting a hit or miss
+
+        For cheap internal checks that shouldn't skew the hit rate. The value is
+        not copied and the entry's LRU position is left alone, so don't mutate it.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return MISS
+        return entry[1]
+
+    def version(self, key: Tuple) -> Tuple[int, int]:
+        """Token to pass to set() when filling the key with a value fetched after this call"""
+        return (self._collection_generations.get(key[0], 0), self._generations.get(key[:2], 0))
+
+    def set(self, key: Tuple, value: Any, version: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            version: Result of version() taken before the value was fetched; the value is
+                dropped if the key was written or invalidated since. Without a version the
+                value is a fresh write and supersedes any fill in flight.
+
+        Returns:
+            Whether the value was stored
+        """
+        if version is None:
+            self._bump(key[:2])
+        elif version != self.version(key):
+            self.stale_fills += 1
+            return False
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+        self._scopes.setdefault(key[:2], set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, collection: str, scope: Optional[Hashable] = None) -> None:
+        """Drop every entry for a collection, or only those under one scope"""
+        if scope is not None:
+            scope_keys = [(collection, scope)]
+            self._bump((collection, scope))
+        else:
+            scope_keys = [s for s in self._scopes if s[0] == collection]
+            self._collection_generations[collection] = self._collection_generations.get(collection, 0) + 1
+
+        for scope_key in scope_keys:
+            for key in list(self._scopes.get(scope_key, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+        self._scopes.clear()
+
+    def _bump(self, scope_key: Tuple[str, Hashable]) -> None:
+        self._generations[scope_key] = self._generations.get(scope_key, 0) + 1
+
+    def _remove(self, key: Tuple) -> None:
+        self._entries.pop(key, None)
+        keys = self._scopes.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[key[:2]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'stale_fills': self.stale_fills
+        }
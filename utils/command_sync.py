@@ -0,0 +1,70 @@
+"""
+Slash command sync helpers
+Syncing is only needed when the command tree changes, so the last synced tree is
+remembered as a hash and reconnects skip the API call
+"""
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from discord import app_commands
+
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """
+    Stable hash of the global command tree as Discord sees it
+
+    Covers names, descriptions, parameters, choices and permissions (everything
+    in the sync payload), plus the application ID so a new bot token re-syncs.
+    """
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    data = json.dumps(
+        {'application_id': tree.client.application_id, 'commands': payload},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def load_synced_hash(path: str) -> Optional[str]:
+    """Hash of the last successfully synced tree, if recorded"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def save_synced_hash(path: str, digest: str) -> None:
+    """Record the hash of a successfully synced tree"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(digest)
+    os.replace(tmp_path, path)
+
+
+async def sync_command_tree(
+    tree: app_commands.CommandTree,
+    state_path: str,
+    force: bool = False
+) -> Optional[List[app_commands.AppCommand]]:
+    """
+    Sync the global command tree unless it matches the last synced one
+
+    Returns:
+        The synced commands, or None if the sync was skipped
+    """
+    digest = command_tree_hash(tree)
+    if not force and load_synced_hash(state_path) == digest:
+        return None
+
+    synced = await tree.sync()
+    try:
+        save_synced_hash(state_path, digest)
+    except OSError as e:
+        print(f"Failed to record command tree hash: {e}")
+    return synced
@@ -0,0 +1,84 @@
+"""
+Per-interaction context
+Resolves guild state once per interaction and shares it between permission checks and handlers
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import discord
+
+from utils.database import DatabaseHelper
+from utils.enums import RoleType
+from utils.permission_table import permission_tables
+
+
+class InteractionContext:
+    """
+    Request-scoped view of the guild state for a single interaction
+
+    Guild, council and caller-councillor documents are loaded lazily on first use
+    and memoized, so a handler and the permission checks it runs never fetch the
+    same document twice. Concurrent awaits of the same document share one fetch.
+    """
+
+    EXTRAS_KEY = 'councillor_context'
+
+    def __init__(self, interaction: discord.Interaction, db_helper: DatabaseHelper):
+        self.interaction = interaction
+        self.db_helper = db_helper
+        self.user = interaction.user
+        self.guild = interaction.guild
+        self._loads: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_interaction(cls, interaction: discord.Interaction, db_helper: DatabaseHelper) -> "InteractionContext":
+        """Get the context for an interaction, creating it on first use"""
+        ctx = interaction.extras.get(cls.EXTRAS_KEY)
+        if ctx is None:
+            ctx = cls(interaction, db_helper)
+            interaction.extras[cls.EXTRAS_KEY] = ctx
+        return ctx
+
+    async def _memo(self, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._loads.get(name)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._loads[name] = task
+        return await task
+
+    def forget(self, name: str) -> None:
+        """Drop a memoized document, e.g. after the handler updated it"""
+        self._loads.pop(name, None)
+
+    async def get_guild_data(self) -> Optional[Dict[str, Any]]:
+        """Get the guild document for this interaction"""
+        if not self.guild:
+            return None
+        return await self._memo('guild', lambda: self.db_helper.get_guild(self.guild.id))
+
+    async def get_council(self) -> Optional[Dict[str, Any]]:
+        """Get the council document for this interaction's guild"""
+        if not self.guild:
+            return None
+        return await self._memo('council', lambda: self.db_helper.get_council(self.guild.id))
+
+    async def get_councillor(self) -> Optional[Dict[str, Any]]:
+        """Get the councillor record of the user who triggered the interaction"""
+        if not self.guild:
+            return None
+        return await self._memo(
+            'councillor',
+            lambda: self.db_helper.get_councillor(self.user.id, self.guild.id)
+        )
+
+    async def get_roles(self) -> Set[RoleType]:
+        """Get the council roles the user holds through their Discord roles"""
+        if not self.guild:
+            return set()
+        return await self._memo('roles', self._resolve_roles)
+
+    async def _resolve_roles(self) -> Set[RoleType]:
+        guild_data = await self.get_guild_data()
+        if not guild_data:
+            return set()
+        return permission_tables.get(self.guild.id, guild_data).resolve_roles(self.user)
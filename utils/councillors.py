@@ -0,0 +1,163 @@
+"""
+In-memory councillor directory
+Councillor lookups by Discord ID, document ID or status become dictionary lookups instead of Appwrite queries
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from utils.database import DatabaseHelper
+
+
+def _sort_key(councillor: Dict[str, Any]) -> tuple:
+    return (councillor.get('joined_at') or '', councillor['$id'])
+
+
+class GuildCouncillors:
+    """
+    Every councillor record of one guild, indexed by document ID, Discord ID and status
+
+    Lookups return copies, so callers can't change the indexed records.
+    """
+
+    def __init__(self, guild_id: str):
+        self.guild_id = guild_id
+        self.loaded_at = time.monotonic()
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # A member keeps their old records after leaving the council, so one Discord ID can have several
+        self._by_discord_id: Dict[str, Set[str]] = {}
+        self._active: Set[str] = set()
+        self._chancellors: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def put(self, councillor: Dict[str, Any]) -> None:
+        """Add a record, or replace it with its latest version"""
+        councillor_id = councillor['$id']
+        self.remove(councillor_id)
+
+        self._by_id[councillor_id] = councillor
+        self._by_discord_id.setdefault(str(councillor['discord_id']), set()).add(councillor_id)
+        if councillor.get('active'):
+            self._active.add(councillor_id)
+        if councillor.get('is_chancellor'):
+            self._chancellors.add(councillor_id)
+
+    def remove(self, councillor_id: str) -> None:
+        """Drop a record from every index"""
+        councillor = self._by_id.pop(councillor_id, None)
+        if councillor is None:
+            return
+
+        records = self._by_discord_id.get(str(councillor['discord_id']))
+        if records is not None:
+            records.discard(councillor_id)
+            if not records:
+                del self._by_discord_id[str(councillor['discord_id'])]
+        self._active.discard(councillor_id)
+        self._chancellors.discard(councillor_id)
+
+    def get(self, councillor_id: str) -> Optional[Dict[str, Any]]:
+        """Get a record by its document ID"""
+        councillor = self._by_id.get(councillor_id)
+        return dict(councillor) if councillor else None
+
+    def find(self, discord_id: int | str) -> Optional[Dict[str, Any]]:
+        """Get a member's record: the active one if any, otherwise the most recent"""
+        records = [self._by_id[cid] for cid in self._by_discord_id.get(str(discord_id), ())]
+        if not records:
+            return None
+        return dict(max(records, key=lambda c: (bool(c.get('active')), c.get('joined_at') or '')))
+
+    def active(self) -> List[Dict[str, Any]]:
+        """Records of the sitting council, oldest first"""
+        return sorted((dict(self._by_id[cid]) for cid in self._active), key=_sort_key)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every record, including former councillors, oldest first"""
+        return sorted((dict(c) for c in self._by_id.values()), key=_sort_key)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def chancellor(self) -> Optional[Dict[str, Any]]:
+        """The sitting chancellor's record"""
+        for councillor_id in self._chancellors & self._active:
+            return dict(self._by_id[councillor_id])
+        return None
+
+
+class CouncillorDirectory:
+    """
+    Per-guild councillor directories, loaded once from Appwrite and kept current in memory
+
+    The database helper applies every councillor it creates or updates. A
+    directory is reloaded after the TTL to pick up changes made outside the bot.
+    """
+
+    def __init__(self, db_helper: "DatabaseHelper", ttl: float = 300.0):
+        self.db_helper = db_helper
+        self.ttl = ttl
+        self._guilds: Dict[str, asyncio.Task] = {}
+
+    async def get(self, guild_id: int | str) -> GuildCouncillors:
+        """Get a guild's directory, loading it on first use"""
+        guild_id = str(guild_id)
+        task = self._guilds.get(guild_id)
+        if task is not None and task.done() and not task.cancelled() and not task.exception():
+            if time.monotonic() - task.result().loaded_at > self.ttl:
+                task = None
+
+        if task is None:
+            task = asyncio.ensure_future(self._load(guild_id))
+            self._guilds[guild_id] = task
+
+        try:
+            return await task
+        except Exception:
+            # Don't cache a failed load
+            if self._guilds.get(guild_id) is task:
+                del self._guilds[guild_id]
+            raise
+
+    async def rebuild(self, guild_id: int | str) -> GuildCouncillors:
+        """Reload a guild's directory from Appwrite"""
+        self.evict(guild_id)
+        return await self.get(guild_id)
+
+    def apply(self, councillor: Dict[str, Any]) -> None:
+        """Record a councillor document that was just created or updated"""
+        guild_id = self.db_helper._guild_scope(councillor)
+        task = self._guilds.get(guild_id)
+        if task is None:
+            return
+
+        if task.done() and not task.cancelled() and not task.exception():
+            task.result().put(councillor)
+        else:
+            # A load in flight may have read the old version; load again on next use
+            self.evict(guild_id)
+
+    def evict(self, guild_id: int | str) -> None:
+        """Drop a guild's directory; a load in flight still completes for its waiters"""
+        self._guilds.pop(str(guild_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded directories and records"""
+        loaded = [
+            task.result() for task in self._guilds.values()
+            if task.done() and not task.cancelled() and not task.exception()
+        ]
+        return {
+            'guilds': len(loaded),
+            'councillors': sum(len(guild) for guild in loaded)
+        }
+
+    async def _load(self, guild_id: str) -> GuildCouncillors:
+        directory = GuildCouncillors(guild_id)
+        async for councillor in self.db_helper.iter_councillors(guild_id, active_only=False):
+            directory.put(councillor)
+        return directory
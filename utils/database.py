@@ -2,8 +2,12 @@
 Database helper functions for Appwrite operations
 Provides a clean interface for database operations with error handling
 """
+import asyncio
+import functools
 import json
-from typing import Optional, List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
 from datetime import datetime, timezone
 
 from appwrite.query import Query
@@ -12,38 +16,416 @@ from appwrite.exception import AppwriteException
 from appwrite.id import ID
 
 import config
+from utils.cache import DocumentCache, MISS
+from utils.log_queue import LogQueue
+from utils.councillors import CouncillorDirectory
+from utils.db_metrics import DatabaseMetrics, instrument
 from utils.enums import VotingType, VotingStatus, RoleType, LogType, LogSeverity
 
 
+# Appwrite stops counting list totals here (APP_LIMIT_COUNT); larger results report this value
+COUNT_LIMIT = 5000
+
+
+@instrument
 class DatabaseHelper:
     """Helper class for database operations"""
 
-    def __init__(self, databases: Databases):
+    def __init__(self, databases: Databases, max_concurrency: Optional[int] = None):
         self.db = databases
         self.db_id = config.APPWRITE_DB_NAME
 
+        # The Appwrite SDK is blocking, so every call runs on a bounded thread pool.
+        # The pool size caps how many Appwrite requests can be in flight at once.
+        self.max_concurrency = max_concurrency or getattr(config, 'APPWRITE_MAX_CONCURRENCY', 8)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='appwrite'
+        )
+
+        # Write-through cache for rarely changing documents (guilds, councils, ministries, ...)
+        self.cache = DocumentCache(
+            max_entries=getattr(config, 'DB_CACHE_MAX_ENTRIES', 1024),
+            ttl=getattr(config, 'DB_CACHE_TTL', 60.0)
+        )
+
+        # Page size for cursor-paginated list queries
+        self.page_size = getattr(config, 'DB_PAGE_SIZE', 100)
+
+        # Councillor records per guild, indexed in memory
+        self.councillors = CouncillorDirectory(self, ttl=getattr(config, 'COUNCILLOR_DIRECTORY_TTL', 300.0))
+
+        # Activity logs are written in the background, in batches
+        self.log_queue = LogQueue(
+            self,
+            max_size=getattr(config, 'LOG_QUEUE_MAX_SIZE', 1000),
+            batch_size=getattr(config, 'LOG_BATCH_SIZE', 50),
+            flush_interval=getattr(config, 'LOG_FLUSH_INTERVAL', 2.0),
+            drop_oldest=getattr(config, 'LOG_QUEUE_DROP_OLDEST', True)
+        )
+
+        # Cleared if the server has no bulk document endpoints
+        self._bulk_writes = True
+
+        # Timing of every helper operation and Appwrite request
+        self.metrics = DatabaseMetrics()
+
+        # get_guild_voting requests in flight, so concurrent misses share one
+        self._voting_loads: Dict[Tuple, asyncio.Future] = {}
+
+        # Called with the stored document after a voting is created or updated
+        self._voting_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        """
+        Run a Databases method on the executor without blocking the event loop
+
+        Args:
+            method: Name of the Databases method to call
+            **kwargs: Arguments for the method (database_id is filled in)
+
+        Returns:
+            The Appwrite response
+        """
+        func = functools.partial(getattr(self.db, method), database_id=self.db_id, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        # Timed from submission, so the latency includes waiting for a free executor thread
+        self.metrics.request_started()
+        started = time.perf_counter()
+        error = None
+        try:
+            return await loop.run_in_executor(self._executor, func)
+        except Exception as e:
+            # A cancelled caller isn't a failed request, so cancellation isn't counted as an error
+            error = e
+            raise
+        finally:
+            self.metrics.record_request(method, kwargs.get('collection_id'), time.perf_counter() - started, error)
+
+    async def iter_documents(
+        self,
+        collection_id: str,
+        queries: List[str],
+        page_size: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every document matching the queries, paging with cursor-after
+
+        The next page is requested while the current one is being consumed,
+        so large result sets don't pay for each round trip in sequence.
+
+        Args:
+            collection_id: Collection to list
+            queries: Filter queries (limit and cursor are added here)
+            page_size: Documents per request (defaults to DB_PAGE_SIZE)
+            select: Only return these attributes
+
+        Yields:
+            Documents in collection order
+        """
+        page_size = page_size or self.page_size
+        base_queries = list(queries)
+        if select:
+            base_queries.append(Query.select(list({'$id', *select})))
+
+        def fetch(cursor: Optional[str]) -> asyncio.Future:
+            page_queries = [*base_queries, Query.limit(page_size)]
+            if cursor:
+                page_queries.append(Query.cursor_after(cursor))
+            return asyncio.ensure_future(
+                self._call('list_documents', collection_id=collection_id, queries=page_queries)
+            )
+
+        pending = fetch(None)
+        try:
+            while pending:
+                documents = (await pending)['documents']
+                pending = None
+                if len(documents) == page_size:
+                    pending = fetch(documents[-1]['$id'])
+                for document in documents:
+                    yield document
+        finally:
+            if pending:
+                pending.cancel()
+
+    async def collect_documents(
+        self,
+        collection_id: str,
+        queries: List[str],
+        page_size: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Collect every document matching the queries into a list"""
+        return [doc async for doc in self.iter_documents(collection_id, queries, page_size, select)]
+
+    async def get_many(
+        self,
+        collection_id: str,
+        document_ids: List[str],
+        select: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many documents by ID with as few requests as possible
+
+        Returns:
+            Documents keyed by ID; IDs that don't exist are left out
+        """
+        return await self.find_many(collection_id, '$id', document_ids, select=select)
+
+    async def find_many(
+        self,
+        collection_id: str,
+        attribute: str,
+        values: List[Any],
+        queries: Optional[List[str]] = None,
+        select: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch every document whose attribute equals any of the values
+
+        Values are split into chunks of DB_PAGE_SIZE, each read with one
+        multi-value equal query; the chunks are requested concurrently.
+
+        Args:
+            collection_id: Collection to list
+            attribute: Attribute to match
+            values: Accepted values
+            queries: Extra filter queries applied to every chunk
+            select: Only return these attributes (plus the matched one)
+
+        Returns:
+            Documents keyed by ID
+        """
+        values = list(dict.fromkeys(values))
+        if select:
+            select = [*select, attribute]
+
+        async def fetch(chunk: List[Any]) -> List[Dict[str, Any]]:
+            # An ID chunk can't match more documents than it has IDs, so one page always covers it
+            page_size = len(chunk) + 1 if attribute == '$id' else None
+            return await self.collect_documents(
+                collection_id,
+                [Query.equal(attribute, chunk), *(queries or [])],
+                page_size=page_size,
+                select=select
+            )
+
+        chunks = [values[i:i + self.page_size] for i in range(0, len(values), self.page_size)]
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return {doc['$id']: doc for chunk in results for doc in chunk}
+
+    async def create_many(self, collection_id: str, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many documents with as few requests as possible
+
+        Documents are written in bulk requests of up to DB_PAGE_SIZE. On servers
+        without the bulk endpoint they are created one by one, concurrently
+        (bounded by the executor). A document may carry its own '$id'; the others
+        get a unique ID up front, so a retried batch can't create duplicates.
+        Documents already stored under their ID count as created; documents
+        rejected by a unique index are left out.
+
+        Args:
+            collection_id: Collection to write to
+            documents: Document data
+
+        Returns:
+            The created (or already stored) documents, in input order
+        """
+        documents = [doc if '$id' in doc else {'$id': ID.unique(), **doc} for doc in documents]
+        chunks = [documents[i:i + self.page_size] for i in range(0, len(documents), self.page_size)]
+
+        results = await asyncio.gather(*(self._create_chunk(collection_id, chunk) for chunk in chunks))
+        created = [doc for chunk in results for doc in chunk]
+        self._after_bulk_write(collection_id, created)
+        return created
+
+    async def update_many(
+        self,
+        collection_id: str,
+        document_ids: List[str],
+        data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the same changes to many documents with as few requests as possible
+
+        Args:
+            collection_id: Collection to write to
+            document_ids: Documents to update
+            data: Attributes to set on every document
+
+        Returns:
+            The updated documents
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        chunks = [document_ids[i:i + self.page_size] for i in range(0, len(document_ids), self.page_size)]
+
+        results = await asyncio.gather(*(self._update_chunk(collection_id, chunk, data) for chunk in chunks))
+        updated = [doc for chunk in results for doc in chunk]
+        self._after_bulk_write(collection_id, updated)
+        return updated
+
+    async def _create_chunk(self, collection_id: str, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self._bulk_writes:
+            try:
+                result = await self._call('create_documents', collection_id=collection_id, documents=documents)
+                by_id = {doc['$id']: doc for doc in result['documents']}
+                return [by_id.get(doc['$id'], doc) for doc in documents]
+            except AppwriteException as e:
+                # A bulk create fails as a whole if any document conflicts (e.g. a retried
+                # batch), so fall back to single creates, which sort the conflicts out
+                if e.code != 409 and not self._bulk_unsupported(e):
+                    raise
+
+        async def create_one(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            data = {key: value for key, value in document.items() if key != '$id'}
+            try:
+                return await self._call(
+                    'create_document',
+                    collection_id=collection_id,
+                    document_id=document['$id'],
+                    data=data
+                )
+            except AppwriteException as e:
+                if e.code != 409:
+                    raise
+                return None
+
+        created = await asyncio.gather(*(create_one(doc) for doc in documents))
+
+        # A unique index answers 409 too, so a conflict is only a replay if this exact
+        # document exists; the conflicting IDs are looked up together
+        conflicts = [doc['$id'] for doc, result in zip(documents, created) if result is None]
+        existing = await self.get_many(collection_id, conflicts) if conflicts else {}
+        return [
+            result or existing[doc['$id']]
+            for doc, result in zip(documents, created)
+            if result or doc['$id'] in existing
+        ]
+
+    async def _update_chunk(
+        self,
+        collection_id: str,
+        document_ids: List[str],
+        data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        if self._bulk_writes:
+            try:
+                result = await self._call(
+                    'update_documents',
+                    collection_id=collection_id,
+                    data=data,
+                    queries=[Query.equal('$id', document_ids), Query.limit(len(document_ids))]
+                )
+                return result['documents']
+            except AppwriteException as e:
+                if not self._bulk_unsupported(e):
+                    raise
+
+        return list(await asyncio.gather(*(
+            self._call('update_document', collection_id=collection_id, document_id=document_id, data=data)
+            for document_id in document_ids
+        )))
+
+    def _bulk_unsupported(self, error: AppwriteException) -> bool:
+        """Whether an error means the server has no bulk endpoints (remembered for later calls)"""
+        if error.code in (405, 501) or error.type == 'general_route_not_found':
+            self._bulk_writes = False
+        return not self._bulk_writes
+
+    def _after_bulk_write(self, collection_id: str, documents: List[Dict[str, Any]]) -> None:
+        for scope in {self._guild_scope(doc) for doc in documents}:
+            self.cache.invalidate(collection_id, scope)
+        if collection_id == 'councillors':
+            for councillor in documents:
+                self.councillors.apply(councillor)
+        elif collection_id == 'votings':
+            for voting in documents:
+                self._notify_voting(voting)
+
+    @staticmethod
+    def _guild_scope(document: Dict[str, Any]) -> Optional[str]:
+        """Get the guild ID a council-scoped document belongs to"""
+        council_id = document.get('council_id')
+        return council_id.removesuffix('_c') if council_id else None
+
+    def close(self) -> None:
+        """Shut down the executor, waiting for in-flight calls to finish"""
+        self._executor.shutdown(wait=True)
+
+    def connection_stats(self) -> Optional[Dict[str, int]]:
+        """HTTP connection reuse counters, when the client keeps a connection pool"""
+        stats = getattr(getattr(self.db, 'client', None), 'stats', None)
+        return stats.as_dict() if stats is not None else None
+
+    def add_voting_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback run with every voting document this helper creates or updates"""
+        self._voting_listeners.append(listener)
+
+    def _notify_voting(self, voting: Dict[str, Any]) -> None:
+        for listener in self._voting_listeners:
+            try:
+                listener(voting)
+            except Exception as e:
+                print(f"Voting listener failed for {voting.get('$id')}: {e}")
+
     # ============================================
     # Guild Operations
     # ============================================
 
     async def get_guild(self, guild_id: int | str) -> Optional[Dict[str, Any]]:
         """Get guild data by ID"""
+        key = ('guilds', str(guild_id))
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            return cached
+        version = self.cache.version(key)
+
         try:
-            return self.db.get_document(
-                database_id=self.db_id,
+            guild = await self._call(
+                'get_document',
                 collection_id='guilds',
                 document_id=str(guild_id)
             )
         except AppwriteException:
             return None
 
+        self.cache.set(key, guild, version)
+        return guild
+
+    async def get_guilds(self, guild_ids: List[int | str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get the data of many guilds, fetching the uncached ones in one request"""
+        guilds: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing = []
+        for guild_id in dict.fromkeys(str(guild_id) for guild_id in guild_ids):
+            cached = self.cache.get(('guilds', guild_id))
+            if cached is MISS:
+                missing.append(guild_id)
+            else:
+                guilds[guild_id] = cached
+
+        if missing:
+            versions = {guild_id: self.cache.version(('guilds', guild_id)) for guild_id in missing}
+            try:
+                fetched = await self.get_many('guilds', missing)
+            except AppwriteException:
+                fetched = {}
+            for guild_id in missing:
+                guilds[guild_id] = fetched.get(guild_id)
+                if guild_id in fetched:
+                    self.cache.set(('guilds', guild_id), fetched[guild_id], versions[guild_id])
+        return guilds
+
     async def create_guild(self, guild_id: int | str, name: str, description: str = "") -> Dict[str, Any]:
         """Create a new guild record"""
         council_id = f"{guild_id}_c"
 
         # Create council first
-        council = self.db.create_document(
-            database_id=self.db_id,
+        council = await self._call(
+            'create_document',
             collection_id='councils',
             document_id=council_id,
             data={
@@ -54,8 +436,8 @@ class DatabaseHelper:
         )
 
         # Create guild
-        guild = self.db.create_document(
-            database_id=self.db_id,
+        guild = await self._call(
+            'create_document',
             collection_id='guilds',
             document_id=str(guild_id),
             data={
@@ -69,31 +451,39 @@ class DatabaseHelper:
             }
         )
 
+        self.cache.set(('councils', str(guild_id)), council)
+        self.cache.set(('guilds', str(guild_id)), guild)
         return guild
 
     async def update_guild(self, guild_id: int | str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update guild data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        guild = await self._call(
+            'update_document',
             collection_id='guilds',
             document_id=str(guild_id),
             data=data
         )
+        self.cache.set(('guilds', str(guild_id)), guild)
+        return guild
 
     async def delete_guild(self, guild_id: int | str) -> bool:
         """Delete a guild and its associated data"""
+        self.cache.invalidate('guilds', str(guild_id))
+        self.cache.invalidate('councils', str(guild_id))
+        self.councillors.evict(guild_id)
+
         try:
             # Delete guild
-            self.db.delete_document(
-                database_id=self.db_id,
+            await self._call(
+                'delete_document',
                 collection_id='guilds',
                 document_id=str(guild_id)
             )
 
             # Delete council
             council_id = f"{guild_id}_c"
-            self.db.delete_document(
-                database_id=self.db_id,
+            await self._call(
+                'delete_document',
                 collection_id='councils',
                 document_id=council_id
             )
@@ -108,46 +498,45 @@ class DatabaseHelper:
 
     async def get_council(self, guild_id: int | str) -> Optional[Dict[str, Any]]:
         """Get council data for a guild"""
+        key = ('councils', str(guild_id))
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            return cached
+        version = self.cache.version(key)
+
         try:
             council_id = f"{guild_id}_c"
-            return self.db.get_document(
-                database_id=self.db_id,
+            council = await self._call(
+                'get_document',
                 collection_id='councils',
                 document_id=council_id
             )
         except AppwriteException:
             return None
 
+        self.cache.set(key, council, version)
+        return council
+
     async def update_council(self, guild_id: int | str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update council data"""
         council_id = f"{guild_id}_c"
-        return self.db.update_document(
-            database_id=self.db_id,
+        council = await self._call(
+            'update_document',
             collection_id='councils',
             document_id=council_id,
             data=data
         )
+        self.cache.set(('councils', str(guild_id)), council)
+        return council
 
     # ============================================
     # Councillor Operations
     # ============================================
 
     async def get_councillor(self, discord_id: int | str, guild_id: int | str) -> Optional[Dict[str, Any]]:
-        """Get councillor data"""
+        """Get councillor data (the member's active record, if they have one)"""
         try:
-            council_id = f"{guild_id}_c"
-            result = self.db.list_documents(
-                database_id=self.db_id,
-                collection_id='councillors',
-                queries=[
-                    Query.equal('discord_id', str(discord_id)),
-                    Query.equal('council_id', council_id),
-                    Query.limit(1)
-                ]
-            )
-            if result['total'] > 0:
-                return result['documents'][0]
-            return None
+            return (await self.councillors.get(guild_id)).find(discord_id)
         except AppwriteException:
             return None
 
@@ -158,44 +547,63 @@ class DatabaseHelper:
         guild_id: int | str
     ) -> Dict[str, Any]:
         """Create a new councillor"""
-        council_id = f"{guild_id}_c"
-        return self.db.create_document(
-            database_id=self.db_id,
+        councillor = await self._call(
+            'create_document',
             collection_id='councillors',
             document_id=ID.unique(),
-            data={
-                'discord_id': str(discord_id),
-                'name': name,
-                'council_id': council_id,
-                'joined_at': datetime.now(timezone.utc).isoformat(),
-                'active': True,
-                'is_chancellor': False
-            }
+            data=self._councillor_data(discord_id, name, guild_id)
+        )
+        self.councillors.apply(councillor)
+        return councillor
+
+    async def create_councillors(self, guild_id: int | str, members: List[Tuple[int | str, str]]) -> List[Dict[str, Any]]:
+        """Create councillors for many (discord_id, name) pairs in bulk"""
+        return await self.create_many(
+            'councillors',
+            [self._councillor_data(discord_id, name, guild_id) for discord_id, name in members]
         )
 
+    @staticmethod
+    def _councillor_data(discord_id: int | str, name: str, guild_id: int | str) -> Dict[str, Any]:
+        return {
+            'discord_id': str(discord_id),
+            'name': name,
+            'council_id': f"{guild_id}_c",
+            'joined_at': datetime.now(timezone.utc).isoformat(),
+            'active': True,
+            'is_chancellor': False
+        }
+
     async def list_councillors(self, guild_id: int | str, active_only: bool = True) -> List[Dict[str, Any]]:
         """List all councillors for a guild"""
+        directory = await self.councillors.get(guild_id)
+        return directory.active() if active_only else directory.all()
+
+    def iter_councillors(
+        self,
+        guild_id: int | str,
+        active_only: bool = True,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream councillors for a guild page by page"""
         council_id = f"{guild_id}_c"
         queries = [Query.equal('council_id', council_id)]
 
         if active_only:
             queries.append(Query.equal('active', True))
 
-        result = self.db.list_documents(
-            database_id=self.db_id,
-            collection_id='councillors',
-            queries=queries
-        )
-        return result['documents']
+        return self.iter_documents('councillors', queries, page_size)
 
     async def update_councillor(self, councillor_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update councillor data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        councillor = await self._call(
+            'update_document',
             collection_id='councillors',
             document_id=councillor_id,
             data=data
         )
+        self.councillors.apply(councillor)
+        return councillor
 
     async def deactivate_councillor(self, discord_id: int | str, guild_id: int | str) -> bool:
         """Deactivate a councillor"""
@@ -234,45 +642,63 @@ class DatabaseHelper:
         if minister_discord_id:
             data['minister_discord_id'] = str(minister_discord_id)
 
-        return self.db.create_document(
-            database_id=self.db_id,
+        ministry = await self._call(
+            'create_document',
             collection_id='ministries',
             document_id=ID.unique(),
             data=data
         )
+        self.cache.invalidate('ministries', str(guild_id))
+        return ministry
 
     async def list_ministries(self, guild_id: int | str, active_only: bool = True) -> List[Dict[str, Any]]:
         """List all ministries for a guild"""
+        key = ('ministries', str(guild_id), active_only)
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            return cached
+        version = self.cache.version(key)
+
+        ministries = [m async for m in self.iter_ministries(guild_id, active_only)]
+        self.cache.set(key, ministries, version)
+        return ministries
+
+    def iter_ministries(
+        self,
+        guild_id: int | str,
+        active_only: bool = True,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream ministries for a guild page by page"""
         council_id = f"{guild_id}_c"
         queries = [Query.equal('council_id', council_id)]
 
         if active_only:
             queries.append(Query.equal('active', True))
 
-        result = self.db.list_documents(
-            database_id=self.db_id,
-            collection_id='ministries',
-            queries=queries
-        )
-        return result['documents']
+        return self.iter_documents('ministries', queries, page_size)
 
     async def update_ministry(self, ministry_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update ministry data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        ministry = await self._call(
+            'update_document',
             collection_id='ministries',
             document_id=ministry_id,
             data=data
         )
+        self.cache.invalidate('ministries', self._guild_scope(ministry))
+        return ministry
 
     async def delete_ministry(self, ministry_id: str) -> bool:
         """Delete a ministry"""
         try:
-            self.db.delete_document(
-                database_id=self.db_id,
+            await self._call(
+                'delete_document',
                 collection_id='ministries',
                 document_id=ministry_id
             )
+            # The owning guild isn't known here, so drop all cached ministry lists
+            self.cache.invalidate('ministries')
             return True
         except AppwriteException:
             return False
@@ -317,45 +743,118 @@ class DatabaseHelper:
 
         doc_id = message_id if message_id else ID.unique()
 
-        return self.db.create_document(
-            database_id=self.db_id,
+        voting = await self._call(
+            'create_document',
             collection_id='votings',
             document_id=str(doc_id),
             data=data
         )
+        self.cache.invalidate('votings', str(guild_id))
+        self._notify_voting(voting)
+        return voting
 
     async def get_voting(self, voting_id: str) -> Optional[Dict[str, Any]]:
         """Get voting by ID"""
         try:
-            return self.db.get_document(
-                database_id=self.db_id,
+            return await self._call(
+                'get_document',
                 collection_id='votings',
                 document_id=voting_id
             )
         except AppwriteException:
             return None
 
+    async def get_guild_voting(self, guild_id: int | str, voting_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a voting of a guild, cached until the guild's votings change
+
+        Used by vote buttons to check a voting is still open without a request per click.
+
+        Returns:
+            The voting, or None if it doesn't exist or belongs to another guild
+        """
+        key = ('votings', str(guild_id), 'voting', voting_id)
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            return cached
+
+        # A burst of clicks on a fresh message shares one request
+        task = self._voting_loads.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_guild_voting(key, guild_id, voting_id))
+            self._voting_loads[key] = task
+            task.add_done_callback(lambda _: self._voting_loads.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load_guild_voting(self, key: Tuple, guild_id: int | str, voting_id: str) -> Optional[Dict[str, Any]]:
+        version = self.cache.version(key)
+        voting = await self.get_voting(voting_id)
+        if voting and voting.get('council_id') != f"{guild_id}_c":
+            voting = None
+        self.cache.set(key, voting, version)
+        return voting
+
     async def update_voting(self, voting_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update voting data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        voting = await self._call(
+            'update_document',
             collection_id='votings',
             document_id=voting_id,
             data=data
         )
+        self.cache.invalidate('votings', self._guild_scope(voting))
+        self._notify_voting(voting)
+        return voting
 
-    async def list_active_votings(self, guild_id: int | str) -> List[Dict[str, Any]]:
-        """List all active votings for a guild"""
+    async def find_voting(
+        self,
+        guild_id: int | str,
+        voting_type: VotingType,
+        status: VotingStatus
+    ) -> Optional[Dict[str, Any]]:
+        """Find the first voting of a type and status for a guild"""
         council_id = f"{guild_id}_c"
-        result = self.db.list_documents(
-            database_id=self.db_id,
+        result = await self._call(
+            'list_documents',
             collection_id='votings',
             queries=[
+                Query.equal('council_id', council_id),
+                Query.equal('type', voting_type.value),
+                Query.equal('status', status.value),
+                Query.limit(1)
+            ]
+        )
+        if result['total'] > 0:
+            return result['documents'][0]
+        return None
+
+    async def list_open_votings(self, ending_before: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """List open votings across all guilds, optionally only those ending before a date"""
+        queries = [Query.equal('status', VotingStatus.VOTING.value)]
+
+        if ending_before:
+            queries.append(Query.less_than_equal('voting_end', ending_before.isoformat()))
+
+        return await self.collect_documents('votings', queries)
+
+    async def list_active_votings(self, guild_id: int | str) -> List[Dict[str, Any]]:
+        """List all active votings for a guild"""
+        key = ('votings', str(guild_id), 'active')
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            return cached
+        version = self.cache.version(key)
+
+        council_id = f"{guild_id}_c"
+        votings = await self.collect_documents(
+            'votings',
+            [
                 Query.equal('council_id', council_id),
                 Query.equal('status', VotingStatus.VOTING.value)
             ]
         )
-        return result['documents']
+        self.cache.set(key, votings, version)
+        return votings
 
     # ============================================
     # Vote Operations
@@ -367,13 +866,15 @@ class DatabaseHelper:
         stance: bool,
         councillor_id: Optional[str] = None,
         discord_id: Optional[int | str] = None,
-        candidate_id: Optional[str] = None
+        candidate_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        voted_at: Optional[str] = None
     ) -> Dict[str, Any]:
         """Cast a vote"""
         data = {
             'voting_id': voting_id,
             'stance': stance,
-            'voted_at': datetime.now(timezone.utc).isoformat()
+            'voted_at': voted_at or datetime.now(timezone.utc).isoformat()
         }
 
         if councillor_id:
@@ -383,21 +884,58 @@ class DatabaseHelper:
         if candidate_id:
             data['candidate_id'] = candidate_id
 
-        return self.db.create_document(
-            database_id=self.db_id,
+        return await self._call(
+            'create_document',
             collection_id='votes',
-            document_id=ID.unique(),
+            document_id=document_id or ID.unique(),
             data=data
         )
 
     async def get_votes_for_voting(self, voting_id: str) -> List[Dict[str, Any]]:
         """Get all votes for a voting"""
-        result = self.db.list_documents(
-            database_id=self.db_id,
+        return await self.collect_documents('votes', [Query.equal('voting_id', voting_id)])
+
+    def iter_votes_for_voting(
+        self,
+        voting_id: str,
+        page_size: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream votes for a voting page by page"""
+        return self.iter_documents('votes', [Query.equal('voting_id', voting_id)], page_size, select)
+
+    async def count_votes(self, voting_id: str, stance: Optional[bool] = None) -> int:
+        """
+        Count votes for a voting without downloading them
+
+        Only the total of a filtered query is used, so the cost is one
+        request up to COUNT_LIMIT votes. Appwrite caps totals at that limit,
+        so larger counts are made by paging through the vote IDs instead.
+
+        Args:
+            voting_id: Voting to count
+            stance: Only count votes with this stance (all votes if None)
+
+        Returns:
+            Number of matching votes
+        """
+        queries = [Query.equal('voting_id', voting_id)]
+
+        if stance is not None:
+            queries.append(Query.equal('stance', stance))
+
+        result = await self._call(
+            'list_documents',
             collection_id='votes',
-            queries=[Query.equal('voting_id', voting_id)]
+            queries=[*queries, Query.select(['$id']), Query.limit(1)]
         )
-        return result['documents']
+        if result['total'] < COUNT_LIMIT:
+            return result['total']
+
+        count = 0
+        async for _ in self.iter_documents('votes', queries, select=['$id']):
+            count += 1
+        return count
 
     async def has_voted(
         self,
@@ -415,8 +953,8 @@ class DatabaseHelper:
         else:
             return False
 
-        result = self.db.list_documents(
-            database_id=self.db_id,
+        result = await self._call(
+            'list_documents',
             collection_id='votes',
             queries=queries
         )
@@ -434,20 +972,31 @@ class DatabaseHelper:
         name: str
     ) -> Dict[str, Any]:
         """Register a candidate for an election"""
-        return self.db.create_document(
-            database_id=self.db_id,
+        return await self._call(
+            'create_document',
             collection_id='election_candidates',
             document_id=ID.unique(),
-            data={
-                'voting_id': voting_id,
-                'discord_id': str(discord_id),
-                'name': name,
-                'registered_at': datetime.now(timezone.utc).isoformat(),
-                'vote_count': 0,
-                'elected': False
-            }
+            data=self._candidate_data(voting_id, discord_id, name)
+        )
+
+    async def register_candidates(self, voting_id: str, members: List[Tuple[int | str, str]]) -> List[Dict[str, Any]]:
+        """Register many (discord_id, name) pairs as candidates in bulk"""
+        return await self.create_many(
+            'election_candidates',
+            [self._candidate_data(voting_id, discord_id, name) for discord_id, name in members]
         )
 
+    @staticmethod
+    def _candidate_data(voting_id: str, discord_id: int | str, name: str) -> Dict[str, Any]:
+        return {
+            'voting_id': voting_id,
+            'discord_id': str(discord_id),
+            'name': name,
+            'registered_at': datetime.now(timezone.utc).isoformat(),
+            'vote_count': 0,
+            'elected': False
+        }
+
     async def register_voter(
         self,
         voting_id: str,
@@ -455,42 +1004,56 @@ class DatabaseHelper:
         name: str
     ) -> Dict[str, Any]:
         """Register a voter for an election"""
-        return self.db.create_document(
-            database_id=self.db_id,
+        return await self._call(
+            'create_document',
             collection_id='registered_voters',
             document_id=ID.unique(),
-            data={
-                'voting_id': voting_id,
-                'discord_id': str(discord_id),
-                'name': name,
-                'registered_at': datetime.now(timezone.utc).isoformat(),
-                'has_voted': False
-            }
+            data=self._voter_data(voting_id, discord_id, name)
+        )
+
+    async def register_voters(self, voting_id: str, members: List[Tuple[int | str, str]]) -> List[Dict[str, Any]]:
+        """Register many (discord_id, name) pairs as voters in bulk"""
+        return await self.create_many(
+            'registered_voters',
+            [self._voter_data(voting_id, discord_id, name) for discord_id, name in members]
         )
 
+    @staticmethod
+    def _voter_data(voting_id: str, discord_id: int | str, name: str) -> Dict[str, Any]:
+        return {
+            'voting_id': voting_id,
+            'discord_id': str(discord_id),
+            'name': name,
+            'registered_at': datetime.now(timezone.utc).isoformat(),
+            'has_voted': False
+        }
+
     async def get_candidates(self, voting_id: str) -> List[Dict[str, Any]]:
         """Get all candidates for an election"""
-        result = self.db.list_documents(
-            database_id=self.db_id,
-            collection_id='election_candidates',
-            queries=[Query.equal('voting_id', voting_id)]
-        )
-        return result['documents']
+        return await self.collect_documents('election_candidates', [Query.equal('voting_id', voting_id)])
+
+    def iter_candidates(self, voting_id: str, page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream candidates for an election page by page"""
+        return self.iter_documents('election_candidates', [Query.equal('voting_id', voting_id)], page_size)
 
     async def get_registered_voters(self, voting_id: str) -> List[Dict[str, Any]]:
         """Get all registered voters for an election"""
-        result = self.db.list_documents(
-            database_id=self.db_id,
-            collection_id='registered_voters',
-            queries=[Query.equal('voting_id', voting_id)]
-        )
-        return result['documents']
+        return await self.collect_documents('registered_voters', [Query.equal('voting_id', voting_id)])
+
+    def iter_registered_voters(
+        self,
+        voting_id: str,
+        page_size: Optional[int] = None,
+        select: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream registered voters for an election page by page"""
+        return self.iter_documents('registered_voters', [Query.equal('voting_id', voting_id)], page_size, select)
 
     async def get_candidate(self, candidate_id: str) -> Optional[Dict[str, Any]]:
         """Get a candidate by ID"""
         try:
-            return self.db.get_document(
-                database_id=self.db_id,
+            return await self._call(
+                'get_document',
                 collection_id='election_candidates',
                 document_id=candidate_id
             )
@@ -499,17 +1062,27 @@ class DatabaseHelper:
 
     async def update_candidate(self, candidate_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update candidate data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        return await self._call(
+            'update_document',
             collection_id='election_candidates',
             document_id=candidate_id,
             data=data
         )
 
+    async def increment_candidate_votes(self, candidate_id: str, amount: int = 1) -> Dict[str, Any]:
+        """Atomically add to a candidate's vote count"""
+        return await self._call(
+            'increment_document_attribute',
+            collection_id='election_candidates',
+            document_id=candidate_id,
+            attribute='vote_count',
+            value=amount
+        )
+
     async def update_voter(self, voter_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update voter data"""
-        return self.db.update_document(
-            database_id=self.db_id,
+        return await self._call(
+            'update_document',
             collection_id='registered_voters',
             document_id=voter_id,
             data=data
@@ -527,27 +1100,19 @@ class DatabaseHelper:
         discord_id: Optional[int | str] = None,
         details: Optional[Dict[str, Any]] = None,
         severity: LogSeverity = LogSeverity.INFO
-    ) -> Optional[Dict[str, Any]]:
-        """Create a log entry"""
-        try:
-            data = {
-                'guild_id': str(guild_id),
-                'log_type': log_type.value,
-                'action': action,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'severity': severity.value
-            }
+    ) -> None:
+        """Queue a log entry; it is written in the background by the log queue"""
+        data = {
+            'guild_id': str(guild_id),
+            'log_type': log_type.value,
+            'action': action,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'severity': severity.value
+        }
 
-            if discord_id:
-                data['discord_id'] = str(discord_id)
-            if details:
-                data['details'] = json.dumps(details)
+        if discord_id:
+            data['discord_id'] = str(discord_id)
+        if details:
+            data['details'] = json.dumps(details)
 
-            return self.db.create_document(
-                database_id=self.db_id,
-                collection_id='logs',
-                document_id=ID.unique(),
-                data=data
-            )
-        except AppwriteException:
-            return None
+        self.log_queue.submit(data)
@@ -0,0 +1,215 @@
+"""
+Data-layer call metrics
+Times every DatabaseHelper operation and Appwrite request, and groups them by the command or view that caused them
+"""
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from appwrite.exception import AppwriteException
+
+
+# Command, view callback or background task the current code runs on behalf of.
+# Tasks copy the context they were created in, so Appwrite calls made by helpers
+# and prefetch tasks are attributed to whatever started them.
+current_origin: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('db_origin', default=None)
+# Innermost DatabaseHelper operation running in the current task
+current_operation: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('db_operation', default=None)
+
+# Histogram bucket upper bounds in seconds (the last bucket is unbounded)
+BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def set_origin(origin: str) -> None:
+    """Attribute the rest of the current task's database calls to origin, unless it already has one"""
+    if current_origin.get() is None:
+        current_origin.set(origin)
+
+
+def error_code(error: Exception) -> str:
+    """Label for an exception: the Appwrite error code, or the exception type"""
+    if isinstance(error, AppwriteException):
+        return str(error.code or 'network')
+    return type(error).__name__
+
+
+class LatencyHistogram:
+    """Call count, errors and a fixed-bucket latency histogram"""
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'buckets', 'appwrite_calls')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        # Appwrite requests made directly by a helper operation
+        self.appwrite_calls = 0
+
+    def record(self, elapsed: float, failed: bool = False) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+        if failed:
+            self.errors += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of calls (capped at the slowest call)"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return round(min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max, 6)
+        return round(self.max, 6)
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = {
+            'count': self.count,
+            'errors': self.errors,
+            'total': round(self.total, 6),
+            'mean': round(self.total / self.count, 6) if self.count else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': round(self.max, 6),
+            'buckets': {
+                **{f"le_{bound:g}": count for bound, count in zip(BUCKETS, self.buckets)},
+                'inf': self.buckets[-1]
+            }
+        }
+        if self.appwrite_calls:
+            result['appwrite_calls'] = self.appwrite_calls
+        return result
+
+
+class DatabaseMetrics:
+    """
+    Counters and latency histograms for the data layer
+
+    Appwrite requests are recorded per Databases method, per collection and per
+    origin; DatabaseHelper operations per method name (inclusive of the
+    operations they call). Recording is a few dictionary updates on the event
+    loop, so it stays on in production.
+    """
+
+    def __init__(self):
+        self.inflight = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the statistics (requests in flight are still tracked)"""
+        self.started_at = time.time()
+        self.methods: Dict[str, LatencyHistogram] = {}
+        self.collections: Dict[str, LatencyHistogram] = {}
+        self.origins: Dict[str, LatencyHistogram] = {}
+        self.operations: Dict[str, LatencyHistogram] = {}
+        self.errors: Counter = Counter()
+        self.inflight_high_water = self.inflight
+
+    @staticmethod
+    def _histogram(table: Dict[str, LatencyHistogram], key: str) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = LatencyHistogram()
+        return histogram
+
+    def request_started(self) -> None:
+        self.inflight += 1
+        if self.inflight > self.inflight_high_water:
+            self.inflight_high_water = self.inflight
+
+    def record_request(self, method: str, collection_id: Optional[str], elapsed: float, error: Optional[Exception] = None) -> None:
+        """Record one Appwrite request (call after request_started)"""
+        self.inflight -= 1
+        failed = error is not None
+        if failed:
+            self.errors[error_code(error)] += 1
+
+        self._histogram(self.methods, method).record(elapsed, failed)
+        self._histogram(self.collections, collection_id or '-').record(elapsed, failed)
+        self._histogram(self.origins, current_origin.get() or 'background').record(elapsed, failed)
+        operation = current_operation.get()
+        if operation:
+            self._histogram(self.operations, operation).appwrite_calls += 1
+
+    def record_operation(self, operation: str, elapsed: float, failed: bool = False) -> None:
+        """Record one DatabaseHelper operation"""
+        self._histogram(self.operations, operation).record(elapsed, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Everything recorded since startup (or the last reset), as plain data"""
+        def table(histograms: Dict[str, LatencyHistogram]) -> Dict[str, Dict[str, Any]]:
+            # Slowest in total first
+            ordered = sorted(histograms.items(), key=lambda item: item[1].total, reverse=True)
+            return {key: histogram.as_dict() for key, histogram in ordered}
+
+        return {
+            'since': self.started_at,
+            'requests': sum(h.count for h in self.methods.values()),
+            'inflight': self.inflight,
+            'inflight_high_water': self.inflight_high_water,
+            'errors': dict(self.errors),
+            'methods': table(self.methods),
+            'collections': table(self.collections),
+            'origins': table(self.origins),
+            'operations': table(self.operations)
+        }
+
+    def dump(self, path: str, extra: Optional[Dict[str, Any]] = None, stats: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Write the stats (plus any extra sections) to a JSON file
+
+        The counters are updated on the event loop, so when writing from another
+        thread pass a stats() snapshot taken on the loop.
+
+        Returns:
+            The JSON written, encoded as UTF-8
+        """
+        data = json.dumps({**(stats or self.stats()), **(extra or {})}, indent=2, default=str).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return data
+
+
+def instrument(cls):
+    """
+    Class decorator timing every public coroutine method of a database helper
+
+    The instance needs a `metrics` attribute holding a DatabaseMetrics.
+    """
+    for name, func in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.iscoroutinefunction(func):
+            continue
+        setattr(cls, name, _timed(func))
+    return cls
+
+
+def _timed(func):
+    operation = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        token = current_operation.set(operation)
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await func(self, *args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.metrics.record_operation(operation, time.perf_counter() - started, failed)
+            current_operation.reset(token)
+
+    return wrapper
@@ -7,6 +7,8 @@ from discord import app_commands
 import traceback
 from typing import Union
 
+from utils.interactions import respond
+
 
 class CouncillorError(Exception):
     """Base exception for Councillor Bot errors"""
@@ -159,7 +161,9 @@ async def handle_command_error(ctx: commands.Context, error: Exception):
 
 async def handle_app_command_error(interaction: discord.Interaction, error: Exception):
     """
-    Error handler for application (slash) commands
+    Error handler for application (slash) commands and view callbacks
+
+    Replies with a followup when the interaction was already deferred or answered.
 
     Args:
         interaction: The interaction that triggered the error
@@ -171,62 +175,58 @@ async def handle_app_command_error(interaction: discord.Interaction, error: Exce
 
     # Handle custom errors
     if isinstance(error, NotCouncillorError):
-        await interaction.response.send_message("❌ You must be a councillor to use this command.", ephemeral=True)
+        await respond(interaction, "❌ You must be a councillor to use this command.", ephemeral=True)
 
     elif isinstance(error, NotChancellorError):
-        await interaction.response.send_message("❌ You must be the chancellor to use this command.", ephemeral=True)
+        await respond(interaction, "❌ You must be the chancellor to use this command.", ephemeral=True)
 
     elif isinstance(error, NotAdminError):
-        await interaction.response.send_message("❌ You must be an admin to use this command.", ephemeral=True)
+        await respond(interaction, "❌ You must be an admin to use this command.", ephemeral=True)
 
     elif isinstance(error, PermissionError):
-        await interaction.response.send_message("❌ You lack the required permissions to use this command.", ephemeral=True)
+        await respond(interaction, "❌ You lack the required permissions to use this command.", ephemeral=True)
 
     elif isinstance(error, NotEligibleError):
-        await interaction.response.send_message("❌ You are not eligible to perform this action.", ephemeral=True)
+        await respond(interaction, "❌ You are not eligible to perform this action.", ephemeral=True)
 
     elif isinstance(error, NotFoundError):
-        await interaction.response.send_message("❌ The requested resource was not found.", ephemeral=True)
+        await respond(interaction, "❌ The requested resource was not found.", ephemeral=True)
 
     elif isinstance(error, AlreadyExistsError):
-        await interaction.response.send_message("❌ The resource you are trying to create already exists.", ephemeral=True)
+        await respond(interaction, "❌ The resource you are trying to create already exists.", ephemeral=True)
 
     elif isinstance(error, InvalidInputError):
-        await interaction.response.send_message(f"❌ The provided input is invalid. {error}", ephemeral=True)
+        await respond(interaction, f"❌ The provided input is invalid. {error}", ephemeral=True)
 
     elif isinstance(error, GuildNotSetupError):
-        await interaction.response.send_message("❌ This server is not properly set up. Please contact an administrator.", ephemeral=True)
+        await respond(interaction, "❌ This server is not properly set up. Please contact an administrator.", ephemeral=True)
 
     elif isinstance(error, VotingNotFoundError):
-        await interaction.response.send_message("❌ Voting not found.", ephemeral=True)
+        await respond(interaction, "❌ Voting not found.", ephemeral=True)
 
     elif isinstance(error, AlreadyVotedError):
-        await interaction.response.send_message("❌ You have already voted.", ephemeral=True)
+        await respond(interaction, "❌ You have already voted.", ephemeral=True)
 
     elif isinstance(error, ElectionInProgressError):
-        await interaction.response.send_message("❌ An election is already in progress.", ephemeral=True)
+        await respond(interaction, "❌ An election is already in progress.", ephemeral=True)
 
     # Handle built-in app command errors
     elif isinstance(error, app_commands.MissingPermissions):
         perms = ", ".join(error.missing_permissions)
-        await interaction.response.send_message(f"❌ You are missing required permissions: {perms}", ephemeral=True)
+        await respond(interaction, f"❌ You are missing required permissions: {perms}", ephemeral=True)
 
     elif isinstance(error, app_commands.BotMissingPermissions):
         perms = ", ".join(error.missing_permissions)
-        await interaction.response.send_message(f"❌ I am missing required permissions: {perms}", ephemeral=True)
+        await respond(interaction, f"❌ I am missing required permissions: {perms}", ephemeral=True)
 
     elif isinstance(error, app_commands.CommandOnCooldown):
-        await interaction.response.send_message(f"❌ This command is on cooldown. Try again in {error.retry_after:.1f} seconds.", ephemeral=True)
+        await respond(interaction, f"❌ This command is on cooldown. Try again in {error.retry_after:.1f} seconds.", ephemeral=True)
 
     # Handle any other errors
     else:
         error_msg = f"❌ An error occurred: {str(error)}"
 
-        # Check if we already responded
-        if interaction.response.is_done():
-            await interaction.followup.send(error_msg, ephemeral=True)
-        else:
-            await interaction.response.send_message(error_msg, ephemeral=True)
+        await respond(interaction, error_msg, ephemeral=True)
 
         # Log the full traceback
         print(f"Error in slash command {interaction.command.name if interaction.command else 'unknown'}:")
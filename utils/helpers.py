@@ -2,7 +2,9 @@
 Helper utilities for common operations
 """
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from utils.enums import VotingStatus
 
 
 def datetime_now() -> datetime:
@@ -34,6 +36,25 @@ def parse_iso_datetime(iso_str: str) -> Optional[datetime]:
         return None
 
 
+def is_voting_open(voting: Optional[Dict[str, Any]], *statuses: VotingStatus) -> bool:
+    """
+    Check whether a voting still accepts ballots (or registrations)
+
+    Args:
+        voting: Voting document, or None if it wasn't found
+        *statuses: Statuses in which it is open (defaults to VOTING)
+
+    Returns:
+        True if the voting is in one of the statuses and its voting_end hasn't passed
+    """
+    if not voting:
+        return False
+    if voting.get('status') not in {status.value for status in statuses or (VotingStatus.VOTING,)}:
+        return False
+    voting_end = parse_iso_datetime(voting.get('voting_end'))
+    return voting_end is None or voting_end > datetime_now()
+
+
 def convert_datetime_from_str(datetime_str: str) -> Optional[datetime]:
     """
     Convert a datetime string to a datetime object
@@ -0,0 +1,135 @@
+"""
+Interaction response helpers
+Defers interactions before slow handlers run, so the 3-second token never expires,
+and records how long each handler takes to acknowledge its interaction
+"""
+import functools
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import discord
+
+from utils.db_metrics import set_origin
+from utils.helpers import datetime_now
+
+
+# Interactions must be acknowledged within this many seconds
+ACK_DEADLINE = 3.0
+
+EXTRAS_KEY = 'councillor_defer'
+
+
+class HandlerTimings:
+    """
+    Receipt-to-acknowledgement latency per handler
+
+    Latency is measured from the interaction's creation time (Discord's clock)
+    to the moment it was deferred, so it includes gateway and event loop delay.
+    """
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._late: Dict[str, int] = {}
+
+    def record(self, handler: str, latency: float) -> None:
+        """Record one acknowledgement"""
+        samples = self._samples.get(handler)
+        if samples is None:
+            samples = self._samples[handler] = deque(maxlen=self.window)
+        samples.append(latency)
+        self._counts[handler] = self._counts.get(handler, 0) + 1
+        if latency >= ACK_DEADLINE:
+            self._late[handler] = self._late.get(handler, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Count, late acknowledgements and latency percentiles (over the recent window) per handler"""
+        result = {}
+        for handler, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[handler] = {
+                'count': self._counts[handler],
+                'late': self._late.get(handler, 0),
+                'p50': ordered[len(ordered) // 2],
+                'p95': ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+                'max': ordered[-1]
+            }
+        return result
+
+
+# Shared by every deferred handler
+timings = HandlerTimings()
+
+
+async def defer(interaction: discord.Interaction, handler: str, ephemeral: bool = True) -> None:
+    """
+    Acknowledge an interaction right away and record the latency
+
+    Does nothing if the interaction was already answered, e.g. by a check.
+    """
+    if interaction.response.is_done():
+        return
+
+    await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+    interaction.extras[EXTRAS_KEY] = {'ephemeral': ephemeral, 'answered': False}
+
+    latency = (datetime_now() - interaction.created_at).total_seconds()
+    timings.record(handler, latency)
+    if latency >= ACK_DEADLINE:
+        print(f"Interaction for {handler} acknowledged late ({latency:.2f}s)")
+
+
+async def respond(interaction: discord.Interaction, content: Optional[str] = None, **kwargs) -> None:
+    """
+    Answer an interaction, whether or not it was deferred
+
+    Before the interaction is acknowledged this sends the initial response;
+    afterwards it sends a followup. An ephemeral reply to a publicly deferred
+    interaction removes the public "thinking" message first, so errors and
+    refusals never show up in the channel.
+    """
+    if not interaction.response.is_done():
+        await interaction.response.send_message(content, **kwargs)
+        return
+
+    state = interaction.extras.get(EXTRAS_KEY)
+    if state and not state['answered']:
+        state['answered'] = True
+        if kwargs.get('ephemeral') and not state['ephemeral']:
+            try:
+                await interaction.delete_original_response()
+            except discord.HTTPException:
+                pass
+
+    await interaction.followup.send(content, **kwargs)
+
+
+def deferred(ephemeral: bool = True):
+    """
+    Decorator for slash commands and view callbacks with slow bodies
+
+    The interaction is deferred before the body runs, so the body should answer
+    with respond(). Use ephemeral=False when the main reply is public.
+
+    Example:
+        @app_commands.command(name="close_election")
+        @deferred()
+        async def close_election(self, interaction: discord.Interaction):
+            ...
+    """
+    def decorator(func):
+        handler = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            interaction = next(arg for arg in args if isinstance(arg, discord.Interaction))
+            # Database calls made from here on are grouped under the command or view callback
+            command = interaction.command
+            set_origin(f"/{command.qualified_name}" if command else handler)
+            await defer(interaction, handler, ephemeral)
+            return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
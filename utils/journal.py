@@ -0,0 +1,395 @@
+"""
+Durable local ballot journal
+Election ballots are committed to a local SQLite (WAL) journal and acknowledged right away,
+then written to Appwrite in batches by a background flusher
+"""
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from appwrite.exception import AppwriteException
+from appwrite.id import ID
+
+from utils.database import DatabaseHelper
+from utils.db_metrics import current_origin
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ballots (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id TEXT NOT NULL UNIQUE,
+    voting_id TEXT NOT NULL,
+    discord_id TEXT NOT NULL,
+    voter_id TEXT,
+    candidate_id TEXT NOT NULL,
+    voted_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    stored INTEGER NOT NULL DEFAULT 0,
+    counted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ballots_voting ON ballots (voting_id);
+CREATE TABLE IF NOT EXISTS dead_ballots (
+    seq INTEGER PRIMARY KEY,
+    document_id TEXT NOT NULL UNIQUE,
+    voting_id TEXT NOT NULL,
+    discord_id TEXT NOT NULL,
+    voter_id TEXT,
+    candidate_id TEXT NOT NULL,
+    voted_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    stored INTEGER NOT NULL,
+    counted INTEGER NOT NULL,
+    error TEXT,
+    failed_at TEXT NOT NULL
+);
+"""
+
+BALLOT_COLUMNS = "seq, document_id, voting_id, discord_id, voter_id, candidate_id, voted_at, attempts, stored, counted"
+
+
+def is_permanent(error: Exception) -> bool:
+    """Whether Appwrite rejected a request (4xx) rather than failing to answer it"""
+    return isinstance(error, AppwriteException) and bool(error.code) and 400 <= error.code < 500 and error.code not in (408, 429)
+
+
+class BallotJournal:
+    """
+    Append-only journal of election ballots awaiting upload to Appwrite
+
+    Each ballot gets its vote document ID when it is journaled, so replaying a
+    ballot after a crash can never create a duplicate vote: the document
+    already exists under that ID and the ballot is treated as written. A second
+    ballot of the same member, rejected by the unique vote index, is dropped
+    without being counted. A ballot is uploaded in steps (vote document,
+    candidate count, voter flag) and each step is recorded on its row once it
+    is stored in Appwrite, so a retry after a failed step only redoes what is
+    left and never skips a count; only a crash between a count and its record
+    can count a ballot twice. Rows are deleted once every step is done.
+    Anything left over is replayed when the flusher starts.
+
+    A batch Appwrite rejects is retried ballot by ballot, so one bad ballot
+    can't hold back the others. A ballot rejected on its own max_attempts
+    times is moved to the dead_ballots table for inspection. Outages (5xx,
+    network errors) are retried indefinitely.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        db_helper: DatabaseHelper,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_attempts: int = 10
+    ):
+        self.path = path
+        self.db_helper = db_helper
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+
+        # SQLite connections are used from a single worker thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ballot-journal')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._appended = 0
+
+    async def _run_sql(self, func, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    # ============================================
+    # SQLite operations (run on the journal thread)
+    # ============================================
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # FULL makes every acknowledged ballot survive power loss, not just a process crash
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+
+        # Journals written before ballots were uploaded in steps lack the step columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ballots)")}
+        for column in ('stored', 'counted'):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE ballots ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    def _insert(self, row: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT INTO ballots (document_id, voting_id, discord_id, voter_id, candidate_id, voted_at) "
+            "VALUES (:document_id, :voting_id, :discord_id, :voter_id, :candidate_id, :voted_at)",
+            row
+        )
+
+    def _select_pending(self, voting_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM ballots"
+        params: list = []
+        if voting_id:
+            sql += " WHERE voting_id = ?"
+            params.append(voting_id)
+        sql += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+
+        return self._fetch(sql, params)
+
+    def _select_rows(self, seqs: List[int]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" * len(seqs))
+        return self._fetch(f"SELECT * FROM ballots WHERE seq IN ({placeholders}) ORDER BY seq", seqs)
+
+    def _fetch(self, sql: str, params: list) -> List[Dict[str, Any]]:
+        cursor = self._conn.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _select_voters(self, voting_id: str) -> Set[str]:
+        cursor = self._conn.execute("SELECT discord_id FROM ballots WHERE voting_id = ?", (voting_id,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def _delete(self, seqs: List[int]) -> None:
+        self._conn.executemany("DELETE FROM ballots WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def _mark(self, column: str, seqs: List[int]) -> None:
+        self._conn.executemany(f"UPDATE ballots SET {column} = 1 WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def _bump_attempts(self, seqs: List[int]) -> None:
+        self._conn.executemany("UPDATE ballots SET attempts = attempts + 1 WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def _bury(self, seq: int, error: str) -> None:
+        """Move a ballot to the dead-letter table"""
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.execute(
+                f"INSERT INTO dead_ballots ({BALLOT_COLUMNS}, error, failed_at) "
+                f"SELECT {BALLOT_COLUMNS}, ?, ? FROM ballots WHERE seq = ?",
+                (error, datetime.now(timezone.utc).isoformat(), seq)
+            )
+            self._conn.execute("DELETE FROM ballots WHERE seq = ?", (seq,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _count(self, table: str = 'ballots') -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # ============================================
+    # Public API
+    # ============================================
+
+    async def start(self) -> None:
+        """Open the journal and start the flusher, which first replays leftover ballots"""
+        await self._run_sql(self._open)
+        self._task = asyncio.create_task(self._flush_loop(), name="ballot-journal-flusher")
+
+    async def append(
+        self,
+        voting_id: str,
+        discord_id: int | str,
+        candidate_id: str,
+        voter_id: Optional[str] = None
+    ) -> str:
+        """
+        Durably record a ballot
+
+        Returns once the ballot is committed locally; it is written to Appwrite later.
+
+        Returns:
+            The vote document ID the ballot will be stored under
+        """
+        row = {
+            'document_id': ID.unique(),
+            'voting_id': voting_id,
+            'discord_id': str(discord_id),
+            'voter_id': voter_id,
+            'candidate_id': candidate_id,
+            'voted_at': datetime.now(timezone.utc).isoformat()
+        }
+        await self._run_sql(self._insert, row)
+
+        # Wake the flusher early once a full batch is waiting
+        self._appended += 1
+        if self._appended >= self.batch_size:
+            self._wakeup.set()
+        return row['document_id']
+
+    async def pending_voters(self, voting_id: str) -> Set[str]:
+        """Discord IDs with a journaled but not yet uploaded ballot for a voting"""
+        return await self._run_sql(self._select_voters, voting_id)
+
+    async def pending_count(self) -> int:
+        """Number of ballots not yet written to Appwrite"""
+        return await self._run_sql(self._count)
+
+    async def dead_count(self) -> int:
+        """Number of ballots moved to the dead-letter table"""
+        return await self._run_sql(self._count, 'dead_ballots')
+
+    async def stats(self) -> Dict[str, int]:
+        """Pending and dead-lettered ballot counts"""
+        return {'pending': await self.pending_count(), 'dead': await self.dead_count()}
+
+    async def flush_voting(self, voting_id: str) -> None:
+        """
+        Write every journaled ballot of a voting to Appwrite
+
+        Raises if any ballot could not be written, so callers closing an
+        election don't read incomplete results.
+        """
+        while True:
+            written, failed = await self._flush_batch(voting_id)
+            if failed:
+                raise RuntimeError(f"{failed} ballots for voting {voting_id} could not be written to Appwrite")
+            if not written:
+                return
+
+    async def close(self) -> None:
+        """Stop the flusher after a final flush attempt; unwritten ballots stay journaled"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._conn:
+            try:
+                await self._flush_batch(None)
+            except Exception as e:
+                print(f"Final ballot journal flush failed: {e}")
+            await self._run_sql(self._conn.close)
+            self._conn = None
+
+        self._executor.shutdown(wait=True)
+
+    # ============================================
+    # Flushing
+    # ============================================
+
+    async def _flush_loop(self) -> None:
+        current_origin.set('ballot-journal')
+        while True:
+            try:
+                while True:
+                    written, failed = await self._flush_batch(None)
+                    # Keep draining full batches; back off when empty or Appwrite is failing
+                    if failed or written < self.batch_size:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Ballot journal flush failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _flush_batch(self, voting_id: Optional[str]) -> tuple[int, int]:
+        """
+        Upload one batch of ballots
+
+        Returns:
+            Tuple of (written, failed) ballot counts
+        """
+        async with self._flush_lock:
+            self._appended = 0
+            rows = await self._run_sql(self._select_pending, voting_id, self.batch_size)
+            if not rows:
+                return 0, 0
+
+            try:
+                await self._upload(rows)
+            except Exception as e:
+                if len(rows) == 1 or not is_permanent(e):
+                    await self._record_failure(rows, e)
+                    return 0, len(rows)
+
+                # Rejected: retry ballot by ballot so a bad one doesn't hold back the rest.
+                # Rows are re-read since the batch may have finished some of their steps.
+                rows = await self._run_sql(self._select_rows, [row['seq'] for row in rows])
+                results = await asyncio.gather(*(self._upload([row]) for row in rows), return_exceptions=True)
+                written = []
+                for row, result in zip(rows, results):
+                    if isinstance(result, Exception):
+                        await self._record_failure([row], result)
+                    else:
+                        written.append(row['seq'])
+                await self._run_sql(self._delete, written)
+                return len(written), len(rows) - len(written)
+
+            await self._run_sql(self._delete, [row['seq'] for row in rows])
+            return len(rows), 0
+
+    async def _record_failure(self, rows: List[Dict[str, Any]], error: Exception) -> None:
+        await self._run_sql(self._bump_attempts, [row['seq'] for row in rows])
+        print(f"Failed to write {len(rows)} journaled ballots: {error}")
+
+        # Only a ballot rejected on its own is known to be the bad one
+        if len(rows) == 1 and is_permanent(error) and rows[0]['attempts'] + 1 >= self.max_attempts:
+            await self._run_sql(self._bury, rows[0]['seq'], str(error))
+            print(f"Moved ballot {rows[0]['document_id']} to dead_ballots after {self.max_attempts} attempts")
+
+    async def _upload(self, rows: List[Dict[str, Any]]) -> None:
+        """Write a batch's vote documents, candidate counts and voter flags, skipping steps already done"""
+        unstored = [row for row in rows if not row['stored']]
+        if unstored:
+            # Documents stored by an earlier attempt count as written; a second ballot
+            # of the same member is rejected by the unique vote index and left out
+            stored = await self.db_helper.create_many('votes', [
+                {
+                    '$id': row['document_id'],
+                    'voting_id': row['voting_id'],
+                    'stance': True,  # For elections, stance is always True
+                    'discord_id': row['discord_id'],
+                    'candidate_id': row['candidate_id'],
+                    'voted_at': row['voted_at']
+                }
+                for row in unstored
+            ])
+
+            stored_ids = {document['$id'] for document in stored}
+            duplicates = [row for row in unstored if row['document_id'] not in stored_ids]
+            if duplicates:
+                # Marked counted (before stored) so a replay can never count them: the
+                # member's first ballot already was
+                await self._run_sql(self._mark, 'counted', [row['seq'] for row in duplicates])
+                print(f"Dropped {len(duplicates)} duplicate journaled ballots")
+                rows = [row for row in rows if row['stored'] or row['document_id'] in stored_ids]
+            await self._run_sql(self._mark, 'stored', [row['seq'] for row in unstored])
+
+        uncounted = [row for row in rows if not row['counted']]
+        if uncounted:
+            await self._increment_counts(uncounted)
+
+        voter_ids = [row['voter_id'] for row in rows if row['voter_id']]
+        if voter_ids:
+            await self.db_helper.update_many('registered_voters', voter_ids, {'has_voted': True})
+
+    async def _increment_counts(self, rows: List[Dict[str, Any]]) -> None:
+        """Add ballots to their candidates' vote counts, marking each counted once its increment is stored"""
+        by_candidate: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_candidate.setdefault(row['candidate_id'], []).append(row)
+
+        # One atomic increment per candidate, written directly so a ballot is only
+        # marked counted after its count is in Appwrite
+        results = await asyncio.gather(
+            *(self.db_helper.increment_candidate_votes(candidate_id, len(group)) for candidate_id, group in by_candidate.items()),
+            return_exceptions=True
+        )
+        counted = [
+            row['seq']
+            for group, result in zip(by_candidate.values(), results) if not isinstance(result, Exception)
+            for row in group
+        ]
+        if counted:
+            await self._run_sql(self._mark, 'counted', counted)
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
@@ -0,0 +1,163 @@
+"""
+Background activity-log pipeline
+Log entries are buffered in memory and written to Appwrite in batches,
+so handlers never wait on a log write
+"""
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, TYPE_CHECKING
+
+from utils.cache import MISS
+from utils.db_metrics import current_origin
+
+if TYPE_CHECKING:
+    from utils.database import DatabaseHelper
+
+
+class LogQueue:
+    """
+    Bounded buffer of pending log documents with a single writer task
+
+    When the buffer is full, either the oldest entry is dropped to make room
+    (drop_oldest=True) or the new entry is rejected. Entries for guilds that
+    have logging disabled are discarded before any I/O.
+    """
+
+    def __init__(
+        self,
+        db_helper: "DatabaseHelper",
+        max_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        drop_oldest: bool = True
+    ):
+        self.db_helper = db_helper
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_oldest = drop_oldest
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.failed = 0
+        self.batches = 0
+        self.high_water = 0
+
+    def submit(self, data: Dict[str, Any]) -> None:
+        """Queue a log document without waiting for it to be written"""
+        self.submitted += 1
+
+        # Cheap check against the cached guild document (peeked, so cache stats aren't
+        # skewed by log lines); uncached guilds are checked by the writer
+        guild = self.db_helper.cache.peek(('guilds', data['guild_id']))
+        if guild is not MISS and guild and not guild.get('logging_enabled', True):
+            self.skipped += 1
+            return
+
+        if self._closed:
+            self.dropped += 1
+            return
+
+        if len(self._buffer) >= self.max_size:
+            self.dropped += 1
+            if not self.drop_oldest:
+                return
+            self._buffer.popleft()
+
+        self._buffer.append(data)
+        self.high_water = max(self.high_water, len(self._buffer))
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="log-queue")
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def close(self) -> None:
+        """Stop the writer and drain everything still buffered"""
+        self._closed = True
+        if self._task:
+            # Not cancelled: a batch being written would be lost. The writer drains and exits instead.
+            self._wakeup.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+
+        # Whatever the writer couldn't write
+        while self._buffer:
+            try:
+                await self._flush_batch()
+            except Exception as e:
+                print(f"Failed to drain activity logs: {e}")
+                self.failed += len(self._buffer)
+                self._buffer.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters"""
+        return {
+            'depth': len(self._buffer),
+            'max_size': self.max_size,
+            'high_water': self.high_water,
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'batches': self.batches
+        }
+
+    async def _run(self) -> None:
+        current_origin.set('log-queue')
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                # Write full batches back to back, then whatever is left over
+                while self._buffer:
+                    await self._flush_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Activity log write failed: {e}")
+
+            if self._closed:
+                return
+
+    async def _flush_batch(self) -> None:
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+
+        try:
+            enabled = await self._logging_enabled({entry['guild_id'] for entry in batch})
+            documents = [entry for entry in batch if enabled[entry['guild_id']]]
+            self.skipped += len(batch) - len(documents)
+
+            if documents:
+                await self._write(documents)
+                self.batches += 1
+        except Exception:
+            self.failed += len(batch)
+            raise
+
+    async def _logging_enabled(self, guild_ids: Iterable[str]) -> Dict[str, bool]:
+        """Whether logging is on for each guild (guild documents are usually cached; the rest are read in one request)"""
+        guilds = await self.db_helper.get_guilds(list(guild_ids))
+        return {
+            guild_id: not guild or guild.get('logging_enabled', True)
+            for guild_id, guild in guilds.items()
+        }
+
+    async def _write(self, documents: list) -> None:
+        """Write one batch, with a single bulk request where the server supports it"""
+        await self.db_helper.create_many('logs', documents)
+        self.written += len(documents)
@@ -0,0 +1,74 @@
+"""
+Compiled per-guild permission tables
+Maps a guild's configured Discord role IDs to council roles, so resolving a member's roles is one pass over their roles
+"""
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+
+import discord
+
+from utils.enums import RoleType
+
+
+# Guild document field holding the Discord role ID of each council role
+ROLE_FIELDS: Dict[RoleType, str] = {
+    RoleType.COUNCILLOR: 'councillor_role_id',
+    RoleType.CHANCELLOR: 'chancellor_role_id',
+    RoleType.MINISTER: 'minister_role_id',
+    RoleType.JUDICIARY: 'judiciary_role_id',
+    RoleType.PRESIDENT: 'president_role_id',
+    RoleType.VICE_PRESIDENT: 'vice_president_role_id'
+}
+
+
+def role_config(guild_data: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+    """The role fields of a guild document, in ROLE_FIELDS order"""
+    return tuple(guild_data.get(field) for field in ROLE_FIELDS.values())
+
+
+class PermissionTable:
+    """Discord role ID -> council roles granted by it, for one guild"""
+
+    def __init__(self, guild_data: Dict[str, Any]):
+        self.config = role_config(guild_data)
+        roles: Dict[int, Set[RoleType]] = {}
+        for role_type, field in ROLE_FIELDS.items():
+            role_id = guild_data.get(field)
+            if role_id:
+                roles.setdefault(int(role_id), set()).add(role_type)
+        self.roles: Dict[int, FrozenSet[RoleType]] = {
+            role_id: frozenset(role_types) for role_id, role_types in roles.items()
+        }
+
+    def resolve_roles(self, member: discord.abc.User) -> Set[RoleType]:
+        """Council roles a member holds through their Discord roles"""
+        resolved: Set[RoleType] = set()
+        # Users outside a guild (e.g. in DMs) have no roles
+        for role in getattr(member, 'roles', ()):
+            role_types = self.roles.get(role.id)
+            if role_types:
+                resolved |= role_types
+        return resolved
+
+
+class PermissionTables:
+    """Compiled tables per guild, rebuilt only when a guild's role configuration changes"""
+
+    def __init__(self):
+        self._tables: Dict[str, PermissionTable] = {}
+
+    def get(self, guild_id: int | str, guild_data: Dict[str, Any]) -> PermissionTable:
+        """Get a guild's table, compiling it if the role configuration changed"""
+        guild_id = str(guild_id)
+        table = self._tables.get(guild_id)
+        # Role changes normally go through invalidate(); comparing the config also catches edits made elsewhere
+        if table is None or table.config != role_config(guild_data):
+            table = PermissionTable(guild_data)
+            self._tables[guild_id] = table
+        return table
+
+    def invalidate(self, guild_id: int | str) -> None:
+        """Drop a guild's table after its role configuration changed"""
+        self._tables.pop(str(guild_id), None)
+
+
+permission_tables = PermissionTables()
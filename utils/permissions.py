@@ -8,6 +8,8 @@ import discord
 import config
 from utils.enums import RoleType
 from utils.database import DatabaseHelper
+from utils.context import InteractionContext
+from utils.permission_table import ROLE_FIELDS
 from utils.errors import NotEligibleError, PermissionError
 
 
@@ -16,118 +18,86 @@ async def is_admin(user: discord.User | discord.Member) -> bool:
     return str(user.id) == config.ADMIN_USER_ID
 
 
-async def is_eligible(
-    user: discord.Member,
-    guild: discord.Guild,
-    role: RoleType,
-    db_helper: DatabaseHelper
-) -> bool:
+async def is_eligible(ctx: InteractionContext, role: RoleType) -> bool:
     """
-    Check if a user is eligible for a specific role
+    Check if the interaction user is eligible for a specific role
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
+        ctx: Interaction context
         role: Role type to check for
-        db_helper: Database helper instance
 
     Returns:
         True if eligible, False otherwise
     """
     # Admin can do everything
-    if await is_admin(user):
+    if await is_admin(ctx.user):
         return True
 
-    guild_data = await db_helper.get_guild(guild.id)
-
-    if not guild_data:
-        return False
-
-    # Map role type to role ID field
-    role_field_map = {
-        RoleType.COUNCILLOR: 'councillor_role_id',
-        RoleType.CHANCELLOR: 'chancellor_role_id',
-        RoleType.MINISTER: 'minister_role_id',
-        RoleType.JUDICIARY: 'judiciary_role_id',
-        RoleType.PRESIDENT: 'president_role_id',
-        RoleType.VICE_PRESIDENT: 'vice_president_role_id'
-    }
-
-    role_field = role_field_map.get(role)
-    if not role_field or not guild_data.get(role_field):
+    if not ctx.guild:
         return False
 
-    role_id = guild_data[role_field]
-    discord_role = guild.get_role(int(role_id))
-
-    if discord_role and discord_role in user.roles:
+    if role in await ctx.get_roles():
         return True
 
+    # A configured Discord role is the source of truth: removing it revokes access even
+    # while the member's councillor record is still active. Seats without a configured
+    # role are held through the councillor records, an in-memory directory lookup.
+    if role in (RoleType.COUNCILLOR, RoleType.CHANCELLOR):
+        guild_data = await ctx.get_guild_data()
+        if not guild_data or guild_data.get(ROLE_FIELDS[role]):
+            return False
+        councillor = await ctx.get_councillor()
+        if not councillor or not councillor.get('active'):
+            return False
+        return role == RoleType.COUNCILLOR or bool(councillor.get('is_chancellor'))
+
     return False
 
 
-async def check_councillor(
-    user: discord.Member,
-    guild: discord.Guild,
-    db_helper: DatabaseHelper
-) -> None:
+async def check_councillor(ctx: InteractionContext) -> None:
     """
     Check if user is a councillor, raise exception if not
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
-        db_helper: Database helper instance
+        ctx: Interaction context
 
     Raises:
         NotEligibleError: If user is not a councillor
     """
-    if not await is_eligible(user, guild, RoleType.COUNCILLOR, db_helper):
-        if not await is_admin(user):
+    if not await is_eligible(ctx, RoleType.COUNCILLOR):
+        if not await is_admin(ctx.user):
             raise NotEligibleError("You must be a Councillor to perform this action.")
 
 
-async def check_chancellor(
-    user: discord.Member,
-    guild: discord.Guild,
-    db_helper: DatabaseHelper
-) -> None:
+async def check_chancellor(ctx: InteractionContext) -> None:
     """
     Check if user is the chancellor, raise exception if not
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
-        db_helper: Database helper instance
+        ctx: Interaction context
 
     Raises:
         NotEligibleError: If user is not the chancellor
     """
-    if not await is_eligible(user, guild, RoleType.CHANCELLOR, db_helper):
-        if not await is_admin(user):
+    if not await is_eligible(ctx, RoleType.CHANCELLOR):
+        if not await is_admin(ctx.user):
             raise NotEligibleError("You must be the Chancellor to perform this action.")
 
 
-async def check_president(
-    user: discord.Member,
-    guild: discord.Guild,
-    db_helper: DatabaseHelper
-) -> None:
+async def check_president(ctx: InteractionContext) -> None:
     """
     Check if user is president or vice president, raise exception if not
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
-        db_helper: Database helper instance
+        ctx: Interaction context
 
     Raises:
         NotEligibleError: If user is not president or vice president
     """
-    is_pres = await is_eligible(user, guild, RoleType.PRESIDENT, db_helper)
-    is_vice = await is_eligible(user, guild, RoleType.VICE_PRESIDENT, db_helper)
+    if await is_admin(ctx.user):
+        return
 
-    if not (is_pres or is_vice) and not await is_admin(user):
+    if not {RoleType.PRESIDENT, RoleType.VICE_PRESIDENT} & await ctx.get_roles():
         raise NotEligibleError("You must be a President or Vice President to perform this action.")
 
 
@@ -145,23 +115,18 @@ async def check_admin(user: discord.User | discord.Member) -> None:
         raise PermissionError("You must be an admin to perform this action.")
 
 
-async def can_register_to_vote(
-    user: discord.Member,
-    guild: discord.Guild,
-    db_helper: DatabaseHelper
-) -> tuple[bool, str]:
+async def can_register_to_vote(ctx: InteractionContext) -> tuple[bool, str]:
     """
     Check if user can register to vote in elections
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
-        db_helper: Database helper instance
+        ctx: Interaction context
 
     Returns:
         Tuple of (can_register, reason_if_not)
     """
-    guild_data = await db_helper.get_guild(guild.id)
+    user, guild = ctx.user, ctx.guild
+    guild_data = await ctx.get_guild_data()
 
     if not guild_data:
         return False, "Guild data not found"
@@ -185,24 +150,18 @@ async def can_register_to_vote(
     return True, ""
 
 
-async def can_run_for_councillor(
-    user: discord.Member,
-    guild: discord.Guild,
-    db_helper: DatabaseHelper
-) -> tuple[bool, str]:
+async def can_run_for_councillor(ctx: InteractionContext) -> tuple[bool, str]:
     """
     Check if user can run for councillor
 
     Args:
-        user: Discord member to check
-        guild: Discord guild
-        db_helper: Database helper instance
+        ctx: Interaction context
 
     Returns:
         Tuple of (can_run, reason_if_not)
     """
     # Same requirements as voting for now
-    return await can_register_to_vote(user, guild, db_helper)
+    return await can_register_to_vote(ctx)
 
 
 def command_check_admin():
@@ -217,7 +176,8 @@ def command_check_councillor(db_helper: DatabaseHelper):
     async def predicate(interaction: discord.Interaction) -> bool:
         if not interaction.guild:
             return False
-        return await is_eligible(interaction.user, interaction.guild, RoleType.COUNCILLOR, db_helper)
+        ctx = InteractionContext.from_interaction(interaction, db_helper)
+        return await is_eligible(ctx, RoleType.COUNCILLOR)
     return discord.app_commands.check(predicate)
 
 
@@ -226,5 +186,6 @@ def command_check_chancellor(db_helper: DatabaseHelper):
     async def predicate(interaction: discord.Interaction) -> bool:
         if not interaction.guild:
             return False
-        return await is_eligible(interaction.user, interaction.guild, RoleType.CHANCELLOR, db_helper)
+        ctx = InteractionContext.from_interaction(interaction, db_helper)
+        return await is_eligible(ctx, RoleType.CHANCELLOR)
     return discord.app_commands.check(predicate)
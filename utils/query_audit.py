@@ -0,0 +1,194 @@
+"""
+Static query-to-index audit
+Finds every Appwrite Query combination in the source and checks it against the declared indexes
+"""
+import ast
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Query methods that filter or sort on an attribute
+FILTER_METHODS = {
+    'equal', 'not_equal', 'less_than', 'less_than_equal', 'greater_than', 'greater_than_equal',
+    'between', 'is_null', 'is_not_null', 'starts_with', 'ends_with', 'contains', 'search',
+    'order_asc', 'order_desc'
+}
+# DatabaseHelper methods taking the collection ID as their first argument
+COLLECTION_METHODS = {'iter_documents', 'collect_documents', 'find_many', 'get_many'}
+# Databases methods that run queries, called through DatabaseHelper._call
+QUERY_CALLS = {'list_documents', 'update_documents', 'delete_documents'}
+
+
+class QueryUse:
+    """One combination of queried attributes at a call site"""
+
+    def __init__(self, path: str, line: int, function: str, collection: str, attributes: Tuple[str, ...]):
+        self.path = path
+        self.line = line
+        self.function = function
+        self.collection = collection
+        self.attributes = attributes
+
+    @property
+    def location(self) -> str:
+        return f"{self.path}:{self.line} ({self.function})"
+
+
+class QueryCoverage:
+    """How well the declared indexes serve one query combination"""
+
+    def __init__(self, use: QueryUse, index: Optional[Dict[str, Any]], covered: Tuple[str, ...]):
+        self.use = use
+        self.index = index
+        # Leading index attributes the query filters on
+        self.covered = covered
+
+    @property
+    def status(self) -> str:
+        if len(self.covered) == len(self.use.attributes):
+            return 'covered'
+        return 'partial' if self.covered else 'missing'
+
+    @property
+    def unindexed(self) -> Tuple[str, ...]:
+        return tuple(a for a in self.use.attributes if a not in self.covered)
+
+
+def _literal(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _query_attribute(node: ast.AST) -> Optional[str]:
+    """The attribute of a Query.<filter>('attr', ...) call"""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == 'Query'
+        and node.func.attr in FILTER_METHODS
+        and node.args
+    ):
+        return _literal(node.args[0])
+    return None
+
+
+def _call_collection(node: ast.Call) -> Optional[str]:
+    """The literal collection ID a query-running call targets"""
+    if not isinstance(node.func, ast.Attribute):
+        return None
+    keywords = {kw.arg: kw.value for kw in node.keywords}
+
+    if node.func.attr in COLLECTION_METHODS:
+        return _literal(node.args[0] if node.args else keywords.get('collection_id'))
+    if node.func.attr == '_call' and node.args and _literal(node.args[0]) in QUERY_CALLS:
+        return _literal(keywords.get('collection_id'))
+    return None
+
+
+def _function_uses(path: str, function: ast.AST) -> List[QueryUse]:
+    # Map nodes to parents so conditional queries (inside an if) can be told apart
+    parents: Dict[ast.AST, ast.AST] = {}
+    for parent in ast.walk(function):
+        for child in ast.iter_child_nodes(parent):
+            parents[child] = parent
+
+    def conditional(node: ast.AST) -> bool:
+        while node is not function:
+            node = parents[node]
+            if isinstance(node, (ast.If, ast.IfExp)):
+                return True
+        return False
+
+    def enclosing_call(node: ast.AST) -> Optional[ast.Call]:
+        while node is not function:
+            node = parents[node]
+            if isinstance(node, ast.Call) and _call_collection(node):
+                return node
+        return None
+
+    calls = [node for node in ast.walk(function) if isinstance(node, ast.Call) and _call_collection(node)]
+    if not calls:
+        return []
+    collections = {_call_collection(call) for call in calls}
+
+    # Queries passed inline belong to their call; queries built up in variables belong to the
+    # function's collection when it only queries one
+    inline: Dict[ast.Call, List[str]] = {call: [] for call in calls}
+    base: List[str] = []
+    optional: List[str] = []
+    for node in ast.walk(function):
+        attribute = _query_attribute(node)
+        if attribute is None or attribute.startswith('$'):
+            continue
+        call = enclosing_call(node)
+        if call is not None:
+            inline[call].append(attribute)
+        elif conditional(node):
+            optional.append(attribute)
+        else:
+            base.append(attribute)
+
+    uses = []
+    name = getattr(function, 'name', '<module>')
+    for call in calls:
+        attributes = list(inline[call])
+        # find_many('collection', 'attribute', values) filters on a literal attribute
+        if call.func.attr == 'find_many' and len(call.args) > 1:
+            attribute = _literal(call.args[1])
+            if attribute and not attribute.startswith('$'):
+                attributes.insert(0, attribute)
+
+        variants = [attributes]
+        if len(collections) == 1:
+            # The query as always sent, then with each conditional filter added
+            variants = [[*base, *attributes]]
+            variants.extend([*base, *attributes, attribute] for attribute in optional)
+
+        for variant in variants:
+            variant = tuple(dict.fromkeys(variant))
+            if variant:
+                uses.append(QueryUse(path, call.lineno, name, _call_collection(call), variant))
+    return uses
+
+
+def collect_query_uses(paths: Iterable[str | Path]) -> List[QueryUse]:
+    """Every query combination in the given source files, one entry per call site and variant"""
+    uses = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(encoding='utf-8'), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                uses.extend(_function_uses(str(path), node))
+
+    # Nested functions are walked on their own and as part of their parent
+    unique = {}
+    for use in uses:
+        unique.setdefault((use.path, use.line, use.collection, use.attributes), use)
+    return sorted(unique.values(), key=lambda use: (use.collection, use.path, use.line))
+
+
+def check_coverage(use: QueryUse, indexes: Sequence[Dict[str, Any]]) -> QueryCoverage:
+    """
+    Find the index serving a query best
+
+    An index serves a query as far as its leading attributes are all filtered on;
+    the query is covered when those leading attributes are exactly the queried ones.
+    """
+    queried = set(use.attributes)
+    best: Tuple[Optional[Dict[str, Any]], Tuple[str, ...]] = (None, ())
+    for index in indexes:
+        prefix: List[str] = []
+        for attribute in index['attributes']:
+            if attribute not in queried:
+                break
+            prefix.append(attribute)
+        if len(prefix) > len(best[1]):
+            best = (index, tuple(prefix))
+    return QueryCoverage(use, *best)
+
+
+def audit(collections: Sequence[Dict[str, Any]], uses: Iterable[QueryUse]) -> List[QueryCoverage]:
+    """Check every query combination against the indexes declared for its collection"""
+    indexes = {collection['id']: collection.get('indexes', []) for collection in collections}
+    return [check_coverage(use, indexes.get(use.collection, [])) for use in uses]
@@ -0,0 +1,149 @@
+"""
+Discord role reconciliation
+Brings a role's holders in line with the council records, changing only the members that differ
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+import config
+from utils.database import DatabaseHelper
+from utils.enums import RoleType
+from utils.permission_table import ROLE_FIELDS
+
+
+class RoleReconcileReport:
+    """Outcome of reconciling one role"""
+
+    def __init__(self, role: discord.Role):
+        self.role = role
+        self.added: List[int] = []
+        self.removed: List[int] = []
+        self.unchanged = 0
+        # Desired holders who aren't in the guild (or not cached)
+        self.missing: List[int] = []
+        # (member ID, action, error message)
+        self.failed: List[Tuple[int, str, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        """True if every required change was applied"""
+        return not self.failed
+
+    @property
+    def changes(self) -> int:
+        return len(self.added) + len(self.removed)
+
+    def summary(self) -> str:
+        """One-line description for command replies"""
+        text = f"{self.role.mention}: +{len(self.added)} / -{len(self.removed)}"
+        if self.failed:
+            text += f", {len(self.failed)} failed"
+        if self.missing:
+            text += f", {len(self.missing)} not in server"
+        return text
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'role_id': self.role.id,
+            'added': self.added,
+            'removed': self.removed,
+            'unchanged': self.unchanged,
+            'missing': self.missing,
+            'failed': [
+                {'member_id': member_id, 'action': action, 'error': error}
+                for member_id, action, error in self.failed
+            ]
+        }
+
+
+async def reconcile_role(
+    role: discord.Role,
+    desired_holders: Iterable[int | str],
+    reason: Optional[str] = None,
+    concurrency: Optional[int] = None
+) -> RoleReconcileReport:
+    """
+    Make a role's holders exactly the desired set of members
+
+    Diffs the desired holders against role.members and only adds or removes
+    the role where they differ. Changes run concurrently, bounded so they stay
+    within the guild's member-update rate-limit bucket.
+
+    Args:
+        role: The role to reconcile
+        desired_holders: Discord IDs of the members who should hold the role
+        reason: Audit log reason
+        concurrency: Maximum number of requests in flight (defaults to ROLE_SYNC_CONCURRENCY)
+
+    Returns:
+        Report of what changed and what failed
+    """
+    report = RoleReconcileReport(role)
+    guild = role.guild
+
+    desired = {int(member_id) for member_id in desired_holders}
+    current = {member.id for member in role.members}
+    report.unchanged = len(desired & current)
+
+    semaphore = asyncio.Semaphore(concurrency or getattr(config, 'ROLE_SYNC_CONCURRENCY', 5))
+
+    async def apply(member_id: int, add: bool) -> None:
+        member = guild.get_member(member_id)
+        if member is None:
+            if add:
+                report.missing.append(member_id)
+            return
+
+        async with semaphore:
+            try:
+                if add:
+                    await member.add_roles(role, reason=reason)
+                    report.added.append(member_id)
+                else:
+                    await member.remove_roles(role, reason=reason)
+                    report.removed.append(member_id)
+            except discord.HTTPException as e:
+                report.failed.append((member_id, 'add' if add else 'remove', str(e)))
+
+    await asyncio.gather(
+        *(apply(member_id, False) for member_id in current - desired),
+        *(apply(member_id, True) for member_id in desired - current)
+    )
+
+    for member_id, action, error in report.failed:
+        print(f"Failed to {action} role {role.id} for {member_id}: {error}")
+    return report
+
+
+async def reconcile_council_roles(
+    guild: discord.Guild,
+    db_helper: DatabaseHelper,
+    guild_data: Dict[str, Any],
+    roles: Iterable[RoleType] = (RoleType.COUNCILLOR, RoleType.CHANCELLOR),
+    reason: Optional[str] = None
+) -> Dict[RoleType, RoleReconcileReport]:
+    """
+    Reconcile the councillor and/or chancellor roles with the councillors collection
+
+    Active councillors should hold the councillor role; the active chancellor
+    should hold the chancellor role. Roles that aren't configured are skipped.
+
+    Returns:
+        Report per reconciled role
+    """
+    councillors = await db_helper.list_councillors(guild.id, active_only=True)
+    desired = {
+        RoleType.COUNCILLOR: [c['discord_id'] for c in councillors],
+        RoleType.CHANCELLOR: [c['discord_id'] for c in councillors if c.get('is_chancellor')]
+    }
+
+    # Roles are reconciled one after another: they share the guild's rate-limit bucket
+    reports = {}
+    for role_type in roles:
+        role_id = guild_data.get(ROLE_FIELDS[role_type])
+        role = guild.get_role(int(role_id)) if role_id else None
+        if role:
+            reports[role_type] = await reconcile_role(role, desired[role_type], reason=reason)
+    return reports
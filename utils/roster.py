@@ -0,0 +1,153 @@
+"""
+In-memory voter rosters for elections
+Registration and ballot checks become dictionary lookups instead of list scans over Appwrite
+"""
+import asyncio
+import contextlib
+from collections import Counter
+from typing import AsyncIterator, Dict, Optional, Set
+
+from utils.database import DatabaseHelper
+from utils.journal import BallotJournal
+
+
+class RosterEntry:
+    """A registered voter: their registered_voters document ID and whether they voted"""
+
+    __slots__ = ('voter_id', 'has_voted')
+
+    def __init__(self, voter_id: Optional[str], has_voted: bool = False):
+        self.voter_id = voter_id
+        self.has_voted = has_voted
+
+    @property
+    def pending(self) -> bool:
+        """True while the registration is still being written"""
+        return self.voter_id is None
+
+
+class VoterRoster:
+    """Registered voters of one election, keyed by Discord ID"""
+
+    def __init__(self, voting_id: str):
+        self.voting_id = voting_id
+        self._entries: Dict[str, RosterEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, discord_id: int | str) -> bool:
+        return str(discord_id) in self._entries
+
+    def get(self, discord_id: int | str) -> Optional[RosterEntry]:
+        """Get a voter's entry, ignoring registrations still being written"""
+        entry = self._entries.get(str(discord_id))
+        if entry is None or entry.pending:
+            return None
+        return entry
+
+    def reserve(self, discord_id: int | str) -> bool:
+        """
+        Claim a registration slot before writing it to the database
+
+        Returns:
+            False if the user is already registered (or being registered)
+        """
+        discord_id = str(discord_id)
+        if discord_id in self._entries:
+            return False
+        self._entries[discord_id] = RosterEntry(None)
+        return True
+
+    def add(self, discord_id: int | str, voter_id: str, has_voted: bool = False) -> None:
+        """Record a stored registration"""
+        self._entries[str(discord_id)] = RosterEntry(voter_id, has_voted)
+
+    def discard(self, discord_id: int | str) -> None:
+        """Remove a voter, e.g. when their registration failed"""
+        self._entries.pop(str(discord_id), None)
+
+
+class RosterIndex:
+    """
+    Per-election voter rosters, loaded once from Appwrite and kept current in memory
+
+    Also tracks the ballots being written for each election, so closing one can
+    refuse new ballots and wait for those in flight before the results are read.
+    """
+
+    def __init__(self, db_helper: DatabaseHelper, journal: Optional[BallotJournal] = None):
+        self.db_helper = db_helper
+        self.journal = journal
+        self._rosters: Dict[str, asyncio.Task] = {}
+        # Elections being closed, and the number of ballots being written per election
+        self._closing: Set[str] = set()
+        self._ballots: Counter = Counter()
+        self._settled = asyncio.Condition()
+
+    async def get(self, voting_id: str) -> VoterRoster:
+        """Get the roster for an election, loading it on first use"""
+        task = self._rosters.get(voting_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(voting_id))
+            self._rosters[voting_id] = task
+
+        try:
+            return await task
+        except Exception:
+            # Don't cache a failed load
+            if self._rosters.get(voting_id) is task:
+                del self._rosters[voting_id]
+            raise
+
+    async def _load(self, voting_id: str) -> VoterRoster:
+        roster = VoterRoster(voting_id)
+        voters = self.db_helper.iter_registered_voters(voting_id, select=['discord_id', 'has_voted'])
+        async for voter in voters:
+            roster.add(voter['discord_id'], voter['$id'], voter.get('has_voted', False))
+
+        # Ballots still waiting in the journal haven't reached Appwrite yet
+        if self.journal:
+            for discord_id in await self.journal.pending_voters(voting_id):
+                entry = roster.get(discord_id)
+                if entry:
+                    entry.has_voted = True
+        return roster
+
+    @contextlib.asynccontextmanager
+    async def ballot(self, voting_id: str) -> AsyncIterator[bool]:
+        """
+        Hold an election open while a ballot is written
+
+        Yields False (and tracks nothing) if the election is being closed.
+        """
+        if voting_id in self._closing:
+            yield False
+            return
+
+        self._ballots[voting_id] += 1
+        try:
+            yield True
+        finally:
+            self._ballots[voting_id] -= 1
+            if not self._ballots[voting_id]:
+                del self._ballots[voting_id]
+                async with self._settled:
+                    self._settled.notify_all()
+
+    async def close(self, voting_id: str) -> None:
+        """Refuse new ballots for an election and wait for those being written"""
+        self._closing.add(voting_id)
+        async with self._settled:
+            await self._settled.wait_for(lambda: not self._ballots[voting_id])
+
+    def reopen(self, voting_id: str) -> None:
+        """Accept ballots again after closing an election was aborted"""
+        self._closing.discard(voting_id)
+
+    def evict(self, voting_id: str) -> None:
+        """Drop an election's roster once it has closed"""
+        self._closing.discard(voting_id)
+        task = self._rosters.pop(voting_id, None)
+        if task and not task.done():
+            task.cancel()
@@ -0,0 +1,216 @@
+"""
+Voting deadline scheduler
+Keeps open votings in a min-heap by voting_end and processes each one as soon as it ends
+"""
+import asyncio
+import heapq
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from appwrite.query import Query
+
+from utils.database import DatabaseHelper
+from utils.db_metrics import current_origin
+from utils.enums import VotingStatus, VotingType
+from utils.helpers import datetime_now, parse_iso_datetime
+from utils.workers import KeyedWorkerPool
+
+
+# Closed by hand: /close_election seats the winners, so these are never processed automatically
+MANUAL_TYPES = {VotingType.ELECTION.value, VotingType.CHANCELLOR_ELECTION.value}
+
+
+class VotingScheduler:
+    """
+    Fires a handler for every open voting (except elections) once its voting_end has passed
+
+    Deadlines are loaded from Appwrite at startup and kept current through the
+    database helper's voting listeners, so new and updated votings are picked
+    up without polling. Votings whose deadline passed while the bot was down
+    are due immediately after the startup load. A periodic resync covers
+    votings changed outside this process.
+
+    Due votings are processed on a worker pool keyed by guild: different
+    guilds are handled in parallel, votings of one guild in deadline order.
+    A voting whose handler raises is retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        db_helper: DatabaseHelper,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        resync_interval: float = 3600.0,
+        concurrency: int = 4,
+        retry_delay: float = 30.0
+    ):
+        self.db_helper = db_helper
+        self.handler = handler
+        self.resync_interval = resync_interval
+        self.retry_delay = retry_delay
+        self.workers = KeyedWorkerPool(concurrency, name="voting-worker")
+
+        # (deadline timestamp, voting ID); entries not matching _deadlines are stale
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        # Council (guild) of each tracked voting, used as the worker key
+        self._guilds: Dict[str, Optional[str]] = {}
+        # Votings handed to the workers and not finished yet
+        self._inflight: Set[str] = set()
+        # Consecutive handler failures per voting, for the retry backoff
+        self._failures: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        db_helper.add_voting_listener(self.update)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduled deadlines plus worker queue depth and latency"""
+        return {
+            'scheduled': len(self._deadlines),
+            'inflight': len(self._inflight),
+            'retrying': len(self._failures),
+            **self.workers.stats()
+        }
+
+    def is_running(self) -> bool:
+        """Whether the scheduler loop has been started"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Load every open voting and start firing deadlines"""
+        await self.resync()
+        self.workers.start()
+        self._task = asyncio.create_task(self._run(), name="voting-scheduler")
+
+    async def close(self) -> None:
+        """Stop the scheduler"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.workers.close()
+        self._inflight.clear()
+
+    async def resync(self) -> None:
+        """Reload the deadlines of all open votings from Appwrite"""
+        votings = self.db_helper.iter_documents(
+            'votings',
+            [Query.equal('status', VotingStatus.VOTING.value)],
+            select=['voting_end', 'status', 'type', 'council_id']
+        )
+        async for voting in votings:
+            self.update(voting)
+
+    def update(self, voting: Dict[str, Any]) -> None:
+        """Schedule, reschedule or drop a voting after it was created or changed"""
+        if voting.get('status') != VotingStatus.VOTING.value or voting.get('type') in MANUAL_TYPES:
+            self.cancel(voting['$id'])
+            return
+
+        voting_end = parse_iso_datetime(voting.get('voting_end'))
+        # Votings being processed or waiting for a retry keep their slot (and backoff)
+        if not voting_end or voting['$id'] in self._inflight or voting['$id'] in self._failures:
+            return
+        self._guilds[voting['$id']] = voting.get('council_id')
+        self.schedule(voting['$id'], voting_end.timestamp())
+
+    def schedule(self, voting_id: str, deadline: float) -> None:
+        """Fire the handler for a voting at a deadline (a UNIX timestamp)"""
+        if self._deadlines.get(voting_id) == deadline:
+            return
+
+        self._deadlines[voting_id] = deadline
+        heapq.heappush(self._heap, (deadline, voting_id))
+        # Wake the loop if this is now the earliest deadline
+        if self._heap[0][1] == voting_id:
+            self._wakeup.set()
+
+    def cancel(self, voting_id: str) -> None:
+        """Stop tracking a voting; its heap entry is skipped when reached"""
+        self._deadlines.pop(voting_id, None)
+        self._guilds.pop(voting_id, None)
+        self._failures.pop(voting_id, None)
+
+    def next_deadline(self) -> Optional[float]:
+        """The earliest pending deadline, if any"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now: float) -> List[str]:
+        due = []
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, voting_id = heapq.heappop(self._heap)
+            del self._deadlines[voting_id]
+            due.append(voting_id)
+            self._discard_stale()
+        return due
+
+    async def _run(self) -> None:
+        current_origin.set('voting-scheduler')
+        loop = asyncio.get_running_loop()
+        resync_at = loop.time() + self.resync_interval
+
+        while True:
+            for voting_id in self._pop_due(datetime_now().timestamp()):
+                self._inflight.add(voting_id)
+                guild = self._guilds.pop(voting_id, None)
+                self.workers.submit(guild, self._fire, voting_id, guild)
+
+            if loop.time() >= resync_at:
+                try:
+                    await self.resync()
+                except Exception as e:
+                    print(f"Voting scheduler resync failed: {e}")
+                resync_at = loop.time() + self.resync_interval
+                continue
+
+            # Sleep until the earliest deadline, the next resync, or a new earlier deadline
+            timeout = resync_at - loop.time()
+            deadline = self.next_deadline()
+            if deadline is not None:
+                timeout = min(timeout, deadline - datetime_now().timestamp())
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, voting_id: str, guild: Optional[str]) -> None:
+        """Process a voting whose deadline passed, if it is still open; retry it later if that fails"""
+        try:
+            await self._process(voting_id)
+            self._failures.pop(voting_id, None)
+        except Exception as e:
+            failures = self._failures.get(voting_id, 0) + 1
+            self._failures[voting_id] = failures
+            delay = min(self.retry_delay * 2 ** (failures - 1), self.resync_interval)
+            print(f"Failed to process voting {voting_id} (attempt {failures}, retrying in {delay:.0f}s): {e}")
+            self._guilds[voting_id] = guild
+            self.schedule(voting_id, datetime_now().timestamp() + delay)
+        finally:
+            self._inflight.discard(voting_id)
+
+    async def _process(self, voting_id: str) -> None:
+        # Re-read the voting: it may have been closed by hand or extended meanwhile
+        voting = await self.db_helper.get_voting(voting_id)
+        if not voting or voting.get('status') != VotingStatus.VOTING.value or voting.get('type') in MANUAL_TYPES:
+            return
+
+        voting_end = parse_iso_datetime(voting.get('voting_end'))
+        if voting_end and voting_end > datetime_now():
+            self._guilds[voting_id] = voting.get('council_id')
+            self.schedule(voting_id, voting_end.timestamp())
+            return
+
+        await self.handler(voting)
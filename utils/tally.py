@@ -0,0 +1,150 @@
+"""
+Election vote counters
+Each active election gets an actor that serializes and batches its counter updates
+"""
+import asyncio
+from typing import Dict, Optional
+
+from utils.database import DatabaseHelper
+from utils.db_metrics import current_origin
+
+
+class VotingTally:
+    """
+    Actor owning the candidate vote counters of one voting
+
+    Increments are posted to a mailbox and handled by a single task, so
+    concurrent clicks can never lose an update. Increments for the same
+    candidate are coalesced and written as one atomic increment per
+    flush interval.
+    """
+
+    def __init__(self, db_helper: DatabaseHelper, voting_id: str, flush_interval: float = 0.25):
+        self.db_helper = db_helper
+        self.voting_id = voting_id
+        self.flush_interval = flush_interval
+
+        self._mailbox: asyncio.Queue = asyncio.Queue()
+        self._pending: Dict[str, int] = {}
+        self._task = asyncio.create_task(self._run(), name=f"tally-{voting_id}")
+
+    def increment(self, candidate_id: str, amount: int = 1) -> None:
+        """Queue a vote for a candidate"""
+        self._mailbox.put_nowait(('increment', candidate_id, amount))
+
+    async def flush(self) -> None:
+        """Write all queued increments and wait until they are stored"""
+        done = asyncio.get_running_loop().create_future()
+        self._mailbox.put_nowait(('flush', done, None))
+        await done
+
+    async def stop(self) -> None:
+        """Flush remaining increments and stop the actor"""
+        done = asyncio.get_running_loop().create_future()
+        self._mailbox.put_nowait(('stop', done, None))
+        await done
+        await self._task
+
+    async def _run(self) -> None:
+        current_origin.set('vote-tally')
+        loop = asyncio.get_running_loop()
+        flush_at: Optional[float] = None
+
+        while True:
+            timeout = None if flush_at is None else max(flush_at - loop.time(), 0)
+            try:
+                kind, arg, amount = await asyncio.wait_for(self._mailbox.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._write_pending()
+                flush_at = loop.time() + self.flush_interval if self._pending else None
+                continue
+
+            if kind == 'increment':
+                self._pending[arg] = self._pending.get(arg, 0) + amount
+                if flush_at is None:
+                    flush_at = loop.time() + self.flush_interval
+                continue
+
+            # flush / stop: write everything now and report the outcome.
+            # A failed stop keeps the actor running so no counts are dropped.
+            try:
+                await self._write_pending(raise_errors=True)
+            except Exception as e:
+                arg.set_exception(e)
+                flush_at = loop.time() + self.flush_interval
+                continue
+
+            arg.set_result(None)
+            if kind == 'stop':
+                return
+            flush_at = None
+
+    async def _write_pending(self, raise_errors: bool = False) -> None:
+        """Write coalesced increments; failed ones are kept for the next flush"""
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        candidate_ids = list(batch)
+        results = await asyncio.gather(
+            *(self.db_helper.increment_candidate_votes(cid, batch[cid]) for cid in candidate_ids),
+            return_exceptions=True
+        )
+
+        error = None
+        for candidate_id, result in zip(candidate_ids, results):
+            if isinstance(result, Exception):
+                self._pending[candidate_id] = self._pending.get(candidate_id, 0) + batch[candidate_id]
+                error = result
+                print(f"Failed to update vote count for candidate {candidate_id}: {result}")
+
+        if error and raise_errors:
+            raise error
+
+
+class VoteTallies:
+    """Registry of per-voting tally actors"""
+
+    def __init__(self, db_helper: DatabaseHelper, flush_interval: float = 0.25):
+        self.db_helper = db_helper
+        self.flush_interval = flush_interval
+        self._tallies: Dict[str, VotingTally] = {}
+
+    def get(self, voting_id: str) -> VotingTally:
+        """Get the actor for a voting, starting it on first use"""
+        tally = self._tallies.get(voting_id)
+        if tally is None:
+            tally = VotingTally(self.db_helper, voting_id, self.flush_interval)
+            self._tallies[voting_id] = tally
+        return tally
+
+    def increment(self, voting_id: str, candidate_id: str, amount: int = 1) -> None:
+        """Queue a vote for a candidate in a voting"""
+        self.get(voting_id).increment(candidate_id, amount)
+
+    async def flush(self, voting_id: str) -> None:
+        """Force-write queued votes for a voting, if it has an actor"""
+        tally = self._tallies.get(voting_id)
+        if tally:
+            await tally.flush()
+
+    async def close(self, voting_id: str) -> None:
+        """Flush and stop the actor for a voting, e.g. before reading final counts"""
+        tally = self._tallies.pop(voting_id, None)
+        if not tally:
+            return
+
+        try:
+            await tally.stop()
+        except Exception:
+            # Keep the actor registered so its pending counts are retried
+            self._tallies.setdefault(voting_id, tally)
+            raise
+
+    async def close_all(self) -> None:
+        """Flush and stop every actor, reporting (not raising) failures"""
+        for voting_id in list(self._tallies):
+            try:
+                await self.close(voting_id)
+            except Exception as e:
+                print(f"Failed to flush vote counts for voting {voting_id}: {e}")
@@ -0,0 +1,132 @@
+"""
+Keyed worker pool
+Runs jobs with bounded concurrency; jobs sharing a key run one at a time, in submission order
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from utils.db_metrics import current_origin
+
+
+class KeyedWorkerPool:
+    """
+    Fixed set of workers fed by per-key queues
+
+    A key (e.g. a guild ID) is handed to at most one worker at a time, so jobs
+    for the same key never overlap and run in order, while different keys are
+    processed in parallel. Keys take turns one job at a time, so a guild with a
+    long backlog can't starve the others.
+    """
+
+    def __init__(self, concurrency: int = 4, name: str = "worker", window: int = 256):
+        self.concurrency = concurrency
+        self.name = name
+
+        self._queues: Dict[Hashable, Deque[Tuple[Callable[..., Awaitable[Any]], tuple, asyncio.Future, float]]] = {}
+        # Keys waiting for a worker; a key is in here or being processed, never both
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._scheduled: Set[Hashable] = set()
+        self._workers: List[asyncio.Task] = []
+
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._runs: Deque[float] = deque(maxlen=window)
+
+    def start(self) -> None:
+        """Start the workers"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def close(self) -> None:
+        """Stop the workers; queued jobs are cancelled"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for queue in self._queues.values():
+            for _, _, future, _ in queue:
+                future.cancel()
+        self._queues.clear()
+        self._scheduled.clear()
+
+    def submit(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args) -> asyncio.Future:
+        """
+        Queue func(*args) behind earlier jobs with the same key
+
+        Returns:
+            Future resolved with the job's result (or exception)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append((func, args, future, time.perf_counter()))
+
+        if key not in self._scheduled:
+            self._scheduled.add(key)
+            self._ready.put_nowait(key)
+        return future
+
+    def depth(self) -> int:
+        """Jobs waiting for a worker"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and latency percentiles (seconds, over the recent window)"""
+        return {
+            'depth': self.depth(),
+            'keys': len(self._queues),
+            'active': self.active,
+            'processed': self.processed,
+            'failed': self.failed,
+            'wait_p50': _percentile(self._waits, 0.5),
+            'wait_p95': _percentile(self._waits, 0.95),
+            'run_p50': _percentile(self._runs, 0.5),
+            'run_p95': _percentile(self._runs, 0.95)
+        }
+
+    async def _worker(self) -> None:
+        current_origin.set(self.name)
+        while True:
+            key = await self._ready.get()
+            queue = self._queues[key]
+            func, args, future, queued_at = queue.popleft()
+
+            started = time.perf_counter()
+            self._waits.append(started - queued_at)
+            self.active += 1
+            try:
+                if not future.cancelled():
+                    result = await func(*args)
+                    if not future.done():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.active -= 1
+                self.processed += 1
+                self._runs.append(time.perf_counter() - started)
+
+                # Hand the key back for its next job, behind keys that are already waiting
+                if queue:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._queues[key]
+                    self._scheduled.discard(key)
+
+
+def _percentile(samples: Deque[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]